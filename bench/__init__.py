@@ -0,0 +1,4 @@
+# bench/__init__.py
+# Herramientas de medición (no forman parte de la app):
+#   - bench.seed: genera bases sintéticas reproducibles (1k / 100k / 1M)
+#   - bench.repo_bench: mide los caminos calientes de los repositorios
@@ -0,0 +1,154 @@
+# bench/backup_bench.py
+from __future__ import annotations
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from bench import harness
+from bench.seed import BENCH_DIR
+from core.backup import BackupService
+
+# -------------------------------------------------------------------
+# Suite de respaldos: copia en caliente una base grande (varios GB) con
+# distintos tamaños de paso y mide, mientras corre el respaldo:
+#   - duración de cada paso (lo que la copia retiene el lock/GIL de una vez);
+#   - latencia de un escritor concurrente (la app guardando);
+#   - atraso de un latido de 10 ms en el hilo principal (la GUI).
+#   python -m bench.backup_bench --size-gb 2 [--db ruta] [--pages 256 1024 4096]
+# La base de relleno queda en data/bench/ y se reutiliza entre corridas.
+# -------------------------------------------------------------------
+SUITE = "backup"
+ROW_BYTES = 2000        # hex(randomblob(1000)): comprime ~2:1, como datos reales
+BEAT_MS = 10
+WRITE_EVERY_S = 0.01
+
+
+def ensure_filler(size_gb: float) -> Path:
+    """Base WAL de ~size_gb GB con una tabla de relleno (se crea una sola vez)."""
+    path = BENCH_DIR / f"backup-{size_gb:g}gb.sqlite"
+    if path.exists():
+        return path
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    rows = int(size_gb * 1e9 / ROW_BYTES)
+    print(f"creando {path.name} ({rows} filas)...")
+    con = sqlite3.connect(str(path), isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE relleno (id INTEGER PRIMARY KEY, payload TEXT NOT NULL)")
+    con.execute("CREATE TABLE escrituras (id INTEGER PRIMARY KEY, ts REAL NOT NULL)")
+    chunk = 50_000
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        con.execute("BEGIN")
+        con.execute(
+            "WITH RECURSIVE c(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM c WHERE i < ?) "
+            "INSERT INTO relleno (payload) SELECT hex(randomblob(?)) FROM c", (n, ROW_BYTES // 2))
+        con.execute("COMMIT")
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    con.close()
+    return path
+
+
+def _writer(path: Path, stop: threading.Event, samples: list[float]) -> None:
+    # la app guardando mientras se respalda: una fila cada WRITE_EVERY_S
+    con = sqlite3.connect(str(path), isolation_level=None, timeout=30)
+    try:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            con.execute("INSERT INTO escrituras (ts) VALUES (?)", (time.time(),))
+            samples.append((time.perf_counter() - t0) * 1000)
+            time.sleep(WRITE_EVERY_S)
+    finally:
+        con.close()
+
+
+def _backup_case(source: Path, dest: Path, pages: int, compress: bool = False) -> dict:
+    service = BackupService(source, dest, pages=pages, compress=compress)
+    steps: list[float] = []
+    last = [time.perf_counter()]
+
+    def progress(_done, _total):
+        now = time.perf_counter()
+        steps.append((now - last[0]) * 1000)
+        last[0] = now
+
+    result: dict = {}
+
+    def run():
+        try:
+            result["snap"] = service.snapshot(f"bench{pages}", progress=progress)
+        except Exception as e:
+            result["error"] = e
+
+    writes: list[float] = []
+    stop = threading.Event()
+    writer = threading.Thread(target=_writer, args=(source, stop, writes), daemon=True)
+    backup = threading.Thread(target=run, daemon=True)
+    writer.start()
+    backup.start()
+    # latido del hilo principal: cuánto se atrasa un timer de BEAT_MS
+    beats = []
+    while backup.is_alive():
+        t0 = time.perf_counter()
+        time.sleep(BEAT_MS / 1000)
+        beats.append((time.perf_counter() - t0) * 1000 - BEAT_MS)
+    stop.set()
+    writer.join()
+    if "error" in result:
+        raise result["error"]
+    snap = result["snap"]
+    snap.path.unlink(missing_ok=True)
+    stats = snap.stats
+    mb = stats["bytes"] / 1e6
+    return {
+        "copia": harness.summarize(steps or [0.0], rows=stats["pages"], steps=stats["steps"],
+                                   total_s=round(stats["copy_s"], 2),
+                                   mb_s=round(mb / max(stats["copy_s"], 1e-9), 1)),
+        "escritor": harness.summarize(writes or [0.0]),
+        "latido": harness.summarize(beats or [0.0]),
+        "gzip": {"mb": round(mb, 1), "gz_mb": round(snap.size / 1e6, 1),
+                 "total_s": round(stats["compress_s"], 2)} if compress else None,
+    }
+
+
+def run_suite(source: Path, scale: str, pages_list: list[int], gzip_pages: int) -> dict:
+    run = harness.new_run(SUITE, scale, 0)
+    dest = BENCH_DIR / "backups"
+    for pages in pages_list:
+        r = _backup_case(source, dest, pages)
+        print(f"  {pages} pág/paso: {r['copia']['mb_s']} MB/s en {r['copia']['total_s']} s")
+        run["cases"][f"paso ({pages} págs)"] = r["copia"]
+        run["cases"][f"escritor durante copia ({pages} págs)"] = r["escritor"]
+        run["cases"][f"atraso GUI durante copia ({pages} págs)"] = r["latido"]
+    if gzip_pages:
+        r = _backup_case(source, dest, gzip_pages, compress=True)
+        g = r["gzip"]
+        print(f"  gzip: {g['mb']} MB → {g['gz_mb']} MB en {g['total_s']} s")
+        run["gzip"] = g
+    return run
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Mide respaldos en caliente sobre una base grande.")
+    ap.add_argument("--db", help="base a respaldar (por defecto una de relleno en data/bench/)")
+    ap.add_argument("--size-gb", type=float, default=1.0, help="tamaño de la base de relleno")
+    ap.add_argument("--pages", type=int, nargs="+", default=[256, 1024, 4096],
+                    help="páginas por paso a comparar")
+    ap.add_argument("--gzip-pages", type=int, default=1024, help="paso para medir la compresión (0 = no)")
+    ap.add_argument("--no-save", action="store_true", help="no agrega la corrida al historial")
+    args = ap.parse_args(argv)
+
+    source = Path(args.db) if args.db else ensure_filler(args.size_gb)
+    scale = f"{source.stat().st_size / 1e9:.1f}gb"
+    base = harness.last_run(SUITE, scale)
+    run = run_suite(source, scale, args.pages, args.gzip_pages)
+    harness.compare(run, base)
+    if not args.no_save:
+        harness.save_run(run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# bench/harness.py
+from __future__ import annotations
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from bench.seed import BENCH_DIR
+
+# -------------------------------------------------------------------
+# Medición y registro de resultados, compartidos por las suites:
+#   - measure(): repite una función y resume los tiempos (ms);
+#   - save_run()/last_run(): historial en data/bench/results.jsonl
+#     (una línea JSON por corrida) para comparar entre commits;
+#   - compare(): diferencia de p50 contra la corrida anterior.
+# -------------------------------------------------------------------
+RESULTS_PATH = BENCH_DIR / "results.jsonl"
+DEFAULT_THRESHOLD = 0.20   # +20% en p50 = regresión
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Percentil por interpolación lineal (p en 0..100)."""
+    xs = sorted(values)
+    if not xs:
+        return 0.0
+    k = (len(xs) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+
+def summarize(samples_ms: list[float], **extra) -> dict:
+    return {
+        "n": len(samples_ms),
+        "min": round(min(samples_ms), 3),
+        "p50": round(percentile(samples_ms, 50), 3),
+        "p95": round(percentile(samples_ms, 95), 3),
+        "mean": round(statistics.fmean(samples_ms), 3),
+        **extra,
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], None]] = None,
+            teardown: Optional[Callable[[object], None]] = None) -> tuple[dict, object]:
+    """
+    Corre `fn` warmup + repeat veces; setup() antes y teardown(resultado)
+    después de cada una, fuera del tiempo medido.
+    Devuelve (resumen en ms, último resultado).
+    """
+    result = None
+    samples = []
+    for i in range(warmup + repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        result = fn()
+        dt = (time.perf_counter() - t0) * 1000
+        if i >= warmup:
+            samples.append(dt)
+        if teardown:
+            teardown(result)
+    return summarize(samples), result
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5, cwd=Path(__file__).resolve().parents[1])
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def new_run(suite: str, scale: str, seed: int) -> dict:
+    return {
+        "suite": suite, "scale": scale, "seed": seed,
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_rev(),
+        "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "cases": {},
+    }
+
+
+def save_run(run: dict, path: Path = RESULTS_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(run, ensure_ascii=False) + "\n")
+
+
+def last_run(suite: str, scale: str, path: Path = RESULTS_PATH) -> Optional[dict]:
+    """Última corrida guardada de esa suite y escala (o None)."""
+    if not path.exists():
+        return None
+    found = None
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            if run.get("suite") == suite and run.get("scale") == scale:
+                found = run
+    return found
+
+
+def compare(run: dict, base: Optional[dict], threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Imprime la tabla de resultados (con delta vs `base`) y devuelve los casos que empeoraron."""
+    regressions = []
+    ref = (base or {}).get("cases", {})
+    if base:
+        print(f"comparando con {base.get('commit') or '?'} ({base.get('ts')})")
+    print(f"{'caso':<42}{'p50 ms':>10}{'p95 ms':>10}{'filas':>10}{'Δp50':>9}")
+    for name, r in run["cases"].items():
+        if "skipped" in r:
+            print(f"{name:<42}  omitido: {r['skipped']}")
+            continue
+        delta = ""
+        old = ref.get(name, {}).get("p50")
+        if old:
+            change = (r["p50"] - old) / old
+            delta = f"{change:+.0%}"
+            if change > threshold:
+                regressions.append(name)
+                delta += " !"
+        print(f"{name:<42}{r['p50']:>10.2f}{r['p95']:>10.2f}{r.get('rows', ''):>10}{delta:>9}")
+    return regressions
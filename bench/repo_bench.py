@@ -0,0 +1,144 @@
+# bench/repo_bench.py
+from __future__ import annotations
+import argparse
+import random
+import sys
+from typing import Callable
+
+from core.db import db, Casa, Hospedado
+from bench import harness
+from bench.seed import DEFAULT_SEED, SCALES, ensure_dataset, _persona
+from utils.validators import rut_dv
+
+# -------------------------------------------------------------------
+# Suite de repositorios: mide los caminos calientes contra un dataset
+# sintético (bench.seed) y guarda la corrida para comparar con la anterior.
+#   python -m bench.repo_bench --scale 100k [--repeat 5] [--no-save] [--check]
+# Los casos que escriben (guardar casa, importar) corren dentro de una
+# transacción que se deshace: el dataset queda igual entre corridas.
+# -------------------------------------------------------------------
+SUITE = "repo"
+SEARCHES = ("gonzalez", "maria soto", "fernanda", "+5692")
+IMPORT_ROWS = 2000
+IMPORT_RUT_BASE = 30_000_000   # fuera del rango de RUTs de bench.seed
+
+
+class _Rollback(Exception):
+    """Corta la transacción del caso para deshacer sus escrituras."""
+
+
+def _rolled_back(fn: Callable[[], object]) -> Callable[[], object]:
+    def run():
+        result = None
+        try:
+            with db.atomic():
+                result = fn()
+                raise _Rollback
+        except _Rollback:
+            pass
+        return result
+    return run
+
+
+def _import_rows(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        nombre, sexo, _ = _persona(rng)
+        num = IMPORT_RUT_BASE + i
+        rows.append({"rut": f"{num}-{rut_dv(num)}", "nombre_completo": nombre,
+                     "sexo": sexo, "edad": str(rng.randint(18, 80))})
+        if rng.random() < 0.3:
+            fam, fsexo, _ = _persona(rng)
+            rows.append({"rut_titular": f"{num}-{rut_dv(num)}", "nombre": fam,
+                         "relacion": "Hijo/a", "sexo": fsexo, "edad": "9"})
+    return rows
+
+
+def run_suite(scale: str, seed: int = DEFAULT_SEED, repeat: int = 5) -> dict:
+    from domain.repositories.hospedado_repo import HospedadoRepository
+    from domain.repositories.anfitrion_repo import AnfitrionRepository
+    from domain.services.hospedado_import_service import HospedadoImportService
+
+    ensure_dataset(scale, seed, verbose=True)
+    run = harness.new_run(SUITE, scale, seed)
+    cases = run["cases"]
+
+    def case(name, fn, rows=len, **kw):
+        kw.setdefault("repeat", repeat)
+        stats, result = harness.measure(fn, **kw)
+        stats["rows"] = rows(result) if callable(rows) else rows
+        cases[name] = stats
+
+    hosp = HospedadoRepository()
+    case("hospedado.list_rows", hosp.list_rows)
+    case("hospedado.page_rows[first]", lambda: hosp.page_rows(None, 200))
+    mid = (Hospedado.select(Hospedado.nombre_completo, Hospedado.id)
+           .order_by(Hospedado.nombre_completo, Hospedado.id)
+           .offset(hosp.count_rows() // 2).limit(1).tuples().first())
+    case("hospedado.page_rows[middle]", lambda: hosp.page_rows(mid, 200))
+    for q in SEARCHES:
+        case(f"hospedado.search_list_rows[{q}]", lambda q=q: hosp.search_list_rows(q))
+
+    anf = AnfitrionRepository()
+    case("anfitrion.host_items[cold]", anf.host_items, setup=anf.cache.clear)
+
+    _casa_cases(case, seed)
+
+    svc = HospedadoImportService()
+    rows = _import_rows(IMPORT_ROWS, seed)
+    case(f"import.rows[{IMPORT_ROWS}]", _rolled_back(lambda: svc.import_rows(rows)),
+         rows=lambda rep: rep.hospedados + rep.familiares, warmup=0, repeat=max(1, repeat // 2))
+    return run
+
+
+def _casa_cases(case, seed: int) -> None:
+    """Carga y guardado del agregado de casa (habitaciones/camas/baños)."""
+    from domain.repositories.casa_repo import CasaRepository
+    from domain.dtos.casa_dto import BanoDTO
+    names = ("casa.load_detalle[cold]", "casa.save_detalle[sin cambios]", "casa.save_detalle[+1 baño]")
+    repo = CasaRepository()
+    rng = random.Random(seed)
+    total = Casa.select().count()
+    sample = [rng.randint(1, total) for _ in range(16)]
+    pos = iter(range(10 ** 9))
+
+    case(names[0], lambda: repo.load_detalle(sample[next(pos) % len(sample)]),
+         setup=repo.cache.clear, rows=lambda d: len(d["habs"]) + len(d["banos"]) if d else 0)
+
+    det = repo.load_detalle(sample[0])
+
+    def save(extra=()):
+        casa = det["casa"]
+        return repo.save_detalle(casa, casa.direccion, casa.anfitrion_id,
+                                 det["habs"], det["banos"] + tuple(extra), det["loaded"])
+
+    case(names[1], _rolled_back(save), rows=1)
+    case(names[2], _rolled_back(lambda: save((BanoDTO(None, "Patio"),))), rows=1)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Mide los repositorios contra un dataset sintético.")
+    ap.add_argument("--scale", default="1k", choices=list(SCALES))
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--no-save", action="store_true", help="no agrega la corrida al historial")
+    ap.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                    help="empeoramiento de p50 que cuenta como regresión (0.2 = 20%%)")
+    ap.add_argument("--check", action="store_true", help="sale con código 1 si hay regresiones")
+    args = ap.parse_args(argv)
+
+    base = harness.last_run(SUITE, args.scale)
+    run = run_suite(args.scale, args.seed, args.repeat)
+    regressions = harness.compare(run, base, args.threshold)
+    if not args.no_save:
+        harness.save_run(run)
+    db.close()
+    if regressions:
+        print(f"regresiones (> {args.threshold:.0%} en p50): {', '.join(regressions)}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
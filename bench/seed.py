@@ -0,0 +1,311 @@
+# bench/seed.py
+from __future__ import annotations
+import argparse
+import random
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+from peewee import chunked
+import core.db as core_db
+from core.db import (
+    db, Anfitrion, Casa, Pieza, Habitacion, Cama, Bano, Hospedado, Familiar, Asignacion
+)
+from utils.validators import rut_dv
+
+# -------------------------------------------------------------------
+# Generador de datos sintéticos (reproducible con --seed).
+# La escala es la cantidad de hospedados; lo demás se deriva:
+#   anfitriones = n/25, 1-2 casas c/u, 2-4 piezas por casa,
+#   30% de hospedados con 1-3 familiares, 70% con una asignación.
+# Inserta con insert_many por lotes dentro de transacciones (los triggers
+# de FTS y de bitácora de sync corren igual que en la app).
+# -------------------------------------------------------------------
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 42
+BENCH_DIR = core_db.DATA_DIR / "bench"
+MAX_VARS = 999  # límite conservador de variables por sentencia en SQLite
+PRAGMAS = dict(db._pragmas)  # los de la app (WAL, foreign_keys, cache_size)
+
+NOMBRES_H = ("José", "Juan", "Luis", "Carlos", "Jorge", "Manuel", "Francisco", "Pedro", "Diego",
+             "Matías", "Sebastián", "Benjamín", "Vicente", "Tomás", "Cristóbal", "Felipe",
+             "Andrés", "Rodrigo", "Gonzalo", "Ignacio")
+NOMBRES_M = ("María", "Ana", "Carolina", "Francisca", "Javiera", "Camila", "Valentina", "Catalina",
+             "Constanza", "Fernanda", "Daniela", "Paula", "Sofía", "Isidora", "Antonia",
+             "Josefa", "Claudia", "Patricia", "Verónica", "Ximena")
+APELLIDOS = ("González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+             "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández",
+             "Torres", "Araya", "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia",
+             "Reyes", "Gutiérrez", "Castro", "Pizarro", "Álvarez", "Vásquez", "Sánchez",
+             "Fernández", "Ramírez", "Carrasco", "Gómez", "Cortés", "Herrera", "Núñez",
+             "Jara", "Vergara", "Rivera", "Figueroa")
+CALLES = ("Av. Libertador Bernardo O'Higgins", "Av. Providencia", "Los Carrera", "Manuel Montt",
+          "Irarrázaval", "Gran Avenida", "Vicuña Mackenna", "Pedro de Valdivia", "Los Leones",
+          "Av. Matta", "San Martín", "Colón", "Prat", "Freire", "Caupolicán", "Lautaro",
+          "Balmaceda", "Condell", "Serrano", "Maipú")
+COMUNAS = ("Santiago", "Providencia", "Ñuñoa", "La Florida", "Maipú", "Puente Alto",
+           "Valparaíso", "Viña del Mar", "Concepción", "Temuco", "La Serena", "Rancagua",
+           "Talca", "Antofagasta", "Puerto Montt")
+RELACIONES = ("Cónyuge", "Hijo/a", "Hijo/a", "Hijo/a", "Padre", "Madre", "Hermano/a")
+DOMINIOS = ("gmail.com", "hotmail.com", "yahoo.es", "outlook.com", "uc.cl", "uchile.cl")
+ESTADOS = ("pendiente", "activa", "finalizada")
+TIPOS_CAMA = ("Individual", "Matrimonial", "Litera")
+
+# RUTs únicos sin guardar los ya usados: recorrido num = base + (start + i*STEP) % SPAN,
+# con STEP coprimo con SPAN (biyección sobre el rango, orden "aleatorio").
+RUT_BASE, RUT_SPAN, RUT_STEP = 3_000_000, 24_000_000, 7_368_787
+
+
+def _rut_nums(rng: random.Random) -> Iterator[int]:
+    pos = rng.randrange(RUT_SPAN)
+    while True:
+        pos = (pos + RUT_STEP) % RUT_SPAN
+        yield RUT_BASE + pos
+
+
+def _rut(num: int) -> tuple[str, int, str]:
+    dv = rut_dv(num)
+    return f"{num}-{dv}", num, dv
+
+
+def _persona(rng: random.Random) -> tuple[str, str, str]:
+    """(nombre_completo, sexo, nombre de pila)."""
+    if rng.random() < 0.5:
+        nombre, sexo = rng.choice(NOMBRES_H), "Hombre"
+    else:
+        nombre, sexo = rng.choice(NOMBRES_M), "Mujer"
+    return f"{nombre} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}", sexo, nombre
+
+
+def _contacto(rng: random.Random, nombre_completo: str, n: int) -> tuple[Optional[str], Optional[str]]:
+    correo = telefono = None
+    if rng.random() < 0.8:
+        partes = nombre_completo.lower().split()
+        user = unicodedata.normalize("NFKD", f"{partes[0]}.{partes[1]}").encode("ascii", "ignore").decode()
+        correo = f"{user}{n}@{rng.choice(DOMINIOS)}"
+    if rng.random() < 0.9:
+        telefono = f"+569{rng.randrange(10_000_000, 99_999_999)}"
+    return correo, telefono
+
+
+def _insert(model, fields, rows: Iterator[tuple]) -> int:
+    """insert_many por lotes (tuplas + fields); devuelve cuántas filas insertó."""
+    n = 0
+    for chunk in chunked(rows, max(1, MAX_VARS // len(fields))):
+        model.insert_many(chunk, fields=fields).execute()
+        n += len(chunk)
+    return n
+
+
+def generate(path, scale: int | str = "1k", seed: int = DEFAULT_SEED, force: bool = False,
+             verbose: bool = False) -> dict[str, int]:
+    """
+    Crea una DB nueva en `path` con `scale` hospedados (int o "1k"/"100k"/"1m")
+    y deja `core.db.db` apuntando a ella. Devuelve las filas creadas por tabla.
+    """
+    n_guests = SCALES[scale.lower()] if isinstance(scale, str) else int(scale)
+    path = Path(path)
+    if path.exists():
+        if not force:
+            raise FileExistsError(f"{path} ya existe (usa force=True para regenerarla).")
+        for suffix in ("", "-wal", "-shm"):
+            Path(str(path) + suffix).unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rng = random.Random(seed)
+    ruts = _rut_nums(rng)
+    now = datetime.now()
+    counts: dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    def log(table):
+        if verbose:
+            print(f"[seed] {table}: {counts[table]} filas ({time.perf_counter() - t0:.1f}s)")
+
+    core_db.close_db()
+    db.init(str(path), pragmas={**PRAGMAS, "synchronous": 0})  # carga masiva: sin fsync
+    core_db.init_db(create_tables=True)
+
+    # --- anfitriones (ids 1..n_hosts: la DB es nueva) ---
+    n_hosts = max(5, n_guests // 25)
+
+    def hosts():
+        for i in range(n_hosts):
+            nombre, sexo, _ = _persona(rng)
+            correo, telefono = _contacto(rng, nombre, i)
+            rut, num, dv = _rut(next(ruts))
+            yield (nombre, rut, num, dv, telefono, correo, sexo,
+                   rng.choice(("Casado", "Soltero", "Viudo", None)),
+                   rng.choice(("Propietario", "Arrendatario")), now, now)
+
+    with db.atomic():
+        counts["anfitrion"] = _insert(Anfitrion, [
+            Anfitrion.nombre_completo, Anfitrion.rut, Anfitrion.rut_num, Anfitrion.rut_dv,
+            Anfitrion.telefono, Anfitrion.correo, Anfitrion.sexo, Anfitrion.estado_civil,
+            Anfitrion.vinculo_casa, Anfitrion.created_at, Anfitrion.updated_at], hosts())
+    log("anfitrion")
+
+    # --- casas y piezas (+ habitaciones/camas/baños si el esquema los tiene) ---
+    casa_host = [h for h in range(1, n_hosts + 1) for _ in range(1 if rng.random() < 0.8 else 2)]
+    n_casas = len(casa_host)
+    piezas_por_casa = [rng.randint(2, 4) for _ in range(n_casas)]
+
+    def casas():
+        for anfitrion_id, piezas in zip(casa_host, piezas_por_casa):
+            direccion = f"{rng.choice(CALLES)} {rng.randint(10, 9999)}, {rng.choice(COMUNAS)}"
+            yield (direccion, anfitrion_id, rng.randint(1, 2), piezas, rng.randint(0, 2),
+                   rng.randint(0, 1), now, now)
+
+    def piezas():
+        for casa_id, n in enumerate(piezas_por_casa, start=1):
+            for p in range(1, n + 1):
+                yield (casa_id, f"Pieza {p}", rng.random() < 0.2, rng.randint(0, 2),
+                       rng.randint(0, 1), rng.randint(0, 1), now, now)
+
+    with db.atomic():
+        counts["casa"] = _insert(Casa, [
+            Casa.direccion, Casa.anfitrion, Casa.banos_comunes, Casa.camas_individual,
+            Casa.camas_matrimonial, Casa.camas_literas, Casa.created_at, Casa.updated_at], casas())
+        counts["pieza"] = _insert(Pieza, [
+            Pieza.casa, Pieza.nombre, Pieza.bano_privado, Pieza.camas_individual,
+            Pieza.camas_matrimonial, Pieza.camas_literas, Pieza.created_at, Pieza.updated_at], piezas())
+    log("casa")
+    log("pieza")
+    counts.update(_seed_detalle(rng, piezas_por_casa, now))
+
+    # --- hospedados (ids 1..n_guests) ---
+    con_familia = [rng.random() < 0.3 for _ in range(n_guests)]
+
+    def guests():
+        for i in range(n_guests):
+            nombre, sexo, _ = _persona(rng)
+            correo, telefono = _contacto(rng, nombre, i)
+            rut, num, dv = _rut(next(ruts))
+            edad = rng.randint(18, 85) if rng.random() < 0.95 else None
+            yield (nombre, rut, num, dv, correo, telefono, edad, sexo, con_familia[i], now, now)
+
+    with db.atomic():
+        counts["hospedado"] = _insert(Hospedado, [
+            Hospedado.nombre_completo, Hospedado.rut, Hospedado.rut_num, Hospedado.rut_dv,
+            Hospedado.correo, Hospedado.telefono, Hospedado.edad, Hospedado.sexo,
+            Hospedado.viene_con_familia, Hospedado.created_at, Hospedado.updated_at], guests())
+    log("hospedado")
+
+    # --- familiares y asignaciones ---
+    def familiares():
+        for hid, fam in enumerate(con_familia, start=1):
+            if not fam:
+                continue
+            for _ in range(rng.randint(1, 3)):
+                nombre, sexo, _ = _persona(rng)
+                yield (hid, nombre, rng.randint(0, 90), sexo, rng.choice(RELACIONES), now, now)
+
+    first_pieza = [0] * n_casas  # id de la primera pieza de cada casa
+    acc = 1
+    for c, n in enumerate(piezas_por_casa):
+        first_pieza[c] = acc
+        acc += n
+
+    def asignaciones():
+        for hid in range(1, n_guests + 1):
+            if rng.random() >= 0.7:
+                continue
+            c = rng.randrange(n_casas)
+            inicio = now - timedelta(days=rng.randint(0, 730), hours=rng.randint(0, 23))
+            estado = rng.choice(ESTADOS)
+            fin = inicio + timedelta(days=rng.randint(7, 180)) if estado == "finalizada" else None
+            pieza = first_pieza[c] + rng.randrange(piezas_por_casa[c]) if rng.random() < 0.6 else None
+            yield (hid, c + 1, pieza, inicio, fin, estado, now, now)
+
+    with db.atomic():
+        counts["familiar"] = _insert(Familiar, [
+            Familiar.hospedado, Familiar.nombre, Familiar.edad, Familiar.sexo, Familiar.relacion,
+            Familiar.created_at, Familiar.updated_at], familiares())
+        counts["asignacion"] = _insert(Asignacion, [
+            Asignacion.hospedado, Asignacion.casa, Asignacion.pieza, Asignacion.fecha_inicio,
+            Asignacion.fecha_fin, Asignacion.estado, Asignacion.created_at, Asignacion.updated_at],
+            asignaciones())
+    log("familiar")
+    log("asignacion")
+
+    db.execute_sql("ANALYZE")  # estadísticas para el planificador, como en una DB real usada
+    db.execute_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    open_dataset(path)  # reabre con los pragmas normales
+    return counts
+
+
+def _seed_detalle(rng: random.Random, piezas_por_casa: list[int], now) -> dict[str, int]:
+    """Habitaciones (una por pieza), camas y baños del detalle de casa."""
+    camas_por_hab = [rng.randint(1, 3) for _ in range(sum(piezas_por_casa))]
+
+    def habitaciones():
+        h = 0
+        for casa_id, n in enumerate(piezas_por_casa, start=1):
+            for _ in range(n):
+                yield (casa_id, camas_por_hab[h] + rng.randint(0, 1), now, now)
+                h += 1
+
+    def camas():
+        for hab_id, n in enumerate(camas_por_hab, start=1):
+            for _ in range(n):
+                yield (hab_id, rng.choice(TIPOS_CAMA), now, now)
+
+    def banos():
+        for casa_id in range(1, len(piezas_por_casa) + 1):
+            for b in range(rng.randint(1, 2)):
+                yield (casa_id, "Principal" if b == 0 else "Segundo piso", rng.random() < 0.4, now, now)
+
+    counts = {}
+    with db.atomic():
+        counts["habitacion"] = _insert(Habitacion, [Habitacion.casa, Habitacion.capacidad,
+                                                    Habitacion.created_at, Habitacion.updated_at],
+                                       habitaciones())
+        counts["cama"] = _insert(Cama, [Cama.habitacion, Cama.tipo, Cama.created_at, Cama.updated_at],
+                                 camas())
+        counts["bano"] = _insert(Bano, [Bano.casa, Bano.ubicacion, Bano.tiene_tina,
+                                        Bano.created_at, Bano.updated_at], banos())
+    return counts
+
+
+def dataset_path(scale: str, seed: int = DEFAULT_SEED) -> Path:
+    """Ruta estándar de un dataset generado: data/bench/<escala>-s<seed>.sqlite."""
+    return BENCH_DIR / f"{scale.lower()}-s{seed}.sqlite"
+
+
+def open_dataset(path) -> None:
+    """Apunta core.db a una DB ya generada, con los mismos pragmas que la app."""
+    core_db.close_db()
+    db.init(str(path), pragmas=PRAGMAS)
+    core_db.init_db(create_tables=True)
+
+
+def ensure_dataset(scale: str, seed: int = DEFAULT_SEED, verbose: bool = False) -> Path:
+    """Genera el dataset si no existe (queda en caché en data/bench) y lo abre."""
+    path = dataset_path(scale, seed)
+    if path.exists():
+        open_dataset(path)
+    else:
+        generate(path, scale, seed, verbose=verbose)
+    return path
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Genera una DB sintética para mediciones.")
+    ap.add_argument("--scale", default="1k", help=f"{'/'.join(SCALES)} o un número de hospedados")
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--out", help="ruta de la DB (por defecto data/bench/<escala>-s<seed>.sqlite)")
+    ap.add_argument("--force", action="store_true", help="sobrescribe si ya existe")
+    args = ap.parse_args(argv)
+    scale = args.scale if args.scale.lower() in SCALES else int(args.scale)
+    out = Path(args.out) if args.out else dataset_path(str(args.scale), args.seed)
+    t0 = time.perf_counter()
+    counts = generate(out, scale, args.seed, force=args.force, verbose=True)
+    core_db.close_db()
+    print(f"[seed] {out} listo en {time.perf_counter() - t0:.1f}s: "
+          + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# bench/ui_bench.py
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+# sin pantalla: Qt dibuja en memoria (sirve en un servidor Linux o en CI)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QSettings, qInstallMessageHandler
+from PyQt5.QtWidgets import QApplication
+
+from core.db import db, Anfitrion, Casa, Hospedado
+from core.db_executor import executor, shutdown_executor
+from bench import harness
+from bench.seed import DEFAULT_SEED, SCALES, ensure_dataset
+
+# -------------------------------------------------------------------
+# Suite de UI (headless): lo que el usuario siente al refrescar listas y
+# abrir módulos/diálogos, medido de punta a punta:
+#   disparo -> consultas (en el ejecutor) -> resultados en la GUI -> pintado.
+#   python -m bench.ui_bench --scale 100k [--repeat 10] [--no-save] [--check]
+# Cada caso espera a que el ejecutor de DB quede sin trabajo pendiente y
+# procesa los eventos de pintado antes de detener el reloj.
+# -------------------------------------------------------------------
+SUITE = "ui"
+SETTLE_TIMEOUT_S = 60.0
+SEARCH = "gonzalez"
+_app: Optional[QApplication] = None  # vive hasta el final del proceso (el ejecutor depende de ella)
+
+
+def _qt_messages(_mode, _context, message: str) -> None:
+    # el plugin offscreen avisa en cada diálogo que no maneja size hints: ruido
+    if "propagateSizeHints" not in message:
+        print(message, file=sys.stderr)
+
+
+def _idle() -> bool:
+    ex = executor()
+    return ex.pending == 0 and ex.readers.activeThreadCount() == 0
+
+
+def settle(timeout_s: float = SETTLE_TIMEOUT_S) -> None:
+    """Procesa eventos hasta que no quede trabajo de DB en vuelo ni señales por entregar."""
+    app = QApplication.instance()
+    deadline = time.perf_counter() + timeout_s
+    quiet = 0
+    while quiet < 2:  # dos pasadas seguidas sin trabajo: las señales encoladas ya llegaron
+        app.processEvents(QEventLoop.AllEvents, 5)
+        quiet = quiet + 1 if _idle() else 0
+        if time.perf_counter() > deadline:
+            raise TimeoutError("la GUI no quedó ociosa a tiempo")
+        if quiet == 0:
+            time.sleep(0.0002)
+
+
+def wait_signal(signal, trigger: Callable[[], None], timeout_s: float = SETTLE_TIMEOUT_S) -> None:
+    """Llama trigger() y procesa eventos hasta que `signal` se emita; luego settle()."""
+    fired = []
+    slot = lambda *_: fired.append(True)  # noqa: E731
+    signal.connect(slot)
+    try:
+        trigger()
+        app = QApplication.instance()
+        deadline = time.perf_counter() + timeout_s
+        while not fired:
+            app.processEvents(QEventLoop.AllEvents, 5)
+            if time.perf_counter() > deadline:
+                raise TimeoutError("la señal esperada no llegó a tiempo")
+    finally:
+        signal.disconnect(slot)
+    settle(timeout_s)
+
+
+def _sample(model, n: int = 5) -> list:
+    return [r for (r,) in model.select(model.rut if hasattr(model, "rut") else model.id)
+            .order_by(model.id).limit(n).tuples()]
+
+
+class _Case:
+    """Registra resultados (o el motivo por el que un caso no pudo correr)."""
+    def __init__(self, cases: dict, repeat: int):
+        self.cases = cases
+        self.repeat = repeat
+
+    def __call__(self, name: str, fn: Callable[[], Optional[int]], **kw):
+        kw.setdefault("repeat", self.repeat)
+        try:
+            stats, items = harness.measure(fn, **kw)
+        except Exception as e:  # un diálogo roto no debe tumbar la suite
+            self.cases[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            return
+        stats["rows"] = items if items is not None else ""
+        self.cases[name] = stats
+
+
+def run_suite(scale: str, seed: int = DEFAULT_SEED, repeat: int = 10) -> dict:
+    global _app
+    ensure_dataset(scale, seed, verbose=True)
+    qInstallMessageHandler(_qt_messages)
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+    from ui.theme import apply_theme
+    apply_theme(_app)
+    # el router recuerda el último módulo en QSettings: que no toque la config del usuario
+    QSettings.setPath(QSettings.NativeFormat, QSettings.UserScope, tempfile.mkdtemp(prefix="ui_bench_"))
+
+    run = harness.new_run(SUITE, scale, seed)
+    case = _Case(run["cases"], repeat)
+    _list_cases(case)
+    _router_cases(case)
+    _detail_cases(case)
+    return run
+
+
+# ---------- listas ----------
+def _list_cases(case: _Case) -> None:
+    from ui.views.hospedados_views import HospedadoView
+    from controllers.hospedado_controller import HospedadoController
+    from ui.views.casa_views import CasaView
+    from controllers.casa_controller import CasaController
+
+    view = HospedadoView()
+    view.resize(1200, 800)
+    view.show()
+    ctrl = HospedadoController(view)
+    settle()
+
+    def refresh_hosp(text: str = ""):
+        wait_signal(ctrl.searcher.resultsReady, lambda: ctrl.searcher.run_now(text))
+        return ctrl.model.rowCount()
+
+    case("HospedadoController.refresh", refresh_hosp)
+    case(f"HospedadoController.search[{SEARCH}]", lambda: refresh_hosp(SEARCH))
+    refresh_hosp("")
+    view.close()
+    view.deleteLater()
+
+    cview = CasaView()
+    cview.resize(1200, 800)
+    cview.show()
+    cctrl = CasaController(cview)
+    settle()
+
+    def refresh_casas():
+        wait_signal(cctrl.searcher.resultsReady, cctrl.refresh)
+        return cview.lista.count()
+
+    case("CasaController.refresh", refresh_casas)
+    cview.close()
+    cview.deleteLater()
+    settle()
+
+
+# ---------- módulos (router) ----------
+def _module_items(dialog) -> Optional[int]:
+    widget = dialog.layout().itemAt(0).widget()
+    ctrl = getattr(widget, "_controller", None)
+    if hasattr(ctrl, "model"):
+        return ctrl.model.rowCount()
+    casa = getattr(ctrl, "casa_controller", None)
+    if casa is not None:
+        return casa.view.lista.count()
+    return None
+
+
+def _router_cases(case: _Case) -> None:
+    from core.router import AppRouter
+    router = AppRouter()
+
+    def open_module(key: str):
+        router.open_module(key, modal=False)
+        settle()
+        return _module_items(router._open_dialog)
+
+    def close_module(_items=None):
+        if router._open_dialog is not None:
+            router._open_dialog.done(0)
+        settle()
+
+    def cold():
+        router.clear_cache()
+        settle()
+
+    for key in ("hospedados", "casas"):
+        case(f"AppRouter.open_module[{key}, frío]", lambda k=key: open_module(k),
+             setup=cold, teardown=close_module)
+        case(f"AppRouter.open_module[{key}, caché]", lambda k=key: open_module(k),
+             teardown=close_module)
+    router.clear_cache()
+    settle()
+
+
+# ---------- diálogos de detalle ----------
+def _open_dialog(build: Callable[[], tuple], items: Callable[[object], Optional[int]], holder: list):
+    def run():
+        dlg, ctrl = build()
+        holder[:] = [dlg, ctrl]
+        dlg.show()
+        settle()
+        return items(ctrl)
+    return run
+
+
+def _close_dialog(holder: list):
+    def run(_items=None):
+        if holder:
+            holder[0].done(0)
+            holder[0].deleteLater()
+            holder.clear()
+        settle()
+    return run
+
+
+def _detail_cases(case: _Case) -> None:
+    from domain.repositories.anfitrion_repo import AnfitrionRepository
+    from domain.repositories.hospedado_repo import HospedadoRepository
+
+    holder: list = []
+    close = _close_dialog(holder)
+    ruts_h = _sample(Hospedado)
+    ruts_a = _sample(Anfitrion)
+    casa_ids = _sample(Casa)
+
+    def hospedado():
+        from ui.views.hospedado_detalle import HospedadoDetalleView
+        from controllers.hospedado_detalle_controller import HospedadoDetalleController
+        dlg = HospedadoDetalleView(parent=None)
+        return dlg, HospedadoDetalleController(dlg, rut=ruts_h[0])
+
+    def anfitrion():
+        from ui.views.anfitrion_detalle import AnfitrionDetalleView
+        from controllers.anfitrion_detalle_controller import AnfitrionDetalleController
+        dlg = AnfitrionDetalleView(parent=None)
+        return dlg, AnfitrionDetalleController(dlg, rut=ruts_a[0])
+
+    def casa():
+        from ui.views.casa_detalle import CasaDetalleView
+        from controllers.casa_detalle_controller import CasaDetalleController
+        dlg = CasaDetalleView(casa_id=casa_ids[0])
+        return dlg, CasaDetalleController(dlg, casa_id=casa_ids[0])
+
+    def casa_repo_cache():
+        from domain.repositories.casa_repo import CasaRepository
+        return CasaRepository.cache
+
+    dialogs = (
+        ("hospedado", hospedado, lambda c: c.view.fam_list.count(), lambda: HospedadoRepository.cache),
+        ("anfitrion", anfitrion, lambda c: len(c._casas), lambda: AnfitrionRepository.cache),
+        ("casa", casa, lambda c: len(c.habs_data) + len(c.banos_data), casa_repo_cache),
+    )
+    for name, build, items, cache in dialogs:
+        fn = _open_dialog(build, items, holder)
+        case(f"detalle.{name}[frío]", fn, setup=lambda c=cache: c().clear(), teardown=close)
+        case(f"detalle.{name}[caché]", fn, teardown=close)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Mide refrescos de listas y apertura de diálogos (sin pantalla).")
+    ap.add_argument("--scale", default="1k", choices=list(SCALES))
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--no-save", action="store_true", help="no agrega la corrida al historial")
+    ap.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                    help="empeoramiento de p50 que cuenta como regresión (0.2 = 20%%)")
+    ap.add_argument("--check", action="store_true", help="sale con código 1 si hay regresiones")
+    args = ap.parse_args(argv)
+
+    base = harness.last_run(SUITE, args.scale)
+    run = run_suite(args.scale, args.seed, args.repeat)
+    regressions = harness.compare(run, base, args.threshold)
+    if not args.no_save:
+        harness.save_run(run)
+    shutdown_executor()
+    db.close()
+    if regressions:
+        print(f"regresiones (> {args.threshold:.0%} en p50): {', '.join(regressions)}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
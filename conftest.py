@@ -0,0 +1,2 @@
+# conftest.py
+# Vacío a propósito: pytest agrega la raíz del repo a sys.path (import core, domain...).
@@ -3,12 +3,24 @@ from PyQt5.QtCore import QObject
 from PyQt5.QtWidgets import QMessageBox
 from ui.views.anfitrion_views import AnfitrionViews
 from core.db import Anfitrion
+from core.events import bus, INSERTED, UPDATED, DELETED
+from domain.repositories.search_repo import SearchRepository
+from controllers.search_controller import SearchController
+from controllers.db_tasks import run_db
+from core.db_executor import executor
+from utils.validators import format_rut, is_valid_rut
+from bisect import bisect_left
 import re
 
 class AnfitrionController(QObject):
     def __init__(self, view: AnfitrionViews):
         super().__init__(view)
         self.view = view
+        self.search = SearchRepository()
+        self.searcher = SearchController(self._query, pool=executor().readers, parent=self)
+        self._keys: list[tuple[str, int]] = []  # (nombre, id) de cada fila de la lista
+        self._gen = 0  # sube al recargar o con bajas: descarta parches leídos antes
+        self._dirty = False
         self._connect()
         self.refresh()
 
@@ -18,80 +30,139 @@ class AnfitrionController(QObject):
         v.addRequested.connect(self._add)
         v.deleteRequested.connect(self._delete)
         v.openDetailRequested.connect(self._open_detail)
+        v.searchRequested.connect(self.searcher.set_text)
+        self.searcher.resultsReady.connect(self._show)
+        bus().changed.connect(self._on_domain_change)
 
     # -------- helpers --------
-    def _normalize_rut(self, rut: str) -> str:
-        r = (rut or "").upper().strip().replace(".", "").replace(" ", "")
-        if "-" not in r and len(r) >= 2:
-            r = f"{r[:-1]}-{r[-1]}"
-        return r
-
     def _display(self, a: Anfitrion) -> str:
-        if hasattr(a, "estado_civil"):
-            casado = "Sí" if (a.estado_civil or "").lower() == "casado" else "No"
-        else:
-            casado = "Sí" if getattr(a, "casado", False) else "No"
+        casado = "Sí" if (a.estado_civil or "").lower() == "casado" else "No"
         return f"{a.rut} - {a.nombre_completo} (Casado: {casado})"
 
     # -------- actions --------
     def refresh(self):
+        # re-aplica la búsqueda escrita (si hay), sin debounce
+        self.searcher.run_now(self.view.search.text())
+
+    def refresh_if_dirty(self):
+        """Re-consulta solo si hubo cambios que no se pudieron parchar."""
+        if self._dirty:
+            self.refresh()
+
+    def _query(self, text: str) -> list[tuple[str, str, tuple[str, int]]]:
+        """Corre en un hilo del pool: devuelve [(texto visible, rut, (nombre, id)), ...]."""
+        q = (text or "").strip()
+        if q:
+            # resultados del índice FTS, en orden de relevancia
+            ids = self.search.anfitriones(q)
+            by_id = {a.id: a for a in Anfitrion.select().where(Anfitrion.id.in_(ids))} if ids else {}
+            rows = [by_id[i] for i in ids if i in by_id]
+        else:
+            # mismo orden que _keys (bisect al parchar): los nombres repetidos, por id
+            rows = Anfitrion.select().order_by(Anfitrion.nombre_completo.asc(), Anfitrion.id.asc())
+        return [(self._display(a), a.rut, (a.nombre_completo, a.id)) for a in rows]
+
+    def _rows_for(self, ids: list[int]) -> list[tuple[str, str, tuple[str, int]]]:
+        """Corre en un lector: las filas a parchar tras un alta/cambio."""
+        return [(self._display(a), a.rut, (a.nombre_completo, a.id))
+                for a in Anfitrion.select().where(Anfitrion.id.in_(ids))]
+
+    def _show(self, _text: str, rows: list[tuple[str, str, tuple[str, int]]]):
+        self._gen += 1
+        self._dirty = False
         self.view.clear_list()
-        for a in Anfitrion.select().order_by(Anfitrion.nombre_completo.asc()):
-            self.view.add_list_item(self._display(a), a.rut)
-        self.view._filter_list(self.view.search.text())
+        self._keys = []
+        for display, rut, key in rows:
+            self.view.add_list_item(display, rut)
+            self._keys.append(key)
 
-    def _add(self):
-        try:
-            data = self.view.get_form_data()
-            nombre = data["nombre"]
-            rut    = self._normalize_rut(data["rut"])
-            correo = data["correo"] or None
-            sexo   = data["sexo"]
-            casado = data["casado"]
-
-            if not nombre or not rut:
-                raise ValueError("Nombre y RUT son obligatorios.")
-            if Anfitrion.get_or_none(Anfitrion.rut == rut):
-                raise ValueError("Ya existe un anfitrión con ese RUT.")
-
-            tel_digits = re.sub(r"\D", "", data["telefono"] or "")
-            telefono = tel_digits or None
-
-            a = Anfitrion.create(
-                nombre_completo=nombre,
-                rut=rut,
-                telefono=telefono,
-                correo=correo,
-                sexo=sexo,
-            )
-            if hasattr(a, "estado_civil"):
-                a.estado_civil = "Casado" if casado else "Soltero"
-                a.save()
-            elif hasattr(a, "casado"):
-                a.casado = bool(casado)
-                a.save()
-
-            self.view.clear_inputs()
+    # -------- eventos de dominio: parchar solo las filas afectadas --------
+    def _on_domain_change(self, entity: str, kind: str, ids: tuple):
+        if entity != "anfitrion":
+            return
+        searching = bool(self.view.search.text().strip())
+        if kind == DELETED:
+            self._gen += 1
+            for id_ in ids:
+                self._remove_row(id_)
+        elif kind in (INSERTED, UPDATED) and not searching:
+            gen = self._gen
+            executor().read(self._rows_for, list(ids)).then(lambda rows: self._patch(gen, rows))
+        else:
+            self._refresh_or_defer()   # RESET, o alta/cambio con búsqueda (orden por relevancia)
+
+    def _patch(self, gen: int, rows: list[tuple[str, str, tuple[str, int]]]):
+        if gen != self._gen:
+            # entre medio se recargó la lista o hubo una baja: la lectura pudo quedar vieja
+            self._refresh_or_defer()
+            return
+        for display, rut, key in rows:
+            self._remove_row(key[1])
+            row = bisect_left(self._keys, key)
+            self._keys.insert(row, key)
+            self.view.insert_list_item(row, display, rut)
+
+    def _refresh_or_defer(self):
+        if self.view.isVisible():
             self.refresh()
-        except ValueError as ve:
-            QMessageBox.warning(self.view, "Validación", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo agregar: {e}")
+        else:
+            self._dirty = True
+
+    def _remove_row(self, id_: int):
+        for row, (_nombre, key_id) in enumerate(self._keys):
+            if key_id == id_:
+                del self._keys[row]
+                self.view.remove_list_item(row)
+                return
+
+    def _add(self):
+        data = self.view.get_form_data()
+        nombre = data["nombre"]
+        rut    = format_rut(data["rut"])
+        if not nombre or not rut:
+            QMessageBox.warning(self.view, "Validación", "Nombre y RUT son obligatorios.")
+            return
+        if not is_valid_rut(rut):
+            QMessageBox.warning(self.view, "Validación", "RUT no válido. Usa 12345678-9 (con DV correcto).")
+            return
+        tel_digits = re.sub(r"\D", "", data["telefono"] or "")
+        # la fila llega por el bus de eventos; aquí solo se limpia el formulario
+        run_db(self.view, self._create, nombre, rut, tel_digits or None,
+               data["correo"] or None, data["sexo"], data["casado"],
+               on_done=lambda _id: self.view.clear_inputs(),
+               error_prefix="No se pudo agregar: ")
+
+    @staticmethod
+    def _create(nombre, rut, telefono, correo, sexo, casado) -> int:
+        """Hilo escritor (en transacción)."""
+        if Anfitrion.by_rut(rut):
+            raise ValueError("Ya existe un anfitrión con ese RUT.")
+        a = Anfitrion.create(
+            nombre_completo=nombre,
+            rut=rut,
+            telefono=telefono,
+            correo=correo,
+            sexo=sexo,
+            estado_civil="Casado" if casado else "Soltero",
+        )
+        return a.id
 
     def _delete(self):
         rut = self.view.current_selected_rut()
         if not rut:
             return
-        try:
-            a = Anfitrion.get_or_none(Anfitrion.rut == rut)
-            if a:
-                a.delete_instance(recursive=True)
-                self.refresh()
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo eliminar: {e}")
+        run_db(self.view, self._delete_by_rut, rut, error_prefix="No se pudo eliminar: ")
+
+    @staticmethod
+    def _delete_by_rut(rut: str):
+        """Hilo escritor: el borrado en cascada (casas, piezas…) no congela la GUI."""
+        a = Anfitrion.by_rut(rut)
+        if a:
+            a.delete_instance(recursive=True)
 
     def _open_detail(self, rut: str):
-        from ui.views.anfitrion_detalle import AnfitrionDetalle
-        dlg = AnfitrionDetalle(rut=rut, parent=self.view)
-        if dlg.exec_():
-            self.refresh()
+        from ui.views.anfitrion_detalle import AnfitrionDetalleView
+        from controllers.anfitrion_detalle_controller import AnfitrionDetalleController
+        dlg = AnfitrionDetalleView(parent=self.view)
+        ctrl = AnfitrionDetalleController(dlg, rut=rut)
+        dlg.exec_()  # lo guardado se refleja por el bus de eventos
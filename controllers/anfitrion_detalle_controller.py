@@ -2,7 +2,8 @@
 from PyQt5.QtCore import QObject
 from PyQt5.QtWidgets import QMessageBox
 from ui.views.anfitrion_detalle import AnfitrionDetalleView
-from core.db import anfitrion as Anfitrion, Casa
+from domain.repositories.anfitrion_repo import AnfitrionRepository
+from controllers.db_tasks import run_db
 import re
 
 class AnfitrionDetalleController(QObject):
@@ -12,6 +13,8 @@ class AnfitrionDetalleController(QObject):
     def __init__(self, view: AnfitrionDetalleView, rut: str):
         super().__init__(view)
         self.view = view
+        self.repo = AnfitrionRepository()
+        self._casas: list[tuple[int, str]] = []
         self._load_model(rut)
         self._snapshot = {}
         self._populate()
@@ -20,7 +23,8 @@ class AnfitrionDetalleController(QObject):
 
     # ---------- Modelo ----------
     def _load_model(self, rut: str):
-        self.model = Anfitrion.get_or_none(Anfitrion.rut == rut)
+        # anfitrión y sus casas juntos (consultas fijas)
+        self.model, self._casas = self.repo.get_con_casas(rut)
         if not self.model:
             QMessageBox.critical(self.view, "Error", f"No existe anfitrión con RUT {rut}")
             # Cierra el diálogo si no hay modelo
@@ -36,11 +40,11 @@ class AnfitrionDetalleController(QObject):
             "telefono": self.model.telefono or "",
             "correo":   self.model.correo or "",
             "sexo":     "Mujer" if (self.model.sexo or "").lower().startswith("muj") else "Hombre",
-            "casado":   bool(self.model.casado),
+            "casado":   (self.model.estado_civil or "").lower() == "casado",
         }
         self.view.set_data(data)
 
-        casas_items = [f"{c.id}: {c.direccion}" for c in Casa.select().where(Casa.anfitrion == self.model)]
+        casas_items = [f"{cid}: {direccion}" for cid, direccion in self._casas]
         self.view.set_casas(casas_items)
 
         # snapshot para Cancelar
@@ -60,40 +64,39 @@ class AnfitrionDetalleController(QObject):
     def _on_save(self):
         if not self.model:
             return
-        try:
-            form = self.view.get_form_data()
+        form = self.view.get_form_data()
 
-            nombre = form["nombre"]
-            correo = form["correo"]
-            teltxt = form["telefono"]
-            sexo   = form["sexo"]
-            casado = form["casado"]
+        nombre = form["nombre"]
+        correo = form["correo"]
+        teltxt = form["telefono"]
+        sexo   = form["sexo"]
+        casado = form["casado"]
 
-            if not nombre:
-                raise ValueError("El nombre no puede estar vacío.")
-
-            # normaliza teléfono (solo dígitos)
-            tel_digits = re.sub(r"\D", "", teltxt or "")
-            telefono = int(tel_digits) if tel_digits else 0
-
-            self.model.nombre_completo = nombre
-            self.model.telefono = telefono
-            self.model.correo = correo
-            self.model.sexo = sexo
-            self.model.casado = casado
-            self.model.save()
-
-            # repoblar y bloquear edición
-            self._populate()
-            self.view.set_edit_mode(False)
-            QMessageBox.information(self.view, "Guardado", "Cambios guardados correctamente.")
-            # Devuelve código de aceptación al exec_() para refrescar listas arriba
-            self.view.accept()
+        if not nombre:
+            QMessageBox.warning(self.view, "Validación", "El nombre no puede estar vacío.")
+            return
 
-        except ValueError as ve:
-            QMessageBox.warning(self.view, "Validación", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error al guardar", str(e))
+        # normaliza teléfono (solo dígitos)
+        tel_digits = re.sub(r"\D", "", teltxt or "")
+        telefono = int(tel_digits) if tel_digits else 0
+
+        self.model.nombre_completo = nombre
+        self.model.telefono = telefono
+        self.model.correo = correo
+        self.model.sexo = sexo
+        self.model.estado_civil = "Casado" if casado else "Soltero"
+        # el UPDATE va al hilo escritor; el diálogo queda ocupado mientras tanto
+        run_db(self.view, self.model.save, on_done=self._after_save,
+               on_error=lambda _e: self.repo.cache.forget((self.model.id,)),
+               error_title="Error al guardar")
+
+    def _after_save(self, _rows):
+        # repoblar y bloquear edición
+        self._populate()
+        self.view.set_edit_mode(False)
+        QMessageBox.information(self.view, "Guardado", "Cambios guardados correctamente.")
+        # Devuelve código de aceptación al exec_() para refrescar listas arriba
+        self.view.accept()
 
     def _on_cancel(self):
         # restaura snapshot y vuelve a lectura
@@ -1,15 +1,24 @@
 # controllers/casa_controller.py
+from bisect import bisect_left
 from PyQt5.QtCore import QObject
 from PyQt5.QtWidgets import QMessageBox
 from ui.views.casa_views import CasaView
 from core.db import Casa, anfitrion
-from ui.views.casa_detalle import CasaDetalleView
-from controllers.casa_detalle_controller import CasaDetalleController
+from core.events import bus, INSERTED, UPDATED, DELETED
+from domain.repositories.search_repo import SearchRepository
+from controllers.search_controller import SearchController
+from controllers.db_tasks import run_db
+from core.db_executor import executor
+from domain.repositories.anfitrion_repo import AnfitrionRepository
 
 class CasaController(QObject):
     def __init__(self, view: CasaView):
         super().__init__(view)
         self.view = view
+        self.search = SearchRepository()
+        self.searcher = SearchController(self._query, pool=executor().readers, parent=self)
+        self._ids: list[int] = []  # id de cada fila de la lista (orden por id)
+        self._dirty = False
         self._connect_signals()
         # carga inicial
         self._load_hosts()
@@ -20,64 +29,135 @@ class CasaController(QObject):
         self.view.addRequested.connect(self._add_casa)
         self.view.deleteRequested.connect(self._del_casa)
         self.view.openDetailRequested.connect(self._open_detail)
+        self.view.searchRequested.connect(self.searcher.set_text)
+        self.searcher.resultsReady.connect(self._show)
+        bus().changed.connect(self._on_domain_change)
 
     # --------- DATA ---------
     def _load_hosts(self):
-        items = []
-        for a in anfitrion.select().order_by(anfitrion.nombre_completo.asc()):
-            items.append((a.id, a.nombre_completo))
-        self.view.set_hosts(items)
+        # combo de anfitriones desde un lector; se llena al volver a la GUI
+        executor().read(self._host_items).then(self.view.set_hosts)
+
+    @staticmethod
+    def _host_items() -> list[tuple[int, str]]:
+        return AnfitrionRepository().host_items()  # caché de sesión
+
+    def reload_hosts(self):
+        self._load_hosts()
 
     def refresh(self):
-        self.view.lista.clear()
+        # re-aplicar filtro si hay búsqueda escrita (sin debounce)
+        self.searcher.run_now(self.view.search.text())
+
+    def refresh_if_dirty(self):
+        """Re-consulta solo si hubo cambios que no se pudieron parchar."""
+        if self._dirty:
+            self.refresh()
+
+    def _query(self, text: str) -> list[tuple[int, str, str]]:
+        """Corre en un hilo del pool: devuelve [(id, dirección, anfitrión), ...]."""
+        q = (text or "").strip()
         query = (Casa
                  .select(Casa, anfitrion)
-                 .join(anfitrion)
-                 .order_by(Casa.id.asc()))
-        for c in query:
-            self.view.add_list_item(c.id, c.direccion or "", c.anfitrion.nombre_completo or "")
-        # re-aplicar filtro si hay búsqueda escrita
-        self._apply_current_filter()
+                 .join(anfitrion))
+        if q:
+            # índice FTS (dirección o anfitrión), en orden de relevancia
+            ids = self.search.casas(q)
+            by_id = {c.id: c for c in query.where(Casa.id.in_(ids))} if ids else {}
+            rows = [by_id[i] for i in ids if i in by_id]
+        else:
+            rows = query.order_by(Casa.id.asc())
+        return [(c.id, c.direccion or "", c.anfitrion.nombre_completo or "") for c in rows]
+
+    def _show(self, _text: str, rows: list[tuple[int, str, str]]):
+        self._dirty = False
+        self.view.lista.clear()
+        self._ids = []
+        for casa_id, direccion, host in rows:
+            self.view.add_list_item(casa_id, direccion, host)
+            self._ids.append(casa_id)
+
+    # --------- EVENTOS DE DOMINIO: parchar solo las filas afectadas ---------
+    def _on_domain_change(self, entity: str, kind: str, ids: tuple):
+        if entity == "anfitrion":
+            # combo de anfitriones + nombres mostrados (y casas borradas en cascada)
+            self._load_hosts()
+            self._refresh_or_mark()
+            return
+        if entity != "casa":
+            return
+        searching = bool(self.view.search.text().strip())
+        if kind == DELETED:
+            for id_ in ids:
+                self._remove_row(id_)
+        elif kind in (INSERTED, UPDATED) and not searching:
+            query = (Casa.select(Casa, anfitrion).join(anfitrion)
+                         .where(Casa.id.in_(list(ids))))
+            for c in query:
+                args = (c.id, c.direccion or "", c.anfitrion.nombre_completo or "")
+                row = bisect_left(self._ids, c.id)
+                if row < len(self._ids) and self._ids[row] == c.id:
+                    self.view.set_list_item(row, *args)
+                else:
+                    self._ids.insert(row, c.id)
+                    self.view.insert_list_item(row, *args)
+        else:
+            self._refresh_or_mark()  # RESET, o alta/cambio con búsqueda (relevancia)
 
-    def _apply_current_filter(self):
-        self.view._filter_list(self.view.search.text())
+    def _refresh_or_mark(self):
+        if self.view.isVisible():
+            self.refresh()
+        else:
+            self._dirty = True
+
+    def _remove_row(self, id_: int):
+        if id_ in self._ids:
+            row = self._ids.index(id_)
+            del self._ids[row]
+            self.view.remove_list_item(row)
 
     # --------- ACCIONES ---------
     def _add_casa(self):
-        try:
-            data = self.view.get_form_data()
-            direccion = data["direccion"]
-            host_id   = data["anfitrion_id"]
-
-            if not direccion:
-                raise ValueError("La dirección es obligatoria.")
-            if not host_id:
-                raise ValueError("Debes seleccionar un anfitrión.")
-
-            host = anfitrion.get_by_id(host_id)
-            Casa.create(direccion=direccion, anfitrion=host)
-            self.view.clear_form()
-            self.refresh()
-        except ValueError as ve:
-            QMessageBox.warning(self.view, "Validación", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error al agregar", str(e))
+        data = self.view.get_form_data()
+        direccion = data["direccion"]
+        host_id   = data["anfitrion_id"]
+        if not direccion:
+            QMessageBox.warning(self.view, "Validación", "La dirección es obligatoria.")
+            return
+        if not host_id:
+            QMessageBox.warning(self.view, "Validación", "Debes seleccionar un anfitrión.")
+            return
+        # la fila llega por el bus de eventos; aquí solo se limpia el formulario
+        run_db(self.view, self._create, direccion, host_id,
+               on_done=lambda _id: self.view.clear_form(),
+               error_title="Error al agregar")
+
+    @staticmethod
+    def _create(direccion: str, host_id: int) -> int:
+        """Hilo escritor (en transacción)."""
+        host = anfitrion.get_or_none(anfitrion.id == host_id)
+        if host is None:
+            raise ValueError("El anfitrión seleccionado ya no existe.")
+        return Casa.create(direccion=direccion, anfitrion=host).id
 
     def _del_casa(self):
         casa_id = self.view.current_selected_id()
         if not casa_id:
             return
-        try:
-            c = Casa.get_or_none(Casa.id == casa_id)
-            if c:
-                c.delete_instance(recursive=True)
-                self.refresh()
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error al eliminar", str(e))
+        run_db(self.view, self._delete_by_id, casa_id, error_title="Error al eliminar")
+
+    @staticmethod
+    def _delete_by_id(casa_id: int):
+        """Hilo escritor: borra la casa con sus piezas/asignaciones."""
+        c = Casa.get_or_none(Casa.id == casa_id)
+        if c:
+            c.delete_instance(recursive=True)
 
     def _open_detail(self, casa_id: int):
+        # el detalle (vistas + controllers de habitación/baño) se importa recién al abrirlo
+        from ui.views.casa_detalle import CasaDetalleView
+        from controllers.casa_detalle_controller import CasaDetalleController
         dlg = CasaDetalleView(casa_id=casa_id, parent=self.view)
         _ctrl = CasaDetalleController(dlg, casa_id=casa_id)
-        if dlg.exec_():   # el controller hace accept() tras guardar
-            self.refresh()
+        dlg.exec_()  # lo guardado se refleja por el bus de eventos
 
@@ -0,0 +1,65 @@
+# controllers/db_tasks.py
+from typing import Any, Callable, Optional
+from PyQt5 import sip
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMessageBox, QWidget
+
+from core.db_executor import DbFuture, executor
+
+_BUSY = "minshuku_busy"  # contador de tareas en curso por vista
+
+
+def run_db(view: QWidget, fn: Callable[..., Any], *args,
+           on_done: Optional[Callable[[Any], None]] = None,
+           on_error: Optional[Callable[[BaseException], None]] = None,
+           write: bool = True, atomic: bool = True, error_title: str = "Error", error_prefix: str = "",
+           **kwargs) -> DbFuture:
+    """
+    Corre fn(*args, **kwargs) en el ejecutor de DB y vuelve a la GUI:
+    - write=True: hilo escritor, en transacción salvo atomic=False;
+      write=False: pool de lectores;
+    - mientras corre, `view` queda deshabilitada con cursor de espera
+      (evita doble clic en Agregar/Eliminar/Guardar);
+    - ValueError → QMessageBox.warning("Validación"); cualquier otra →
+      critical(error_title, error_prefix + mensaje);
+    - on_done(resultado) solo si terminó bien y la vista sigue viva;
+      on_error(excepción) antes del mensaje (p.ej. descartar cambios en memoria).
+    """
+    _set_busy(view, +1)
+
+    def ok(result):
+        if sip.isdeleted(view):
+            return
+        _set_busy(view, -1)
+        if on_done:
+            on_done(result)
+
+    def fail(error: BaseException):
+        if sip.isdeleted(view):
+            return
+        _set_busy(view, -1)
+        if on_error:
+            on_error(error)
+        if isinstance(error, ValueError):
+            QMessageBox.warning(view, "Validación", str(error))
+        else:
+            QMessageBox.critical(view, error_title, f"{error_prefix}{error}")
+
+    ex = executor()
+    if not write:
+        submit = ex.read
+    else:
+        submit = ex.write if atomic else ex.serial
+    future = submit(fn, *args, **kwargs)
+    return future.then(ok, fail)
+
+
+def _set_busy(view: QWidget, delta: int):
+    n = max(0, int(view.property(_BUSY) or 0) + delta)
+    view.setProperty(_BUSY, n)
+    if delta > 0 and n == 1:
+        view.setCursor(Qt.BusyCursor)
+        view.setEnabled(False)
+    elif not n:
+        view.unsetCursor()
+        view.setEnabled(True)
@@ -0,0 +1,115 @@
+# controllers/diagnostics_controller.py
+from PyQt5.QtCore import QObject, QEvent, Qt
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from ui.views.diagnostics_view import DiagnosticsView
+from core import sql_profiler, stall_watchdog
+
+
+def _one_line(sql: str, limit: int = 300) -> str:
+    s = " ".join(sql.split())
+    return s if len(s) <= limit else s[:limit - 1] + "…"
+
+
+class DiagnosticsController(QObject):
+    """
+    Llena el panel de diagnóstico con lo que registró el perfilador de SQL
+    (core.sql_profiler): sentencias más costosas, patrones N+1 y consultas
+    lentas; y con los bloqueos de la GUI (core.stall_watchdog).
+    """
+    def __init__(self, view: DiagnosticsView):
+        super().__init__(view)
+        self.view = view
+        self._connect()
+        self.refresh()
+
+    def _connect(self):
+        self.view.refreshRequested.connect(self.refresh)
+        self.view.resetRequested.connect(self._reset)
+        self.view.exportRequested.connect(self._export)
+        self.view.closeRequested.connect(self.view.accept)
+
+    def refresh(self):
+        summary = [self._show_sql(), self._show_stalls()]
+        self.view.set_summary("\n".join(summary))
+
+    def _show_sql(self) -> str:
+        prof = sql_profiler.profiler()
+        if prof is None:
+            return "SQL: perfilador inactivo (inicia con --profile-sql)."
+        snap = prof.snapshot()
+        self.view.set_table("sql", "Sentencias",
+                            ["Veces", "Total ms", "Prom. ms", "Máx. ms", "Filas", "Desde", "SQL"],
+                            [(s["count"], s["total_ms"], s["avg_ms"], s["max_ms"], s["rows"],
+                              ", ".join(s["callers"]), _one_line(s["sql"])) for s in snap["statements"]])
+        self.view.set_table("n1", "N+1",
+                            ["Veces", "Controller", "Origen", "Hilo", "Desde", "SQL"],
+                            [(f["count"], f["caller"], f["origin"], f["thread"], f["first"],
+                              _one_line(f["sql"])) for f in reversed(snap["n_plus_one"])])
+        self.view.set_table("slow", "Lentas",
+                            ["Hora", "ms", "Filas", "Controller", "Origen", "Parámetros", "SQL"],
+                            [(r["ts"][11:], r["ms"], r["rows"], r["caller"], r["origin"],
+                              ", ".join(r["params"]), _one_line(r["sql"])) for r in reversed(snap["slow"])])
+        return (f"SQL desde {snap['since']}: {snap['queries']} consultas, {snap['total_ms']:.0f} ms en total"
+                f" (lentas: ≥ {snap['slow_ms']:.0f} ms).")
+
+    def _show_stalls(self) -> str:
+        wd = stall_watchdog.watchdog()
+        if wd is None:
+            return "GUI: vigilante de bloqueos inactivo."
+        snap = wd.snapshot(top=100)
+        self.view.set_table("stalls", "Bloqueos",
+                            ["ms", "Acción", "Ventana", "Inicio", "Muestras", "Dónde"],
+                            [(s["ms"], s["action"], s["window"], s["started"][11:], s["samples"],
+                              s["stack"][-1].strip().replace("\n", " ⏎ ") if s["stack"] else "")
+                             for s in snap["worst"]])
+        self.view.set_table("stalls_by_action", "Bloqueos por acción",
+                            ["Máx. ms", "Veces", "Total ms", "Acción"],
+                            [(r["max_ms"], r["count"], r["total_ms"], r["action"])
+                             for r in snap["by_action"]])
+        return (f"GUI desde {snap['since']}: {snap['count']} bloqueos ≥ {snap['threshold_ms']:.0f} ms"
+                f" ({snap['total_ms'] / 1000:.1f} s en total).")
+
+    def _reset(self):
+        prof = sql_profiler.profiler()
+        if prof is not None:
+            prof.reset()
+        wd = stall_watchdog.watchdog()
+        if wd is not None:
+            wd.reset()
+        self.refresh()
+
+    def _export(self):
+        paths = [src.dump_json() for src in (sql_profiler.profiler(), stall_watchdog.watchdog())
+                 if src is not None]
+        if paths:
+            QMessageBox.information(self.view, "Diagnóstico",
+                                    "Guardado en:\n" + "\n".join(str(p) for p in paths))
+
+
+class DiagnosticsShortcut(QObject):
+    """
+    Ctrl+Shift+D abre el panel desde cualquier ventana, incluso sobre un
+    módulo modal (filtro de eventos a nivel de QApplication).
+    """
+    def __init__(self, app: QApplication):
+        super().__init__(app)
+        self._open = False
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.KeyPress and event.key() == Qt.Key_D
+                and event.modifiers() == (Qt.ControlModifier | Qt.ShiftModifier)
+                and not self._open):
+            self.open_panel()
+            return True
+        return False
+
+    def open_panel(self):
+        self._open = True
+        try:
+            dlg = DiagnosticsView(parent=QApplication.activeWindow())
+            DiagnosticsController(dlg)
+            dlg.exec_()
+            dlg.deleteLater()
+        finally:
+            self._open = False
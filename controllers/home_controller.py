@@ -1,16 +1,79 @@
 # controllers/home_controller.py
 from typing import Optional, Callable
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMessageBox
 from ui.views.homeviews import HomeView
 from core.router import AppRouter
+from controllers.db_tasks import run_db
 
 class HomeController:
-    """Orquesta la navegación: escucha la vista y usa el router para abrir módulos."""
+    """
+    Orquesta la navegación: escucha la vista y usa el router para abrir módulos.
+    Ningún módulo se abre antes de que el esquema esté listo: prepare_schema()
+    corre las migraciones bloqueantes en el hilo escritor con el menú en espera,
+    y un clic temprano (o tras un fallo) espera a que termine.
+    """
     def __init__(self, view: HomeView, router: AppRouter):
         self.view = view
         self.router = router
+        self._schema_ok = False
+        self._preparing = False
+        self._waiting: list[Callable[[], None]] = []
         self._connect_signals()
 
+    def prepare_schema(self, on_ready: Optional[Callable[[], None]] = None):
+        """Migraciones bloqueantes, tablas y bitácora fuera de la GUI; luego on_ready()."""
+        if self._schema_ok:
+            if on_ready:
+                on_ready()
+            return
+        if on_ready:
+            self._waiting.append(on_ready)
+        if self._preparing:
+            return  # ya en curso: on_ready queda en espera
+        from core.db import ensure_schema
+        self._preparing = True
+        self.view.set_status("Preparando la base de datos…")
+        run_db(self.view, ensure_schema, atomic=False,
+               on_done=lambda _r: self._schema_done(None),
+               on_error=self._schema_done,
+               error_title="Base de datos", error_prefix="No se pudo preparar la base de datos:\n")
+
+    def _schema_done(self, error: Optional[BaseException]):
+        self._preparing = False
+        if error is not None:
+            self._waiting.clear()
+            self.view.set_status("La base de datos no está lista; se reintenta al abrir un módulo.")
+            return
+        self._schema_ok = True
+        self.view.set_status()
+        self._warn_rut_merges()
+        waiting, self._waiting = self._waiting, []
+        for fn in waiting:
+            fn()
+
+    def _warn_rut_merges(self):
+        # la migración de RUT fusiona duplicados escritos distinto: se avisa una vez
+        from core.db import db
+        from core.db_executor import executor
+        from core.migrations import take_rut_merges
+        executor().write(take_rut_merges, db).then(
+            self._show_rut_merges,
+            lambda e: print(f"[DB] No se pudieron leer las fusiones por RUT: {e}"))
+
+    def _show_rut_merges(self, merges: list):
+        if not merges:
+            return
+        shown = 15
+        lines = [f"• {tabla} {rut}: «{lost.get('nombre_completo', '')}» (id {lost.get('id')}) "
+                 f"→ se conservó id {keep}" for tabla, rut, keep, lost in merges[:shown]]
+        if len(merges) > shown:
+            lines.append(f"… y {len(merges) - shown} más.")
+        QMessageBox.information(
+            self.view, "RUT repetidos",
+            f"Se encontraron {len(merges)} registro(s) con un RUT repetido escrito de otra forma.\n"
+            "Se fusionaron con el registro más antiguo (familia, asignaciones y casas incluidas); "
+            "los datos originales quedan guardados en la tabla rut_fusion.\n\n" + "\n".join(lines))
+
     def _connect_signals(self):
         self.view.hospedado_btn.clicked.connect(self._open_hospedados)
         self.view.casas_btn.clicked.connect(self._open_casas)
@@ -28,21 +91,36 @@ class HomeController:
         self.view.raise_()
         self.view.activateWindow()
 
+    def _open(self, key: str):
+        if not self._schema_ok:
+            self.prepare_schema(lambda: self._open(key))
+            return
+        self._before_open()
+        self.router.open_module(key, on_close=self._after_close, modal=True)
+
     # Actions
     def _open_hospedados(self):
-        self._before_open()
-        self.router.open_module("hospedados", on_close=self._after_close, modal=True)
+        self._open("hospedados")
 
     def _open_casas(self):
-        self._before_open()
-        self.router.open_module("casas", on_close=self._after_close, modal=True)
+        self._open("casas")
 
     def _open_asignaciones(self):
         # Cuando tengas la vista, solo activa la clave en el router
-        self._before_open()
-        self.router.open_module("asignaciones", on_close=self._after_close, modal=True)
+        self._open("asignaciones")
 
     def _sync(self):
-        # Aquí pondrás la lógica de sincronización (servicio/UseCase)
-        # Por ahora, solo reactivamos la vista
-        self.view.setEnabled(True)
+        # Intercambia deltas con la carpeta de sincronización (ver core/settings.py)
+        from core.settings import SYNC_DIR
+        from core.sync_server import LocalSyncServer
+        from domain.services.sync_service import SyncService
+
+        if not self._schema_ok:
+            self.prepare_schema(self._sync)
+            return
+        # en el hilo escritor; el servicio maneja sus propias transacciones
+        run_db(self.view, lambda: SyncService(LocalSyncServer(SYNC_DIR)).sync(),
+               atomic=False,
+               on_done=lambda report: QMessageBox.information(
+                   self.view, "Sincronización", report.resumen()),
+               error_title="Sincronización", error_prefix="No se pudo sincronizar:\n")
@@ -1,117 +1,193 @@
 # controllers/hospedado_controller.py
-from PyQt5.QtCore import QObject
-from PyQt5.QtWidgets import QMessageBox
+import threading
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox, QFileDialog, QProgressDialog
 from ui.views.hospedados_views import HospedadoView
-from ui.views.hospedado_detalle import HospedadoDetalleView
-from controllers.hospedado_detalle_controller import HospedadoDetalleController
+from ui.models.hospedado_list_model import HospedadoListModel
+from domain.repositories.hospedado_repo import HospedadoRepository
+from controllers.search_controller import SearchController
+from controllers.db_tasks import run_db
+from core.db_executor import executor
 from core.db import Hospedado
+from core.events import bus
+from utils.validators import format_rut, is_valid_rut
 import re
 
-# ---- RUT helpers (acepta con o sin guion) ----
-def _normalize_rut(rut: str) -> str:
-    r = (rut or "").upper().strip()
-    r = r.replace(".", "").replace(" ", "")
-    r = r.replace("‐", "-").replace("–", "-").replace("—", "-")
-    if "-" not in r:
-        # si viene todo junto, último dígito es DV
-        if len(r) < 2 or not r[:-1].isdigit():
-            return r
-        r = f"{r[:-1]}-{r[-1]}"
-    return r
-
-def _compute_dv(number: str) -> str:
-    seq = [2, 3, 4, 5, 6, 7]
-    s = 0
-    for i, d in enumerate(reversed(number)):
-        s += int(d) * seq[i % len(seq)]
-    r = 11 - (s % 11)
-    if r == 11: return "0"
-    if r == 10: return "K"
-    return str(r)
-
-def _is_valid_rut(rut: str) -> bool:
-    r = _normalize_rut(rut)
-    m = re.match(r"^(\d{7,8})-([0-9K])$", r)
-    if not m: return False
-    return _compute_dv(m.group(1)) == m.group(2)
-
-def _display(h: Hospedado) -> str:
-    return f"{h.rut} - {h.nombre_completo}"
+
+class _ImportProgress(QObject):
+    """Avance de la importación: se emite en el hilo escritor y llega a la GUI por cola."""
+    advanced = pyqtSignal(int, int, int, int)  # leídas, hospedados, familiares, rechazos
+
 
 class HospedadoController(QObject):
     def __init__(self, view: HospedadoView):
         super().__init__(view)
         self.view = view
+        # Modelo paginado: la lista solo materializa lo que se ve
+        self.model = HospedadoListModel(HospedadoRepository(), parent=self)
+        self.view.set_model(self.model)
+        # Búsqueda con debounce en un hilo del pool
+        self.searcher = SearchController(self._search_rows, pool=executor().readers, parent=self)
+        self._dirty = False
         self._connect()
         self.refresh()
 
     def _connect(self):
         self.view.refreshRequested.connect(self.refresh)
+        self.view.searchRequested.connect(self.searcher.set_text)
+        self.searcher.resultsReady.connect(self._show_results)
         self.view.addRequested.connect(self._add)
         self.view.deleteRequested.connect(self._delete)
         self.view.openDetailRequested.connect(self._open_detail)
+        self.view.importRequested.connect(self._import)
+        # altas/bajas/cambios (de aquí, del detalle, de la importación o del sync)
+        bus().changed.connect(self._on_domain_change)
 
     # --------- LOAD ---------
     def refresh(self):
-        self.view.lista.clear()
-        for h in Hospedado.select().order_by(Hospedado.nombre_completo.asc()):
-            self.view.add_list_item(_display(h), h.rut)
-        self.view._filter_list(self.view.search.text())
+        # re-consulta respetando la búsqueda escrita (sin debounce)
+        self.searcher.run_now(self.view.search.text())
+
+    def refresh_if_dirty(self):
+        """Al volver a mostrar el módulo: re-consulta solo si quedó algo pendiente."""
+        if self._dirty:
+            self.refresh()
+
+    def _on_domain_change(self, entity: str, kind: str, ids: tuple):
+        if entity != "hospedado":
+            return
+        if self.model.apply_change(kind, ids):
+            return
+        # búsqueda activa: la relevancia la decide el índice
+        if self.view.isVisible():
+            self.refresh()
+        else:
+            self._dirty = True
+
+    def _search_rows(self, text: str):
+        """Corre en un hilo del pool: solo datos, nada de widgets."""
+        q = (text or "").strip()
+        if not q:
+            return None
+        return self.model.repo.search_rows(q, limit=self.model.SEARCH_LIMIT)
+
+    def _show_results(self, text: str, rows):
+        self._dirty = False
+        if rows is None:
+            self.model.set_query("")  # listado completo paginado
+        else:
+            self.model.set_results(text, rows)
 
     # --------- ADD ---------
     def _add(self):
-        try:
-            data = self.view.get_form_data()
-            nombre = data["nombre"]
-            rut_in = _normalize_rut(data["rut"])
-            correo = data["correo"]
-            telefono_txt = data["telefono"]
-            sexo = data["sexo"]
-            edad_txt = data["edad"]
-
-            if not nombre or not rut_in or not correo:
-                raise ValueError("Nombre, RUT y correo son obligatorios.")
-            if not _is_valid_rut(rut_in):
-                raise ValueError("RUT no válido. Usa 12345678-9 (con DV correcto).")
-            if Hospedado.get_or_none(Hospedado.rut == rut_in):
-                raise ValueError("Ya existe un hospedado con ese RUT.")
-
-            tel_digits = re.sub(r"\D", "", telefono_txt or "")
-            telefono = tel_digits  # si lo guardas como texto; usa int(...) si es entero en DB
-
-            edad = int(edad_txt) if (edad_txt or "").isdigit() else 0
-
-            Hospedado.create(
-                nombre_completo=nombre,
-                rut=rut_in,
-                correo=correo,
-                telefono=telefono,
-                sexo=sexo,
-                edad=edad
-            )
-            self.view.clear_inputs()
-            self.refresh()
-        except ValueError as ve:
-            QMessageBox.warning(self.view, "Validación", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo agregar: {e}")
+        data = self.view.get_form_data()
+        nombre = data["nombre"]
+        rut_in = format_rut(data["rut"])
+        correo = data["correo"]
+        edad_txt = data["edad"]
+        if not nombre or not rut_in or not correo:
+            QMessageBox.warning(self.view, "Validación", "Nombre, RUT y correo son obligatorios.")
+            return
+        if not is_valid_rut(rut_in):
+            QMessageBox.warning(self.view, "Validación", "RUT no válido. Usa 12345678-9 (con DV correcto).")
+            return
+
+        tel_digits = re.sub(r"\D", "", data["telefono"] or "")
+        telefono = tel_digits  # si lo guardas como texto; usa int(...) si es entero en DB
+        edad = int(edad_txt) if (edad_txt or "").isdigit() else 0
+
+        # la fila nueva llega por el bus de eventos; aquí solo se limpia el formulario
+        run_db(self.view, self._create, dict(
+                   nombre_completo=nombre,
+                   rut=rut_in,
+                   correo=correo,
+                   telefono=telefono,
+                   sexo=data["sexo"],
+                   edad=edad,
+               ),
+               on_done=lambda _id: self.view.clear_inputs(),
+               error_prefix="No se pudo agregar: ")
+
+    @staticmethod
+    def _create(fields: dict) -> int:
+        """Hilo escritor (en transacción)."""
+        if Hospedado.by_rut(fields["rut"]):
+            raise ValueError("Ya existe un hospedado con ese RUT.")
+        return Hospedado.create(**fields).id
 
     # --------- DELETE ---------
     def _delete(self):
         rut = self.view.current_selected_rut()
         if not rut:
             return
-        try:
-            h = Hospedado.get_or_none(Hospedado.rut == rut)
-            if h:
-                h.delete_instance(recursive=True)
-                self.refresh()
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo eliminar: {e}")
+        run_db(self.view, self._delete_by_rut, rut, error_prefix="No se pudo eliminar: ")
+
+    @staticmethod
+    def _delete_by_rut(rut: str):
+        """Hilo escritor: familia y asignaciones se borran en la misma transacción."""
+        h = Hospedado.by_rut(rut)
+        if h:
+            h.delete_instance(recursive=True)
 
     # --------- DETAIL ---------
     def _open_detail(self, rut: str):
+        from ui.views.hospedado_detalle import HospedadoDetalleView
+        from controllers.hospedado_detalle_controller import HospedadoDetalleController
         dlg = HospedadoDetalleView(parent=self.view)
         ctrl = HospedadoDetalleController(dlg, rut=rut)
-        if dlg.exec_():
-            self.refresh()
+        dlg.exec_()  # lo guardado se refleja por el bus de eventos
+
+    # --------- IMPORT ---------
+    def _import(self):
+        from domain.services.hospedado_import_service import HospedadoImportService
+        path, _ = QFileDialog.getOpenFileName(
+            self.view, "Importar nómina", "", "Nóminas (*.csv *.xlsx);;Todos (*)")
+        if not path:
+            return
+        # corre en el hilo escritor (un lote por transacción): otras escrituras
+        # de la app esperan su turno en la cola en vez de chocar con el lock
+        progress = QProgressDialog("Importando…", "Detener", 0, 0, self.view)
+        progress.setWindowTitle("Importar nómina")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        cancel = threading.Event()
+        progress.canceled.connect(cancel.set)
+        bridge = _ImportProgress(self)
+        bridge.advanced.connect(lambda leidas, hosp, fam, rech: progress.setLabelText(
+            f"Filas leídas: {leidas}\nHospedados: {hosp}  Familiares: {fam}  Rechazos: {rech}"))
+
+        def on_progress(rep) -> bool:
+            """Hilo escritor: tras cada lote confirmado."""
+            bridge.advanced.emit(rep.leidas, rep.hospedados, rep.familiares, len(rep.rechazos))
+            return not cancel.is_set()
+
+        def finish():
+            bridge.deleteLater()
+            if not sip.isdeleted(progress):
+                progress.close()
+
+        def done(rep):
+            finish()
+            if not sip.isdeleted(self.view):
+                self._show_import_report(path, rep)
+
+        def failed(error):
+            finish()
+            if not sip.isdeleted(self.view):
+                QMessageBox.critical(self.view, "Error", f"No se pudo importar: {error}")
+
+        progress.show()
+        executor().serial(HospedadoImportService().import_file, path,
+                          on_progress=on_progress).then(done, failed)
+
+    def _show_import_report(self, path: str, rep):
+        from domain.services.hospedado_import_service import write_rejects
+        msg = (f"Hospedados agregados: {rep.hospedados}\n"
+               f"Familiares agregados: {rep.familiares}\n"
+               f"Filas rechazadas: {len(rep.rechazos)}")
+        if rep.rechazos:
+            rejects_path = f"{path}.rechazos.csv"
+            write_rejects(rep, rejects_path)
+            msg += f"\n\nDetalle de rechazos en:\n{rejects_path}"
+        QMessageBox.information(self.view, "Importación terminada", msg)
@@ -4,7 +4,11 @@ from PyQt5.QtWidgets import QMessageBox
 from ui.views.hospedado_detalle import HospedadoDetalleView
 from ui.views.familiares_views import FamiliarEditor   # diálogo (vista pura)
 from controllers.familiar_editor_controller import FamiliarEditorController
-from core.db import Hospedado, Familiar
+from core.db import Familiar
+from domain.repositories.familiar_repo import FamiliarRepository
+from domain.repositories.hospedado_repo import HospedadoRepository
+from controllers.db_tasks import run_db
+from core.db_executor import executor
 import re
 import os
 
@@ -12,7 +16,9 @@ class HospedadoDetalleController(QObject):
     def __init__(self, view: HospedadoDetalleView, rut: str):
         super().__init__(view)
         self.view = view
-        self.model = Hospedado.get_or_none(Hospedado.rut == rut)
+        self.familiares = FamiliarRepository()
+        self.repo = HospedadoRepository()
+        self.model = self.repo.by_rut(rut)  # reabrir: desde la caché de sesión
         if not self.model:
             QMessageBox.critical(self.view, "Error", f"No existe hospedado con RUT {rut}")
             self.view.reject()
@@ -52,49 +58,52 @@ class HospedadoDetalleController(QObject):
 
         self._reload_familiares()
 
-    def _reload_familiares(self):
-        fams = []
-        for f in Familiar.select().where(Familiar.hospedado == self.model):
-            fams.append({
-                "id": f.id,
-                "nombre": f.nombre,
-                "relacion": f.relacion,
-                "edad": f.edad
-            })
-        self.view.set_familiares(fams)
+    def _reload_familiares(self, *_):
+        # una consulta en un lector; el repo usa hospedado_id sin cargar el Hospedado por fila
+        executor().read(self._familiares_rows, self.model.id).then(self.view.set_familiares)
+
+    def _familiares_rows(self, hospedado_id: int) -> list[dict]:
+        return [{"id": f.id, "nombre": f.nombre, "relacion": f.relacion, "edad": f.edad}
+                for f in self.familiares.list_for_hospedado(hospedado_id)]
 
     # ---------- Actions ----------
     def _on_save(self):
-        try:
-            form = self.view.get_data()
-            nombre = form["nombre"]
-            correo = form["correo"]
-            tel    = re.sub(r"\D", "", form["telefono"] or "")
-            edad   = int(form["edad"]) if (form["edad"] or "").isdigit() else None
-            sexo   = form["sexo"]
-
-            if edad is not None and not (0 <= edad <= 120):
-                raise ValueError("La edad debe estar entre 0 y 120.")
-            if not nombre:
-                raise ValueError("El nombre no puede estar vacío.")
-            if correo and "@" not in correo:
-                raise ValueError("Correo no válido.")
-
-            self.model.nombre_completo = nombre
-            self.model.correo = correo or None
-            self.model.telefono = tel or None
-            self.model.edad = edad
-            self.model.sexo = sexo
-            self.model.save()
+        form = self.view.get_data()
+        nombre = form["nombre"]
+        correo = form["correo"]
+        tel    = re.sub(r"\D", "", form["telefono"] or "")
+        edad   = int(form["edad"]) if (form["edad"] or "").isdigit() else None
+        sexo   = form["sexo"]
+
+        error = None
+        if edad is not None and not (0 <= edad <= 120):
+            error = "La edad debe estar entre 0 y 120."
+        elif not nombre:
+            error = "El nombre no puede estar vacío."
+        elif correo and "@" not in correo:
+            error = "Correo no válido."
+        if error:
+            QMessageBox.warning(self.view, "Validación", error)
+            return
 
+        self.model.nombre_completo = nombre
+        self.model.correo = correo or None
+        self.model.telefono = tel or None
+        self.model.edad = edad
+        self.model.sexo = sexo
+
+        def done(_rows):
             QMessageBox.information(self.view, "Listo", "Cambios guardados.")
             self._snapshot = form
             self.view.set_edit_mode(False)
             self.view.accept()  # el caller puede refrescar la lista
-        except ValueError as ve:
-            QMessageBox.warning(self.view, "Validación", str(ve))
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo guardar: {e}")
+
+        run_db(self.view, self.model.save, on_done=done, on_error=self._discard,
+               error_prefix="No se pudo guardar: ")
+
+    def _discard(self, _error=None):
+        # el modelo es compartido (caché): si no se guardó, que la próxima apertura relea
+        self.repo.cache.forget((self.model.id,))
 
     def _on_cancel(self):
         self.view.set_data(self._snapshot)
@@ -106,23 +115,18 @@ class HospedadoDetalleController(QObject):
         ctrl = FamiliarEditorController(dlg)
         if dlg.exec_():
             data = ctrl.get_data()
-            try:
-                Familiar.create(
-                    hospedado=self.model,
-                    nombre=data["nombre"],
-                    edad=data["edad"],
-                    sexo=data["sexo"],
-                    relacion=data["relacion"],
-                )
-                self._reload_familiares()
-            except Exception as e:
-                QMessageBox.critical(self.view, "Error al guardar", f"No se pudo guardar el familiar:\n{e}")
+            run_db(self.view, Familiar.create,
+                   hospedado=self.model.id,
+                   nombre=data["nombre"],
+                   edad=data["edad"],
+                   sexo=data["sexo"],
+                   relacion=data["relacion"],
+                   on_done=self._reload_familiares,
+                   error_title="Error al guardar",
+                   error_prefix="No se pudo guardar el familiar:\n")
 
     def _on_delete_familiar(self, fam_id: int):
         if not fam_id:
             return
-        try:
-            Familiar.get_by_id(fam_id).delete_instance()
-            self._reload_familiares()
-        except Exception as e:
-            QMessageBox.critical(self.view, "Error", f"No se pudo eliminar: {e}")
+        run_db(self.view, lambda: Familiar.get_by_id(fam_id).delete_instance(),
+               on_done=self._reload_familiares, error_prefix="No se pudo eliminar: ")
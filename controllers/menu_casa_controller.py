@@ -14,7 +14,8 @@ class MenuCasaController(QObject):
     """
     Orquesta la vista de pestañas (Anfitriones / Casas).
     - Cablea los sub-controladores correctos.
-    - Refresca la pestaña activa al cambiar.
+    - Al cambiar de pestaña solo re-consulta si esa pestaña quedó desactualizada
+      (los sub-controllers se mantienen al día con el bus de eventos).
     """
     def __init__(self, view: Menu_Casa_View):
         super().__init__(view)
@@ -30,9 +31,25 @@ class MenuCasaController(QObject):
         # Refresco inicial
         self._safe_refresh_current()
 
-    def _on_tab_changed(self, _index: int):
+    def refresh(self):
+        """Al re-mostrar el módulo (router con caché): anfitriones del combo + pestaña activa."""
+        self.casa_controller.reload_hosts()
         self._safe_refresh_current()
 
+    def refresh_if_dirty(self):
+        """Al re-mostrar el módulo: solo lo que cambió sin poder parcharse."""
+        self._refresh_current_if_dirty()
+
+    def _on_tab_changed(self, _index: int):
+        self._refresh_current_if_dirty()
+
+    def _refresh_current_if_dirty(self):
+        current = self.view.tabs.currentWidget()
+        if current is self.view.anfitrion_tab:
+            self.anfitrion_controller.refresh_if_dirty()
+        elif current is self.view.casa_tab:
+            self.casa_controller.refresh_if_dirty()
+
     def _safe_refresh_current(self):
         """Refresca usando el SUB-CONTROLLER adecuado (no la vista)."""
         current = self.view.tabs.currentWidget()
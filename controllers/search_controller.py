@@ -0,0 +1,101 @@
+# controllers/search_controller.py
+from typing import Any, Callable, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+class _TaskSignals(QObject):
+    done   = pyqtSignal(int, str, object)  # generación, texto, resultado
+    failed = pyqtSignal(int, str, str)     # generación, texto, error
+
+
+class _SearchTask(QRunnable):
+    """Ejecuta query_fn(texto) en un hilo del pool. No toca widgets."""
+    def __init__(self, gen: int, text: str, fn: Callable[[str], Any],
+                 latest: Callable[[], int], signals: _TaskSignals):
+        super().__init__()
+        self.gen, self.text, self.fn = gen, text, fn
+        self.latest, self.signals = latest, signals
+
+    def run(self):
+        # Si ya llegó otra tecla mientras esperaba en cola, no consultar
+        if self.gen != self.latest():
+            return
+        try:
+            result = self.fn(self.text)
+        except Exception as e:
+            self._emit(self.signals.failed, self.gen, self.text, str(e))
+            return
+        if self.gen == self.latest():
+            self._emit(self.signals.done, self.gen, self.text, result)
+
+    @staticmethod
+    def _emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass  # el controller (y su vista) ya fueron destruidos
+
+
+class SearchController(QObject):
+    """
+    Búsqueda con debounce fuera del hilo de la GUI, reutilizable por cualquier vista:
+    - set_text(): conéctalo a view.searchRequested; espera `delay_ms` sin teclas.
+    - query_fn(texto) corre en un QThreadPool y debe devolver datos planos.
+    - Solo se entrega el resultado de la última búsqueda (resultsReady);
+      las consultas obsoletas se saltan si aún no partieron y se descartan si ya corrían.
+    """
+    resultsReady = pyqtSignal(str, object)  # texto, resultado de query_fn
+    searchFailed = pyqtSignal(str, str)     # texto, mensaje de error
+
+    def __init__(self, query_fn: Callable[[str], Any], delay_ms: int = 250,
+                 pool: Optional[QThreadPool] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._query_fn = query_fn
+        self._pool = pool or QThreadPool.globalInstance()
+        self._text = ""
+        self._gen = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._launch)
+
+        self._signals = _TaskSignals(self)
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+
+    # ---------- API ----------
+    def set_text(self, text: str):
+        self._text = text or ""
+        self._gen += 1  # invalida lo que esté en vuelo
+        self._timer.start()
+
+    def run_now(self, text: Optional[str] = None):
+        """Sin debounce (p.ej. refresh tras agregar/eliminar)."""
+        if text is not None:
+            self._text = text or ""
+        self._timer.stop()
+        self._launch()
+
+    def cancel(self):
+        self._timer.stop()
+        self._gen += 1
+
+    # ---------- internos ----------
+    def _latest(self) -> int:
+        return self._gen
+
+    def _launch(self):
+        self._gen += 1
+        self._pool.start(_SearchTask(self._gen, self._text, self._query_fn,
+                                     self._latest, self._signals))
+
+    def _on_done(self, gen: int, text: str, result: object):
+        if gen == self._gen:
+            self.resultsReady.emit(text, result)
+
+    def _on_failed(self, gen: int, text: str, error: str):
+        if gen != self._gen:
+            return
+        print(f"[search] Error buscando '{text}': {error}")
+        self.searchFailed.emit(text, error)
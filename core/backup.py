@@ -0,0 +1,308 @@
+# core/backup.py
+from __future__ import annotations
+import argparse
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from core.settings import BACKUP_DIR, BACKUP_KEEP_LAST, BACKUP_KEEP_DAILY
+
+# -------------------------------------------------------------------
+# Respaldos en caliente con la API de backup de SQLite (nunca copiando
+# minshuku.sqlite + -wal/-shm a mano, que con la app abierta da copias rotas).
+#   - snapshot(): copia de a `pages` páginas por paso desde una conexión
+#     propia que mantiene abierta una transacción de lectura: en WAL eso fija
+#     la foto (copia consistente aunque la app siga escribiendo, sin
+#     reinicios del backup) y los escritores no esperan. Entre pasos se
+#     informa avance y se puede cancelar (también durante la verificación y
+#     entre bloques de la compresión). La copia queda en modo DELETE (un
+#     solo archivo), se verifica (quick_check) y se comprime (gzip).
+#   - prune(): retención = los N más recientes + el último de cada día, D días;
+#     borra además los temporales (.part) que dejó un proceso que murió.
+#   - restore(): respalda lo actual y vuelca la foto con la misma API
+#     (respeta el WAL del destino). Con la app cerrada. Si la base sincroniza,
+#     el equipo restaurado recibe un id de nodo nuevo (ver restore()).
+#   python -m core.backup snapshot | list | prune | restore <archivo>
+# -------------------------------------------------------------------
+PREFIX = "minshuku-"
+PAGES_PER_STEP = 1024        # 4 MB por paso con páginas de 4 KB
+COMPRESS_LEVEL = 1           # 3x más rápido que 6 y casi la misma razón (medido en bench.backup_bench)
+CHUNK = 1 << 20              # bloque de compresión (entre bloques se revisa la cancelación)
+STALE_PART_S = 3600          # un .part sin escribirse hace más que esto es de un proceso muerto
+_STAMP = "%Y%m%d-%H%M%S"
+
+Progress = Callable[[int, int], None]   # (páginas copiadas, total)
+
+
+class BackupCancelled(Exception):
+    pass
+
+
+class Snapshot:
+    __slots__ = ("path", "created", "label", "size", "stats")
+
+    def __init__(self, path: Path, created: datetime, label: str = "", stats: Optional[dict] = None):
+        self.path = path
+        self.created = created
+        self.label = label
+        self.size = path.stat().st_size if path.exists() else 0
+        self.stats = stats or {}
+
+    @classmethod
+    def from_path(cls, path: Path) -> Optional["Snapshot"]:
+        """minshuku-20260101-120000[-etiqueta].sqlite[.gz] → Snapshot (None si no calza)."""
+        name = path.name
+        if not name.startswith(PREFIX) or not (name.endswith(".sqlite") or name.endswith(".sqlite.gz")):
+            return None
+        stem = name[len(PREFIX):].split(".sqlite")[0]
+        try:
+            created = datetime.strptime(stem[:15], _STAMP)
+        except ValueError:
+            return None
+        return cls(path, created, stem[16:])
+
+    def __repr__(self) -> str:
+        return f"{self.path.name} ({self.size / 1e6:.1f} MB)"
+
+
+def _default_source() -> Path:
+    from core.db import db
+    return Path(db.database)
+
+
+class BackupService:
+    def __init__(self, source: Optional[Path] = None, dest: Path = BACKUP_DIR,
+                 pages: int = PAGES_PER_STEP, compress: bool = True,
+                 keep_last: int = BACKUP_KEEP_LAST, keep_daily: int = BACKUP_KEEP_DAILY,
+                 throttle_s: float = 0.0):
+        self.source = Path(source) if source else _default_source()
+        self.dest = Path(dest)
+        self.pages = pages
+        self.compress = compress
+        self.keep_last = keep_last
+        self.keep_daily = keep_daily
+        self.throttle_s = throttle_s     # pausa entre pasos (cuidar el disco en equipos lentos)
+
+    # ---------- respaldo ----------
+    def snapshot(self, label: str = "", progress: Optional[Progress] = None,
+                 cancel: Optional[threading.Event] = None) -> Snapshot:
+        """Foto consistente de la base en uso; no bloquea a los escritores."""
+        self.dest.mkdir(parents=True, exist_ok=True)
+        created = datetime.now()
+        name = PREFIX + created.strftime(_STAMP) + (f"-{label}" if label else "") + ".sqlite"
+        final = self.dest / (name + ".gz" if self.compress else name)
+        tmp = self.dest / f".{name}.part"
+        stats = {"pages": 0, "steps": 0}
+        try:
+            t0 = time.perf_counter()
+            self._copy(self.source, tmp, progress, cancel, stats)
+            stats["copy_s"] = time.perf_counter() - t0
+            stats["bytes"] = tmp.stat().st_size
+            t0 = time.perf_counter()
+            if self.compress:
+                part = final.with_name(final.name + ".part")
+                with open(tmp, "rb") as src, gzip.open(part, "wb", compresslevel=COMPRESS_LEVEL) as dst:
+                    while block := src.read(CHUNK):
+                        _check(cancel)
+                        dst.write(block)
+                os.replace(part, final)
+                tmp.unlink()
+            else:
+                os.replace(tmp, final)
+            stats["compress_s"] = time.perf_counter() - t0
+        finally:
+            for leftover in (tmp, final.with_name(final.name + ".part")):
+                leftover.unlink(missing_ok=True)
+        return Snapshot(final, created, label, stats)
+
+    def _copy(self, source: Path, target: Path, progress: Optional[Progress],
+              cancel: Optional[threading.Event], stats: dict) -> None:
+        src = sqlite3.connect(str(source), isolation_level=None, timeout=30)
+        dst = sqlite3.connect(str(target), isolation_level=None)
+        try:
+            # transacción de lectura abierta: la foto queda fija durante todos los pasos
+            src.execute("BEGIN")
+            src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+            def step(_status, remaining, total):
+                stats["steps"] += 1
+                stats["pages"] = total
+                if progress:
+                    progress(total - remaining, total)
+                _check(cancel)
+                if self.throttle_s:
+                    time.sleep(self.throttle_s)
+
+            src.backup(dst, pages=self.pages, progress=step)
+            src.execute("COMMIT")
+            # un solo archivo autocontenido (la foto hereda el modo WAL del origen)
+            dst.execute("PRAGMA journal_mode=DELETE")
+            if cancel is not None:
+                # quick_check de una base grande tarda: el handler lo interrumpe al cancelar
+                dst.set_progress_handler(cancel.is_set, 10_000)
+            try:
+                check = dst.execute("PRAGMA quick_check").fetchone()[0]
+            except sqlite3.OperationalError:
+                _check(cancel)
+                raise
+            if check != "ok":
+                raise sqlite3.DatabaseError(f"la copia no pasó quick_check: {check}")
+        finally:
+            dst.close()
+            src.close()
+
+    # ---------- catálogo / retención ----------
+    def snapshots(self) -> list[Snapshot]:
+        """Respaldos en la carpeta, del más nuevo al más antiguo."""
+        if not self.dest.exists():
+            return []
+        snaps = [s for s in map(Snapshot.from_path, self.dest.iterdir()) if s is not None]
+        return sorted(snaps, key=lambda s: s.created, reverse=True)
+
+    def latest(self) -> Optional[Snapshot]:
+        snaps = self.snapshots()
+        return snaps[0] if snaps else None
+
+    def prune(self, now: Optional[datetime] = None) -> list[Path]:
+        """Borra lo que no entra en la retención y los temporales huérfanos; devuelve lo borrado."""
+        stale = self._stale_parts()
+        for path in stale:
+            path.unlink(missing_ok=True)
+        snaps = self.snapshots()
+        keep = set(s.path for s in snaps[:self.keep_last])
+        horizon = (now or datetime.now()).date() - timedelta(days=self.keep_daily)
+        days = set()
+        for s in snaps:  # del más nuevo al más antiguo: queda el último de cada día
+            day = s.created.date()
+            if day > horizon and day not in days:
+                days.add(day)
+                keep.add(s.path)
+        removed = [s.path for s in snaps if s.path not in keep]
+        for path in removed:
+            path.unlink(missing_ok=True)
+        return stale + removed
+
+    def _stale_parts(self) -> list[Path]:
+        # .minshuku-*.sqlite.part[-journal], minshuku-*.sqlite.gz.part, .restore-<pid>.sqlite;
+        # uno en curso se escribe sin parar, así que su mtime es reciente
+        if not self.dest.exists():
+            return []
+        limit = time.time() - STALE_PART_S
+        found = set()
+        for pattern in (f".{PREFIX}*.part*", f"{PREFIX}*.part", ".restore-*.sqlite"):
+            found.update(p for p in self.dest.glob(pattern) if p.stat().st_mtime < limit)
+        return sorted(found)
+
+    # ---------- restauración ----------
+    def restore(self, snapshot: Path, target: Optional[Path] = None,
+                progress: Optional[Progress] = None) -> Optional[Snapshot]:
+        """
+        Vuelca `snapshot` sobre la base (por defecto la de la app). Antes
+        respalda lo actual con la etiqueta "antes-de-restaurar" (lo devuelve).
+        Usar con la app cerrada: las cachés de una app abierta no se enteran.
+        La foto trae la bitácora de sync y las marcas de agua de entonces: con
+        el mismo id de nodo, lo que este equipo envió después de la foto no
+        volvería nunca (pull salta los lotes propios). Con un id nuevo esos
+        lotes llegan como ajenos y el equipo se pone al día.
+        """
+        target = Path(target) if target else self.source
+        snapshot = Path(snapshot)
+        work = self.dest / f".restore-{os.getpid()}.sqlite"
+        self.dest.mkdir(parents=True, exist_ok=True)
+        try:
+            if snapshot.name.endswith(".gz"):
+                with gzip.open(snapshot, "rb") as src, open(work, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            else:
+                shutil.copyfile(snapshot, work)
+            src = sqlite3.connect(str(work), isolation_level=None)
+            try:
+                check = src.execute("PRAGMA quick_check").fetchone()[0]
+                if check != "ok":
+                    raise sqlite3.DatabaseError(f"el respaldo está dañado: {check}")
+                safety = None
+                if target.exists():
+                    safety = BackupService(target, self.dest, self.pages, self.compress).snapshot(
+                        "antes-de-restaurar")
+                dst = sqlite3.connect(str(target), isolation_level=None, timeout=30)
+                try:
+                    # escribe bajo el lock de escritura del destino y respeta su WAL
+                    src.backup(dst, pages=self.pages,
+                               progress=(lambda _s, rem, tot: progress(tot - rem, tot)) if progress else None)
+                    _renew_node(dst)
+                finally:
+                    dst.close()
+            finally:
+                src.close()
+        finally:
+            work.unlink(missing_ok=True)
+        return safety
+
+
+def _renew_node(con: sqlite3.Connection) -> None:
+    from core.changelog import new_node_id
+    if con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_meta'").fetchone():
+        con.execute("UPDATE sync_meta SET value = ? WHERE key = 'node'", (new_node_id(),))
+
+
+def _check(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise BackupCancelled("respaldo cancelado")
+
+
+def _print_progress(done: int, total: int) -> None:
+    print(f"\r  {done}/{total} páginas ({done / max(total, 1):.0%})", end="", flush=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Respaldos en caliente de la base de Minshuku+.")
+    ap.add_argument("--db", help="base de origen/destino (por defecto data/minshuku.sqlite)")
+    ap.add_argument("--dir", default=str(BACKUP_DIR), help="carpeta de respaldos")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    snap = sub.add_parser("snapshot", help="respalda ahora (y aplica la retención)")
+    snap.add_argument("--label", default="")
+    snap.add_argument("--no-compress", action="store_true")
+    sub.add_parser("list", help="lista los respaldos")
+    sub.add_parser("prune", help="aplica la retención")
+    rest = sub.add_parser("restore", help="restaura un respaldo (con la app cerrada)")
+    rest.add_argument("snapshot")
+    rest.add_argument("--yes", action="store_true", help="no pedir confirmación")
+    args = ap.parse_args(argv)
+
+    service = BackupService(Path(args.db) if args.db else None, Path(args.dir),
+                            compress=not getattr(args, "no_compress", False))
+    if args.cmd == "snapshot":
+        s = service.snapshot(args.label, progress=_print_progress)
+        mb = s.stats["bytes"] / 1e6
+        print(f"\n{s.path}  {mb:.1f} MB → {s.size / 1e6:.1f} MB en "
+              f"{s.stats['copy_s']:.1f} s + {s.stats['compress_s']:.1f} s "
+              f"({mb / max(s.stats['copy_s'], 1e-9):.0f} MB/s copia)")
+        for path in service.prune():
+            print(f"borrado: {path.name}")
+    elif args.cmd == "list":
+        for s in service.snapshots():
+            print(f"{s.created:%Y-%m-%d %H:%M:%S}  {s.size / 1e6:9.1f} MB  {s.path.name}")
+    elif args.cmd == "prune":
+        for path in service.prune():
+            print(f"borrado: {path.name}")
+    elif args.cmd == "restore":
+        if not args.yes:
+            answer = input(f"¿Reemplazar {service.source} con {args.snapshot}? (s/N) ")
+            if answer.strip().lower() not in ("s", "si", "sí"):
+                return 1
+        safety = service.restore(Path(args.snapshot), progress=_print_progress)
+        print()
+        if safety is not None:
+            print(f"lo anterior quedó en: {safety.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# core/backup_scheduler.py
+from __future__ import annotations
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from core.backup import BackupCancelled, BackupService
+from core.settings import BACKUP_HOURS
+
+# -------------------------------------------------------------------
+# Respaldos programados dentro de la app: revisa cada CHECK_MS si el último
+# respaldo tiene más de `interval_h` horas y, si toca, lo hace en un hilo
+# propio (no en el escritor de DB: las escrituras del usuario no esperan;
+# tampoco en la GUI: la API de backup suelta el GIL en cada paso).
+# Al cerrar la app, stop() cancela un respaldo a medias (no deja archivos).
+# -------------------------------------------------------------------
+CHECK_MS = 15 * 60 * 1000
+FIRST_CHECK_MS = 60 * 1000   # no compite con el arranque
+
+
+class BackupScheduler(QObject):
+    finished = pyqtSignal(object)   # Snapshot
+    failed = pyqtSignal(str)
+
+    def __init__(self, service: Optional[BackupService] = None, interval_h: float = BACKUP_HOURS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.service = service or BackupService()
+        self.interval = timedelta(hours=interval_h)
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(CHECK_MS)
+        self._timer.timeout.connect(self.check)
+
+    def start(self, first_check_ms: int = FIRST_CHECK_MS) -> "BackupScheduler":
+        QTimer.singleShot(first_check_ms, self.check)
+        self._timer.start()
+        return self
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self._timer.stop()
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self) -> None:
+        latest = self.service.latest()
+        if latest is None or datetime.now() - latest.created >= self.interval:
+            self.run_now()
+
+    def run_now(self, label: str = "") -> bool:
+        """Respalda ya en segundo plano; False si hay uno en curso o ya se pidió parar."""
+        if self.running() or self._cancel.is_set():
+            return False
+        self._thread = threading.Thread(target=self._run, args=(label,), name="backup", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self, label: str) -> None:
+        # hilo de respaldo: las señales llegan a la GUI por cola
+        try:
+            snap = self.service.snapshot(label, cancel=self._cancel)
+            self.service.prune()
+        except BackupCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        self.finished.emit(snap)
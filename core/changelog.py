@@ -0,0 +1,153 @@
+# core/changelog.py
+from __future__ import annotations
+import uuid
+from peewee import Database
+
+# -------------------------------------------------------------------
+# Bitácora de cambios para sincronizar (mantenida por triggers)
+#   - sync_meta: clave/valor (node = id de este equipo, applying = 1
+#     mientras se aplican cambios remotos, marcas de agua)
+#   - sync_row:  una fila por registro sincronizable, clave (tabla, gid):
+#     id global, fila local, versión, nodo que la escribió por última vez,
+#     tombstone y seq local (orden de cambio, para exportar deltas).
+#     El gid es aleatorio ("<nodo>:<16 hex>"), no el id local: SQLite
+#     reusa el id de la última fila borrada y una fila nueva no debe
+#     heredar la identidad (ni pisar la baja pendiente) de la anterior.
+#     Las bajas quedan como tombstone; a lo sumo una fila viva por id local.
+#   - sync_map:  alias gid ajeno -> fila local (al fusionar por RUT)
+# -------------------------------------------------------------------
+DDL = [
+    """CREATE TABLE IF NOT EXISTS sync_meta (
+        key TEXT PRIMARY KEY, value TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS sync_row (
+        tbl TEXT NOT NULL, gid TEXT NOT NULL, row_id INTEGER NOT NULL,
+        version INTEGER NOT NULL, origin TEXT NOT NULL,
+        deleted INTEGER NOT NULL DEFAULT 0, seq INTEGER NOT NULL,
+        updated_at TEXT,
+        PRIMARY KEY (tbl, gid))""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS sync_row_live ON sync_row (tbl, row_id) WHERE deleted = 0",
+    "CREATE INDEX IF NOT EXISTS sync_row_seq ON sync_row (seq)",
+    """CREATE TABLE IF NOT EXISTS sync_map (
+        tbl TEXT NOT NULL, gid TEXT NOT NULL, row_id INTEGER NOT NULL,
+        PRIMARY KEY (tbl, gid))""",
+    "CREATE INDEX IF NOT EXISTS sync_map_row ON sync_map (tbl, row_id)",
+]
+
+_NODE = "(SELECT value FROM sync_meta WHERE key = 'node')"
+_NEW_GID = f"{_NODE} || ':' || lower(hex(randomblob(8)))"
+_NEXT_SEQ = "(SELECT COALESCE(MAX(seq), 0) + 1 FROM sync_row)"
+_LOCAL = "(SELECT value FROM sync_meta WHERE key = 'applying') = '0'"
+
+
+def _triggers(table: str) -> list[str]:
+    return [
+        # una fila viva que quedó con este id (borrada en cascada mientras se
+        # importaba, con los triggers apagados) pasa a tombstone antes del alta
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_sync_ai AFTER INSERT ON {table}
+        WHEN {_LOCAL} BEGIN
+            UPDATE sync_row SET deleted = 1 WHERE tbl = '{table}' AND row_id = new.id AND deleted = 0;
+            DELETE FROM sync_map WHERE tbl = '{table}' AND row_id = new.id;
+            INSERT INTO sync_row (tbl, gid, row_id, version, origin, deleted, seq, updated_at)
+            VALUES ('{table}', {_NEW_GID}, new.id, 1, {_NODE}, 0, {_NEXT_SEQ}, new.updated_at);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_sync_au AFTER UPDATE ON {table}
+        WHEN {_LOCAL} BEGIN
+            UPDATE sync_row SET version = version + 1, origin = {_NODE}, deleted = 0,
+                   seq = {_NEXT_SEQ}, updated_at = new.updated_at
+            WHERE tbl = '{table}' AND row_id = new.id AND deleted = 0;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_sync_ad AFTER DELETE ON {table}
+        WHEN {_LOCAL} BEGIN
+            UPDATE sync_row SET version = version + 1, origin = {_NODE}, deleted = 1,
+                   seq = {_NEXT_SEQ}, updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+            WHERE tbl = '{table}' AND row_id = old.id AND deleted = 0;
+            DELETE FROM sync_map WHERE tbl = '{table}' AND row_id = old.id;
+        END""",
+    ]
+
+
+def _upgrade_v1(database: Database) -> None:
+    """
+    Bitácora anterior (sync_row con clave (tbl, row_id), sync_map por gid):
+    la pasa a la clave (tbl, gid) conservando gids, versiones y tombstones.
+    Los triggers viejos se borran; ensure_change_log los vuelve a crear.
+    """
+    pk = {r[1] for r in database.execute_sql("PRAGMA table_info(sync_row)").fetchall() if r[5]}
+    if not pk or "gid" in pk:
+        return
+    for (name,) in database.execute_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB '*_sync_a[iud]'").fetchall():
+        database.execute_sql(f'DROP TRIGGER "{name}"')
+    for index in ("sync_row_seq", "sync_row_gid", "sync_map_row"):
+        database.execute_sql(f"DROP INDEX IF EXISTS {index}")
+    database.execute_sql("ALTER TABLE sync_row RENAME TO sync_row_v1")
+    database.execute_sql("ALTER TABLE sync_map RENAME TO sync_map_v1")
+    for stmt in DDL:
+        database.execute_sql(stmt)
+    database.execute_sql(
+        """INSERT OR IGNORE INTO sync_row (tbl, gid, row_id, version, origin, deleted, seq, updated_at)
+           SELECT tbl, gid, row_id, version, origin, deleted, seq, updated_at FROM sync_row_v1""")
+    database.execute_sql(
+        """INSERT OR IGNORE INTO sync_map (tbl, gid, row_id)
+           SELECT m.tbl, m.gid, m.row_id FROM sync_map_v1 m
+           WHERE NOT EXISTS (SELECT 1 FROM sync_row s WHERE s.tbl = m.tbl AND s.gid = m.gid)""")
+    database.execute_sql("DROP TABLE sync_row_v1")
+    database.execute_sql("DROP TABLE sync_map_v1")
+
+
+def ensure_change_log(database: Database, tables: list[str]) -> None:
+    """
+    Crea la bitácora y los triggers de las tablas dadas (idempotente).
+    Las filas que existían antes de instalarla entran con versión 1,
+    como cambios locales pendientes de enviar; ese relleno recorre la
+    tabla entera, así que corre una sola vez por tabla (marca
+    log_ready:<tabla> en sync_meta) y no en cada arranque.
+    """
+    existing = {r[0] for r in database.execute_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    with database.atomic():
+        if "sync_row" in existing:
+            _upgrade_v1(database)
+        for stmt in DDL:
+            database.execute_sql(stmt)
+        database.execute_sql("INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('node', ?)",
+                             (new_node_id(),))
+        database.execute_sql("INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('applying', '0')")
+        # si un proceso murió a mitad de una importación, no dejar los triggers apagados
+        database.execute_sql("UPDATE sync_meta SET value = '0' WHERE key = 'applying'")
+        node = node_id(database)
+        ready = {r[0][len("log_ready:"):] for r in database.execute_sql(
+            "SELECT key FROM sync_meta WHERE key LIKE 'log_ready:%'").fetchall()}
+        for table in tables:
+            if table not in existing:
+                continue
+            for stmt in _triggers(table):
+                database.execute_sql(stmt)
+            if table in ready:
+                continue
+            database.execute_sql(
+                f"""INSERT INTO sync_row (tbl, gid, row_id, version, origin, deleted, seq, updated_at)
+                    SELECT '{table}', ? || ':' || lower(hex(randomblob(8))), t.id, 1, ?, 0,
+                           (SELECT COALESCE(MAX(seq), 0) FROM sync_row) + t.id, t.updated_at
+                    FROM {table} t
+                    WHERE NOT EXISTS (SELECT 1 FROM sync_row s
+                                      WHERE s.tbl = '{table}' AND s.row_id = t.id AND s.deleted = 0)""",
+                (node, node))
+            set_meta(database, f"log_ready:{table}", 1)
+
+
+def new_node_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def node_id(database: Database) -> str:
+    return database.execute_sql("SELECT value FROM sync_meta WHERE key = 'node'").fetchone()[0]
+
+
+def get_meta(database: Database, key: str, default: str = "") -> str:
+    row = database.execute_sql("SELECT value FROM sync_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(database: Database, key: str, value) -> None:
+    database.execute_sql("INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)", (key, str(value)))
@@ -2,10 +2,12 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from peewee import (
     Model, SqliteDatabase, AutoField, CharField, IntegerField, BooleanField,
     DateTimeField, ForeignKeyField, TextField, Check
 )
+from utils.validators import split_rut, format_rut
 
 # -------------------------------------------------------------------
 # Config DB (SQLite en data/minshuku.sqlite)
@@ -33,19 +35,62 @@ class BaseModel(Model):
 
     def save(self, *args, **kwargs):
         self.updated_at = datetime.now()
-        return super().save(*args, **kwargs)
+        inserting = kwargs.get("force_insert", False) or self._pk is None
+        rows = super().save(*args, **kwargs)
+        if rows:
+            from core.events import emit, INSERTED, UPDATED
+            emit(self._meta.table_name, INSERTED if inserting else UPDATED, (self._pk,))
+        return rows
+
+    def delete_instance(self, *args, **kwargs):
+        pk = self._pk
+        rows = super().delete_instance(*args, **kwargs)
+        if rows:
+            from core.events import emit, DELETED
+            emit(self._meta.table_name, DELETED, (pk,))
+        return rows
 
     class Meta:
         database = db
 
 
+class RutMixin:
+    """
+    Para modelos con RUT: mantiene rut_num (cuerpo, entero con índice único)
+    y rut_dv sincronizados con `rut`, y guarda `rut` en formato canónico.
+    Todas las búsquedas por RUT deben pasar por by_rut() (usa el índice entero).
+    """
+    def save(self, *args, **kwargs):
+        parts = split_rut(self.rut)
+        if parts:
+            self.rut_num, self.rut_dv = parts
+            self.rut = format_rut(self.rut)
+        else:
+            self.rut_num, self.rut_dv = None, None
+        return super().save(*args, **kwargs)
+
+    @classmethod
+    def rut_key(cls, rut: str) -> Optional[int]:
+        parts = split_rut(rut)
+        return parts[0] if parts else None
+
+    @classmethod
+    def by_rut(cls, rut: str):
+        num = cls.rut_key(rut)
+        if num is None:
+            return None
+        return cls.get_or_none(cls.rut_num == num)
+
+
 # -------------------------------------------------------------------
 # Tablas
 # -------------------------------------------------------------------
-class Anfitrion(BaseModel):
+class Anfitrion(RutMixin, BaseModel):
     id = AutoField()
-    nombre_completo = CharField(max_length=180)
+    nombre_completo = CharField(max_length=180, index=True)   # orden/keyset (nombre, id)
     rut = CharField(max_length=20, unique=True, index=True)
+    rut_num = IntegerField(null=True, unique=True)             # cuerpo del RUT (búsquedas)
+    rut_dv = CharField(max_length=1, null=True)
     telefono = CharField(max_length=32, null=True)
     correo = CharField(max_length=180, null=True)
     sexo = CharField(max_length=16, default="Hombre")          # validación real en servicio
@@ -58,7 +103,7 @@ class Anfitrion(BaseModel):
 
 class Casa(BaseModel):
     id = AutoField()
-    direccion = CharField(max_length=240)
+    direccion = CharField(max_length=240, index=True)          # orden/keyset (direccion, id)
     anfitrion = ForeignKeyField(Anfitrion, backref="casas", on_delete="CASCADE")
 
     # baños comunes de la casa
@@ -92,10 +137,41 @@ class Pieza(BaseModel):
         return f"{self.nombre} @ {self.casa.direccion}"
 
 
-class Hospedado(BaseModel):
+class Habitacion(BaseModel):
+    """Habitación del detalle de casa (capacidad + camas sueltas)."""
+    id = AutoField()
+    casa = ForeignKeyField(Casa, backref="habitaciones", on_delete="CASCADE")
+    capacidad = IntegerField(default=1, constraints=[Check("capacidad >= 0")])
+
+    def __str__(self) -> str:
+        return f"Habitación {self.id} ({self.capacidad} pax)"
+
+
+class Cama(BaseModel):
+    id = AutoField()
+    habitacion = ForeignKeyField(Habitacion, backref="camas", on_delete="CASCADE")
+    tipo = CharField(max_length=20, default="Individual")      # "Individual","Matrimonial","Litera"
+
+    def __str__(self) -> str:
+        return self.tipo
+
+
+class Bano(BaseModel):
+    id = AutoField()
+    casa = ForeignKeyField(Casa, backref="banos", on_delete="CASCADE")
+    ubicacion = CharField(max_length=120, default="")          # p.ej. "Piso 1 – pasillo"
+    tiene_tina = BooleanField(default=False)
+
+    def __str__(self) -> str:
+        return f"Baño {self.ubicacion}" + (" (tina)" if self.tiene_tina else "")
+
+
+class Hospedado(RutMixin, BaseModel):
     id = AutoField()
-    nombre_completo = CharField(max_length=180)
+    nombre_completo = CharField(max_length=180, index=True)   # orden/keyset (nombre, id)
     rut = CharField(max_length=20, unique=True, index=True)
+    rut_num = IntegerField(null=True, unique=True)             # cuerpo del RUT (búsquedas)
+    rut_dv = CharField(max_length=1, null=True)
     correo = CharField(max_length=180, null=True)
     telefono = CharField(max_length=32, null=True)
     edad = IntegerField(null=True, constraints=[Check("edad >= 0 AND edad <= 120")])
@@ -109,7 +185,7 @@ class Hospedado(BaseModel):
 class Familiar(BaseModel):
     id = AutoField()
     hospedado = ForeignKeyField(Hospedado, backref="familia", on_delete="CASCADE")
-    nombre = CharField(max_length=180)
+    nombre = CharField(max_length=180, index=True)             # orden/keyset (nombre, id)
     edad = IntegerField(null=True, constraints=[Check("edad >= 0 AND edad <= 120")])
     sexo = CharField(max_length=16, default="Hombre")
     relacion = CharField(max_length=40, null=True)             # "Cónyuge", "Hijo/a", etc.
@@ -132,36 +208,85 @@ class Asignacion(BaseModel):
     estado = CharField(max_length=20, default="pendiente")     # "pendiente","activa","finalizada"
     notas = TextField(null=True)
 
+    class Meta:
+        # consultas de ocupación/disponibilidad: casa o pieza + estado + rango de fechas
+        indexes = (
+            (("casa", "estado", "fecha_inicio", "fecha_fin"), False),
+            (("pieza", "estado", "fecha_inicio", "fecha_fin"), False),
+        )
+
     def __str__(self) -> str:
         return f"{self.hospedado.nombre_completo} → {self.casa.direccion}"
 
 
+# -------------------------------------------------------------------
+# Registro del esquema: única definición de cada tabla. Repositorios,
+# controllers, sync y migraciones usan estas clases (domain.models solo
+# las reexporta). Las clases se construyen una vez al importar este
+# módulo; `db` no abre conexión hasta connect_db() y puede re-apuntarse
+# con db.init() (bench, tests manuales) sin redefinir los modelos.
+# -------------------------------------------------------------------
+# orden de dependencias (FK): padres antes que hijos (create_tables, sync)
+ALL_MODELS = [Anfitrion, Casa, Pieza, Habitacion, Cama, Bano, Hospedado, Familiar, Asignacion]
+MODELS: dict[str, type[BaseModel]] = {m._meta.table_name: m for m in ALL_MODELS}  # por tabla
+
+
 # -------------------------------------------------------------------
 # Init / Close
 # -------------------------------------------------------------------
-ALL_MODELS = [Anfitrion, Casa, Pieza, Hospedado, Familiar, Asignacion]
+
+_schema_ready: Optional[str] = None  # ruta de la DB ya preparada (db.init puede cambiarla)
+
+def connect_db() -> None:
+    """Solo abre la conexión (rápido): suficiente para pintar la ventana principal."""
+    db.connect(reuse_if_open=True)
+
+def ensure_schema() -> None:
+    """
+    Migraciones, tablas, índices FTS y bitácora de sync. Idempotente y
+    barato tras la primera llamada: quien vaya a usar datos puede invocarlo.
+    Las migraciones online (índices de tablas grandes) quedan pendientes:
+    la app las avanza en segundo plano (core.migrations.migration_step).
+    """
+    global _schema_ready
+    if _schema_ready == db.database:
+        return
+    from core.search_index import ensure_search_index
+    from core.migrations import Migrator
+    from core.changelog import ensure_change_log
+    connect_db()
+    existing = set(db.get_tables())
+    missing = [m for m in ALL_MODELS if m._meta.table_name not in existing]
+    migrator = Migrator(db)
+    if len(missing) == len(ALL_MODELS):
+        # base nueva: create_tables la deja al día (con índices)
+        db.create_tables(ALL_MODELS, safe=True)
+        migrator.stamp()
+    else:
+        # primero las columnas nuevas en tablas existentes, luego lo que falte;
+        # los índices de tablas existentes los construye una migración (online)
+        migrator.run(online=False)
+        db.create_tables(missing, safe=True)
+    ensure_search_index(db)
+    ensure_change_log(db, [m._meta.table_name for m in ALL_MODELS])
+    _schema_ready = db.database
 
 def init_db(create_tables: bool = True) -> None:
     """
-    Conecta y crea tablas si no existen. Llama a esto al inicio de la app.
+    Conecta y crea tablas si no existen. Para scripts: aplica también las
+    migraciones online. La app usa connect_db() al partir y ensure_schema()
+    después del primer pintado.
     """
-    db.connect(reuse_if_open=True)
+    connect_db()
     if create_tables:
-        db.create_tables(ALL_MODELS, safe=True)
+        ensure_schema()
+        from core.migrations import apply_migrations
+        apply_migrations(db, online=True)
 
 def close_db() -> None:
     if not db.is_closed():
         db.close()
 
-# -------------------------------------------------------------------
-# Inicialización automática al importar (opcional)
-# -------------------------------------------------------------------
-try:
-    # Si prefieres control manual, comenta la línea siguiente y llama init_db() desde tu main.
-    init_db(create_tables=True)
-except Exception as _e:
-    print(f"[db] Aviso: no se pudo inicializar DB en {DB_PATH}: {_e}")
-
 # -------------------------------------------------------------------
 # Alias de compatibilidad (código legado)
 # -------------------------------------------------------------------
@@ -0,0 +1,189 @@
+# core/db_executor.py
+from __future__ import annotations
+import threading
+from typing import Any, Callable, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from core.db import db as default_db
+from core.events import deferred
+
+# -------------------------------------------------------------------
+# Ejecutor de DB fuera del hilo de la GUI:
+#   - un hilo ESCRITOR (pool de 1 hilo permanente): las escrituras van en
+#     serie, cada una en su transacción, sin pelear el lock de SQLite;
+#   - un pool de LECTORES: en WAL leen en paralelo con el escritor.
+# peewee abre una conexión por hilo, así que cada hilo trabaja con la suya
+# (se mantiene abierta mientras viva el hilo).
+# Cada tarea devuelve un DbFuture cuyas señales llegan en el hilo de la GUI.
+# -------------------------------------------------------------------
+
+
+class DbFuture(QObject):
+    """
+    Resultado pendiente de una tarea de DB.
+    - then(on_ok, on_error): callbacks en el hilo de la GUI (si ya terminó, en el próximo ciclo);
+    - succeeded(resultado) / failed(excepción) / finished(): señales equivalentes;
+    - result(timeout): espera bloqueante, solo para scripts (nunca en la GUI).
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    finished = pyqtSignal()
+    _resolved = pyqtSignal(object, object)  # (resultado, excepción), desde el worker
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+        self._delivered = False
+        self._resolved.connect(self._deliver)
+
+    # ---------- API ----------
+    def then(self, on_ok: Optional[Callable[[Any], None]] = None,
+             on_error: Optional[Callable[[BaseException], None]] = None) -> "DbFuture":
+        if self._delivered:
+            QTimer.singleShot(0, lambda: self._call(on_ok, on_error))
+            return self
+        if on_ok:
+            self.succeeded.connect(on_ok)
+        if on_error:
+            self.failed.connect(on_error)
+        return self
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self._done.wait(timeout):
+            raise TimeoutError("La tarea de DB no terminó a tiempo.")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    # ---------- internos ----------
+    def _set(self, value: Any, error: Optional[BaseException]):
+        """Desde el hilo worker."""
+        self._value, self._error = value, error
+        self._done.set()
+        self._resolved.emit(value, error)
+
+    def _deliver(self, value: Any, error: Optional[BaseException]):
+        self._delivered = True
+        if error is not None:
+            self.failed.emit(error)
+        else:
+            self.succeeded.emit(value)
+        self.finished.emit()
+
+    def _call(self, on_ok, on_error):
+        if self._error is not None:
+            if on_error:
+                on_error(self._error)
+        elif on_ok:
+            on_ok(self._value)
+
+
+class _DbTask(QRunnable):
+    def __init__(self, database, fn: Callable, args: tuple, kwargs: dict,
+                 future: DbFuture, atomic: bool):
+        super().__init__()
+        self.database, self.fn, self.args, self.kwargs = database, fn, args, kwargs
+        self.future, self.atomic = future, atomic
+
+    def run(self):
+        try:
+            self.database.connect(reuse_if_open=True)
+            if self.atomic:
+                # eventos de dominio recién después del commit
+                with deferred(), self.database.atomic():
+                    value = self.fn(*self.args, **self.kwargs)
+            else:
+                value = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.future._set(None, e)
+        else:
+            self.future._set(value, None)
+
+
+class DbExecutor(QObject):
+    """
+    write(fn, ...) → DbFuture: corre fn en el hilo escritor dentro de una transacción.
+    serial(fn, ...) → DbFuture: en el hilo escritor, sin transacción envolvente
+                      (servicios que manejan las suyas, p.ej. el sync).
+    read(fn, ...)  → DbFuture: corre fn en el pool de lectores (sin transacción).
+    busyChanged(bool) avisa cuando empieza/termina el trabajo pendiente.
+    """
+    busyChanged = pyqtSignal(bool)
+
+    def __init__(self, database=None, readers: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.database = database or default_db
+        self._writer = QThreadPool(self)
+        self._writer.setMaxThreadCount(1)
+        self._writer.setExpiryTimeout(-1)   # hilo dedicado: no se recicla su conexión
+        self._readers = QThreadPool(self)
+        self._readers.setMaxThreadCount(max(1, readers))
+        self._readers.setExpiryTimeout(-1)
+        self._inflight: set[DbFuture] = set()
+
+    # ---------- API ----------
+    @property
+    def readers(self) -> QThreadPool:
+        """Pool de lectura (p.ej. para SearchController)."""
+        return self._readers
+
+    @property
+    def pending(self) -> int:
+        return len(self._inflight)
+
+    def write(self, fn: Callable, *args, **kwargs) -> DbFuture:
+        return self._submit(self._writer, fn, args, kwargs, atomic=True)
+
+    def serial(self, fn: Callable, *args, **kwargs) -> DbFuture:
+        return self._submit(self._writer, fn, args, kwargs, atomic=False)
+
+    def read(self, fn: Callable, *args, **kwargs) -> DbFuture:
+        return self._submit(self._readers, fn, args, kwargs, atomic=False)
+
+    def shutdown(self, timeout_ms: int = 5000) -> bool:
+        """Espera lo pendiente y cierra la conexión del escritor (checkpoint del WAL)."""
+        ok = self._writer.waitForDone(timeout_ms) and self._readers.waitForDone(timeout_ms)
+        if ok:
+            self._writer.start(_DbTask(self.database, self.database.close, (), {},
+                                       DbFuture(), atomic=False))
+            ok = self._writer.waitForDone(timeout_ms)
+        return ok
+
+    # ---------- internos ----------
+    def _submit(self, pool: QThreadPool, fn: Callable, args: tuple, kwargs: dict,
+                atomic: bool) -> DbFuture:
+        future = DbFuture()
+        self._inflight.add(future)
+        future.finished.connect(lambda f=future: self._forget(f))
+        if len(self._inflight) == 1:
+            self.busyChanged.emit(True)
+        pool.start(_DbTask(self.database, fn, args, kwargs, future, atomic))
+        return future
+
+    def _forget(self, future: DbFuture):
+        self._inflight.discard(future)
+        if not self._inflight:
+            self.busyChanged.emit(False)
+
+
+_executor: Optional[DbExecutor] = None
+
+
+def executor() -> DbExecutor:
+    """Ejecutor compartido de la app (se crea al primer uso, en el hilo de la GUI)."""
+    global _executor
+    if _executor is None:
+        _executor = DbExecutor()
+    return _executor
+
+
+def shutdown_executor(timeout_ms: int = 5000) -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(timeout_ms)
+        _executor = None
@@ -0,0 +1,83 @@
+# core/events.py
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Iterable
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# -------------------------------------------------------------------
+# Bus de eventos de dominio: "qué cambió" (tabla, tipo, ids) para que
+# las vistas parchen solo las filas afectadas en vez de recargar todo.
+#   - BaseModel.save()/delete_instance() emiten solos;
+#   - escrituras masivas (insert_many, update/delete por query, sync)
+#     emiten explícitamente, o RESET si no hay ids.
+# Se emite al escribir (no al confirmar la transacción): quien escucha
+# debe tolerar un id que ya no exista. Dentro de deferred() (lo usa el
+# escritor de core/db_executor.py) se retienen hasta después del commit.
+# listen(): callbacks síncronos en el hilo que escribe (cachés de los
+# repositorios); se llaman al escribir y otra vez tras el commit.
+# Las señales Qt llegan en el hilo de la GUI aunque se emitan desde un worker.
+# -------------------------------------------------------------------
+INSERTED = "inserted"
+UPDATED = "updated"
+DELETED = "deleted"
+RESET = "reset"      # cambió "mucho" o no se sabe qué: recargar
+
+
+class DomainEvents(QObject):
+    changed = pyqtSignal(str, str, object)  # tabla, tipo, tuple de ids
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._versions: dict[str, int] = defaultdict(int)
+
+    def emit_change(self, entity: str, kind: str, ids: Iterable[int] = ()):
+        self._versions[entity] += 1
+        self.changed.emit(entity, kind, tuple(ids))
+
+    def version(self, *entities: str) -> int:
+        """Contador de cambios (sirve para saber si algo cambió desde la última vez)."""
+        return sum(self._versions[e] for e in entities)
+
+
+_bus = DomainEvents()  # se crea al importar (hilo principal)
+_local = threading.local()
+_listeners: list[Callable[[str, str, tuple], None]] = []
+
+
+def bus() -> DomainEvents:
+    return _bus
+
+
+def listen(fn: Callable[[str, str, tuple], None]) -> None:
+    """Registra un callback síncrono (tabla, tipo, ids); debe ser rápido y thread-safe."""
+    _listeners.append(fn)
+
+
+def emit(entity: str, kind: str, ids: Iterable[int] = ()) -> None:
+    ids = tuple(ids)
+    for fn in _listeners:
+        fn(entity, kind, ids)
+    pending = getattr(_local, "pending", None)
+    if pending is not None:
+        pending.append((entity, kind, ids))
+        return
+    _bus.emit_change(entity, kind, ids)
+
+
+@contextmanager
+def deferred():
+    """
+    Retiene los eventos de este hilo hasta salir del bloque: envuelto
+    alrededor de una transacción, las vistas los reciben ya confirmados.
+    Si el bloque falla (rollback) se descartan.
+    """
+    prev = getattr(_local, "pending", None)
+    pending: list = []
+    _local.pending = pending
+    try:
+        yield
+    finally:
+        _local.pending = prev
+    for args in pending:
+        emit(*args)
@@ -0,0 +1,432 @@
+# core/migrations.py
+from __future__ import annotations
+import argparse
+import json
+from abc import ABC, abstractmethod
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+from peewee import Database, Field, IntegerField, CharField
+from playhouse.migrate import SqliteMigrator, migrate
+from utils.validators import split_rut
+from core.db import ALL_MODELS, MODELS
+
+# -------------------------------------------------------------------
+# Migraciones versionadas para bases ya instaladas (create_tables no
+# agrega columnas ni toca tablas existentes).
+#   - schema_version: una fila por migración aplicada (versión, nombre, fecha, ms);
+#   - schema_progress: avance de la migración en curso (por paso: cursor/terminado);
+#   - rut_fusion: filas con RUT repetido que una migración fusionó (para mostrarlas).
+# Cada migración es una lista ordenada de pasos idempotentes. Cada paso
+# avanza de a una UNIDAD (una columna, un índice, un lote de filas) y la
+# unidad se guarda junto con su avance en la misma transacción: si la app
+# se cierra a mitad, la próxima vez sigue desde el último lote.
+# Migraciones "online" (índices, rellenos grandes): no bloquean el arranque;
+# la app las avanza por unidades en el hilo escritor (ver main.py), así las
+# escrituras del usuario se intercalan entre lotes. En SQLite un CREATE INDEX
+# no se puede partir: corre entero en el escritor, con los lectores (WAL) libres.
+# Para agregar una: nueva entrada al final de MIGRATIONS con la versión siguiente.
+#   python -m core.migrations --dry-run      # qué se aplicaría, sin tocar nada
+# -------------------------------------------------------------------
+
+BACKFILL_CHUNK = 5000
+RUT_TABLES = ("anfitrion", "hospedado")
+
+DDL = (
+    """CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL,
+        ms REAL)""",
+    """CREATE TABLE IF NOT EXISTS schema_progress (
+        version INTEGER NOT NULL,
+        step INTEGER NOT NULL,
+        cursor INTEGER NOT NULL DEFAULT 0,
+        done INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (version, step))""",
+    """CREATE TABLE IF NOT EXISTS rut_fusion (
+        id INTEGER PRIMARY KEY,
+        tabla TEXT NOT NULL,
+        rut TEXT NOT NULL,
+        conservado_id INTEGER NOT NULL,
+        eliminado TEXT NOT NULL,
+        fecha TEXT NOT NULL,
+        visto INTEGER NOT NULL DEFAULT 0)""",
+)
+
+
+def _tables(database: Database) -> set[str]:
+    return set(database.get_tables())
+
+
+def _columns(database: Database, table: str) -> set[str]:
+    return {c.name for c in database.get_columns(table)}
+
+
+def _indexes(database: Database, table: str) -> set[str]:
+    return {i.name for i in database.get_indexes(table)}
+
+
+# -------------------------------------------------------------------
+# Pasos. run(database, cursor) hace UNA unidad y devuelve el cursor
+# siguiente, o None si el paso terminó. describe() es para --dry-run.
+# -------------------------------------------------------------------
+class Step(ABC):
+    online = False
+
+    @abstractmethod
+    def describe(self, database: Database, cursor: int) -> str:
+        ...
+
+    @abstractmethod
+    def run(self, database: Database, cursor: int) -> Optional[int]:
+        ...
+
+
+class AddColumn(Step):
+    def __init__(self, table: str, name: str, field: Field):
+        self.table, self.name, self.field = table, name, field
+
+    def _needed(self, database: Database) -> bool:
+        return self.table in _tables(database) and self.name not in _columns(database, self.table)
+
+    def describe(self, database, cursor):
+        state = "" if self._needed(database) else " (ya existe)"
+        return f"columna {self.table}.{self.name}{state}"
+
+    def run(self, database, cursor):
+        if self._needed(database):
+            migrate(SqliteMigrator(database).add_column(self.table, self.name, self.field))
+        return None
+
+
+class CreateIndex(Step):
+    """Índice explícito (nombre como los de peewee: <tabla>_<columnas>)."""
+    def __init__(self, table: str, columns: Sequence[str], unique: bool = False, online: bool = True):
+        self.table, self.columns, self.unique, self.online = table, tuple(columns), unique, online
+        self.name = f"{table}_{'_'.join(self.columns)}"
+
+    def _needed(self, database: Database) -> bool:
+        return self.table in _tables(database) and self.name not in _indexes(database, self.table)
+
+    def describe(self, database, cursor):
+        kind = "índice único" if self.unique else "índice"
+        return f"{kind} {self.name}" + ("" if self._needed(database) else " (ya existe)")
+
+    def run(self, database, cursor):
+        if self._needed(database):
+            cols = ", ".join(f'"{c}"' for c in self.columns)
+            database.execute_sql(f'CREATE {"UNIQUE " if self.unique else ""}INDEX IF NOT EXISTS '
+                                 f'"{self.name}" ON "{self.table}" ({cols})')
+        return None
+
+
+class ModelIndexes(Step):
+    """Los índices declarados en un modelo (index=True, Meta.indexes); uno por unidad."""
+    online = True
+
+    def __init__(self, model):
+        self.model = model
+
+    def _pending(self, database: Database) -> list:
+        table = self.model._meta.table_name
+        if table not in _tables(database):
+            return []  # create_tables la creará con sus índices
+        existing = _indexes(database, table)
+        return [idx for idx in self.model._meta.fields_to_index()
+                if self._name(database, idx) not in existing]
+
+    def _name(self, database: Database, idx) -> str:
+        sql, _ = database.get_sql_context().sql(self.model._schema._create_index(idx)).query()
+        return sql.split('"')[1]
+
+    def describe(self, database, cursor):
+        names = [self._name(database, idx) for idx in self._pending(database)]
+        if not names:
+            return f"índices de {self.model._meta.table_name} (ya existen)"
+        return f"índices: {', '.join(names)}"
+
+    def run(self, database, cursor):
+        pending = self._pending(database)
+        if not pending:
+            return None
+        database.execute(self.model._schema._create_index(pending[0], safe=True))
+        return None if len(pending) == 1 else cursor + 1
+
+
+class Backfill(Step):
+    """
+    Rellena filas por lotes en orden de id (keyset, sin OFFSET).
+    select: SQL con dos parámetros (último id, tamaño del lote) que devuelve
+    filas cuyo primer valor es el id; apply(database, rows) escribe el lote.
+    """
+    def __init__(self, table: str, select: str, apply: Callable[[Database, list], None],
+                 label: str, online: bool = False, chunk: int = BACKFILL_CHUNK):
+        self.table, self.select, self.apply, self.label = table, select, apply, label
+        self.online, self.chunk = online, chunk
+
+    def describe(self, database, cursor):
+        if self.table not in _tables(database):
+            return f"{self.label} (sin tabla)"
+        total = database.execute_sql(f'SELECT COUNT(*) FROM "{self.table}" WHERE id > ?',
+                                     (cursor,)).fetchone()[0]
+        start = f", desde id {cursor}" if cursor else ""
+        return f"{self.label}: revisar {total} filas en lotes de {self.chunk}{start}"
+
+    def run(self, database, cursor):
+        if self.table not in _tables(database):
+            return None
+        rows = database.execute_sql(self.select, (cursor, self.chunk)).fetchall()
+        if rows:
+            self.apply(database, rows)
+        return rows[-1][0] if len(rows) == self.chunk else None
+
+
+class Migration:
+    def __init__(self, version: int, name: str, steps: Sequence[Step]):
+        self.version, self.name, self.steps = version, name, tuple(steps)
+
+    @property
+    def online(self) -> bool:
+        return any(s.online for s in self.steps)
+
+    def __repr__(self) -> str:
+        return f"{self.version:03d} {self.name}"
+
+
+# -------------------------------------------------------------------
+# Migraciones
+# -------------------------------------------------------------------
+def _merge_rut_duplicate(database: Database, table: str, loser: int, winner: int, rut: str) -> None:
+    """
+    Fusiona `loser` en `winner` (mismo RUT escrito distinto): las filas hijas
+    pasan al ganador, sus columnas vacías se completan con las del perdedor,
+    la fila perdida queda completa en rut_fusion y el perdedor se borra.
+    """
+    row = database.execute_sql(f'SELECT * FROM "{table}" WHERE id = ?', (loser,))
+    lost = dict(zip([d[0] for d in row.description], row.fetchone()))
+    existing = _tables(database)
+    for fk, child in MODELS[table]._meta.backrefs.items():
+        if child._meta.table_name in existing:
+            database.execute_sql(f'UPDATE "{child._meta.table_name}" SET "{fk.column_name}" = ? '
+                                 f'WHERE "{fk.column_name}" = ?', (winner, loser))
+    keep = [c for c in lost if c not in ("id", "rut", "rut_num", "rut_dv")]
+    if keep:
+        sets = ", ".join(f'"{c}" = COALESCE("{c}", ?)' for c in keep)
+        database.execute_sql(f'UPDATE "{table}" SET {sets} WHERE id = ?',
+                             [lost[c] for c in keep] + [winner])
+    database.execute_sql(
+        "INSERT INTO rut_fusion (tabla, rut, conservado_id, eliminado, fecha) VALUES (?, ?, ?, ?, ?)",
+        (table, rut, winner, json.dumps(lost, default=str, ensure_ascii=False),
+         datetime.now().isoformat(timespec="seconds")))
+    database.execute_sql(f'DELETE FROM "{table}" WHERE id = ?', (loser,))
+
+
+def _rut_backfill(table: str) -> Backfill:
+    """
+    rut_num/rut_dv desde `rut`. El índice único ya existe (columnas NULL):
+    UPDATE OR IGNORE deja sin indexar las filas con un RUT repetido escrito
+    distinto ("12.345.678-9" y "123456789"). Esas filas no se podrían abrir
+    (by_rut devuelve la otra) ni guardar (choca con el índice): la más
+    antigua gana y las otras se fusionan en ella (ver _merge_rut_duplicate).
+    El menú principal avisa las fusiones pendientes de revisar (take_rut_merges).
+    """
+    def apply(database: Database, rows: list) -> None:
+        updates = [(p[0], p[1], id_) for id_, rut in rows if (p := split_rut(rut))]
+        if not updates:
+            return
+        database.cursor().executemany(
+            f'UPDATE OR IGNORE "{table}" SET rut_num = ?, rut_dv = ? WHERE id = ?', updates)
+        ids = [u[2] for u in updates]
+        for id_, rut in database.execute_sql(
+                f'SELECT id, rut FROM "{table}" WHERE id BETWEEN ? AND ? AND rut_num IS NULL',
+                (ids[0], ids[-1])).fetchall():
+            if not (parts := split_rut(rut)):
+                continue
+            winner = database.execute_sql(f'SELECT id FROM "{table}" WHERE rut_num = ?',
+                                          (parts[0],)).fetchone()
+            if winner is not None:
+                _merge_rut_duplicate(database, table, id_, winner[0], rut)
+
+    return Backfill(table, f'SELECT id, rut FROM "{table}" WHERE id > ? AND rut_num IS NULL '
+                           f'ORDER BY id LIMIT ?', apply, f"rut_num de {table}")
+
+
+def take_rut_merges(database: Database) -> list[tuple[str, str, int, dict]]:
+    """
+    Fusiones por RUT repetido aún no mostradas: [(tabla, rut, id conservado,
+    fila eliminada)]. Las marca como vistas (el aviso sale una sola vez).
+    """
+    Migrator(database).ensure_tables()
+    rows = database.execute_sql(
+        "SELECT id, tabla, rut, conservado_id, eliminado FROM rut_fusion WHERE visto = 0 ORDER BY id"
+    ).fetchall()
+    if rows:
+        database.execute_sql("UPDATE rut_fusion SET visto = 1 WHERE id <= ? AND visto = 0", (rows[-1][0],))
+    return [(tabla, rut, keep, json.loads(lost)) for _id, tabla, rut, keep, lost in rows]
+
+
+def _rut_steps() -> list[Step]:
+    steps: list[Step] = []
+    for table in RUT_TABLES:
+        steps += [
+            AddColumn(table, "rut_num", IntegerField(null=True)),
+            AddColumn(table, "rut_dv", CharField(max_length=1, null=True)),
+            CreateIndex(table, ("rut_num",), unique=True, online=False),  # columna vacía: instantáneo
+            _rut_backfill(table),  # bloqueante: by_rut() depende de rut_num
+        ]
+    return steps
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "rut_normalizado", _rut_steps()),
+    # índices de keyset (nombres/dirección) y de ocupación de Asignacion (casa/pieza + fechas)
+    Migration(2, "indices_modelos", [ModelIndexes(m) for m in ALL_MODELS]),
+]
+
+
+# -------------------------------------------------------------------
+# Motor
+# -------------------------------------------------------------------
+class Migrator:
+    def __init__(self, database: Database, migrations: Optional[Sequence[Migration]] = None):
+        self.database = database
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+
+    def ensure_tables(self) -> None:
+        for stmt in DDL:
+            self.database.execute_sql(stmt)
+
+    def applied(self) -> dict[int, tuple[str, str, float]]:
+        self.ensure_tables()
+        return {v: (n, at, ms) for v, n, at, ms in self.database.execute_sql(
+            "SELECT version, name, applied_at, ms FROM schema_version").fetchall()}
+
+    def pending(self) -> list[Migration]:
+        done = self.applied()
+        return [m for m in self.migrations if m.version not in done]
+
+    def _progress(self, version: int) -> dict[int, tuple[int, bool]]:
+        return {step: (cursor, bool(done)) for step, cursor, done in self.database.execute_sql(
+            "SELECT step, cursor, done FROM schema_progress WHERE version = ?", (version,)).fetchall()}
+
+    def plan(self) -> list[str]:
+        """--dry-run: migraciones pendientes y lo que haría cada paso (solo lecturas)."""
+        lines = []
+        for m in self.pending():
+            progress = self._progress(m.version)
+            lines.append(f"{m!r}{' (online)' if m.online else ''}")
+            for i, step in enumerate(m.steps):
+                cursor, done = progress.get(i, (0, False))
+                lines.append(f"    - {'hecho' if done else step.describe(self.database, cursor)}")
+        return lines
+
+    def stamp(self) -> None:
+        """Marca todo como aplicado (base nueva: create_tables ya dejó el esquema al día)."""
+        self.ensure_tables()
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.database.atomic():
+            for m in self.migrations:
+                self.database.execute_sql(
+                    "INSERT OR IGNORE INTO schema_version (version, name, applied_at, ms) "
+                    "VALUES (?, ?, ?, 0)", (m.version, m.name, now))
+
+    def step(self) -> bool:
+        """
+        Avanza UNA unidad de la primera migración pendiente (en su propia
+        transacción, junto con su avance). Devuelve True si queda trabajo.
+        """
+        pending = self.pending()
+        if not pending:
+            return False
+        if not self._unit(pending[0]):
+            self._complete(pending[0])
+            return len(pending) > 1
+        return True
+
+    def run(self, online: bool = True) -> int:
+        """
+        Aplica las pendientes en orden. online=False se detiene antes de la
+        primera migración online (el arranque no espera índices ni rellenos
+        grandes). Devuelve cuántas migraciones aplicó.
+        """
+        count = 0
+        while True:
+            pending = self.pending()
+            if not pending or (pending[0].online and not online):
+                return count
+            while self._unit(pending[0]):
+                pass
+            self._complete(pending[0])
+            count += 1
+
+    def _unit(self, m: Migration) -> bool:
+        progress = self._progress(m.version)
+        for i, step in enumerate(m.steps):
+            cursor, done = progress.get(i, (0, False))
+            if done:
+                continue
+            with self.database.atomic():
+                t0 = time.perf_counter()
+                nxt = step.run(self.database, cursor)
+                ms = (time.perf_counter() - t0) * 1000
+                # step = -1: tiempo acumulado de la migración (en ms, en `cursor`)
+                self.database.cursor().executemany(
+                    "INSERT INTO schema_progress (version, step, cursor, done) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (version, step) DO UPDATE SET "
+                    "cursor = CASE WHEN excluded.step = -1 THEN cursor + excluded.cursor "
+                    "ELSE excluded.cursor END, done = excluded.done",
+                    [(m.version, i, cursor if nxt is None else nxt, int(nxt is None)),
+                     (m.version, -1, round(ms), 1)])
+            return True
+        return False
+
+    def _complete(self, m: Migration) -> None:
+        row = self.database.execute_sql(
+            "SELECT cursor FROM schema_progress WHERE version = ? AND step = -1", (m.version,)).fetchone()
+        ms = float(row[0]) if row else 0.0
+        with self.database.atomic():
+            self.database.execute_sql(
+                "INSERT INTO schema_version (version, name, applied_at, ms) VALUES (?, ?, ?, ?)",
+                (m.version, m.name, datetime.now().isoformat(timespec="seconds"), ms))
+            self.database.execute_sql("DELETE FROM schema_progress WHERE version = ?", (m.version,))
+        print(f"[db] Migración {m!r} aplicada ({ms:.0f} ms).")
+
+
+def apply_migrations(database: Database, online: bool = False) -> int:
+    """Arranque: lo bloqueante ahora; lo online queda para migration_step()."""
+    return Migrator(database).run(online=online)
+
+
+def migration_step(database: Database) -> bool:
+    """Una unidad de trabajo pendiente (para correr de a poco en el hilo escritor)."""
+    return Migrator(database).step()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Migraciones del esquema de Minshuku+.")
+    ap.add_argument("--db", help="ruta de la base (por defecto data/minshuku.sqlite)")
+    ap.add_argument("--dry-run", action="store_true", help="muestra lo pendiente sin aplicarlo")
+    ap.add_argument("--status", action="store_true", help="lista las migraciones aplicadas")
+    args = ap.parse_args(argv)
+
+    from core import db as core_db
+    if args.db:
+        core_db.db.init(args.db, pragmas=dict(core_db.db._pragmas))
+    core_db.connect_db()
+    migrator = Migrator(core_db.db)
+    if args.status:
+        for version, (name, at, ms) in sorted(migrator.applied().items()):
+            print(f"{version:03d} {name:<24} {at}  {ms:8.0f} ms")
+    if args.dry_run:
+        lines = migrator.plan()
+        print("\n".join(lines) if lines else "Sin migraciones pendientes.")
+    elif not args.status:
+        core_db.init_db(create_tables=True)  # también lo online, sin GUI que cuidar
+    core_db.close_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,17 @@
 # core/router.py
+from collections import OrderedDict
 from typing import Callable, Optional
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSettings, QTimer
 
 # ⚠️ Asegúrate que tu archivo se llame ui/views/menu_casa_view.py
 # y tu clase Menu_Casa_View esté ahí.
 # Si tu archivo sigue siendo "menu_casaviews.py", ajusta el import dentro del builder.
 
-def _wrap_in_dialog(widget: QWidget, parent: Optional[QWidget] = None) -> QDialog:
+def _wrap_in_dialog(widget: QWidget, parent: Optional[QWidget] = None,
+                    delete_on_close: bool = True) -> QDialog:
     dlg = QDialog(parent)
-    dlg.setAttribute(Qt.WA_DeleteOnClose, True)
+    dlg.setAttribute(Qt.WA_DeleteOnClose, delete_on_close)
     dlg.setWindowTitle(widget.windowTitle() or "Módulo")
     lay = QVBoxLayout(dlg)
     lay.setContentsMargins(0, 0, 0, 0)
@@ -29,15 +31,10 @@ def _build_casas() -> QWidget:
     return w
 
 def _build_hospedados() -> QWidget:
-    """
-    Construye el módulo Hospedados. Si ya migraste a MVC, cablea su controller aquí.
-    Si aún usas una vista “todo en uno”, simplemente retorna la vista.
-    """
     from ui.views.hospedados_views import HospedadoView
-    # Si tienes un controller específico, descomenta y úsalo:
-    # from controllers.hospedados_controller import HospedadosController
+    from controllers.hospedado_controller import HospedadoController
     w = HospedadoView()
-    # w._controller = HospedadosController(w)  # si existe
+    w._controller = HospedadoController(w)  # mantener referencia
     return w
 
 # def _build_asignaciones() -> QWidget:
@@ -52,10 +49,22 @@ class AppRouter:
     Abre módulos como diálogos modales (exec_) para:
     - ocultar temporalmente el menú principal;
     - ejecutar un callback al cierre para restaurar la UI.
+    Los módulos construidos quedan en un caché LRU (MAX_CACHED): al reabrir
+    se muestra el mismo diálogo y solo se refrescan sus datos
+    (controller.refresh_if_dirty(), o refresh() si no existe), sin
+    re-importar ni reconstruir widgets.
+    prewarm() construye en un momento ocioso el módulo que probablemente
+    se abra a continuación (el último usado).
     """
+    MAX_CACHED = 2
+    DEFAULT_MODULE = "hospedados"
+
     def __init__(self, parent: Optional[QWidget] = None):
         self._open_dialog: Optional[QDialog] = None
         self._parent = parent
+        self._cache: "OrderedDict[str, QDialog]" = OrderedDict()
+        self._on_close: Optional[Callable[[], None]] = None
+        self._settings = QSettings("minshukuplus", "router")
 
         # Fábricas que retornan QWidget YA CABLEADO con su controller
         self._factories: dict[str, Callable[[], QWidget]] = {
@@ -68,15 +77,15 @@ class AppRouter:
         if key not in self._factories:
             raise KeyError(f"Módulo desconocido: {key}")
 
-        widget = self._factories[key]()  # vista (QWidget) ya cableada a su controller
-        dialog = _wrap_in_dialog(widget, self._parent)
-
-        def _finish(_code: int):
-            self._open_dialog = None
-            if callable(on_close):
-                on_close()
+        dialog = self._cache.get(key)
+        if dialog is None:
+            dialog = self._build(key)
+        else:
+            self._cache.move_to_end(key)
+            self._refresh(dialog)
+        self._settings.setValue("last_module", key)
 
-        dialog.finished.connect(_finish)
+        self._on_close = on_close
         self._open_dialog = dialog
 
         if modal:
@@ -84,3 +93,53 @@ class AppRouter:
             dialog.exec_()
         else:
             dialog.show()
+
+    def prewarm(self, key: Optional[str] = None, delay_ms: int = 0):
+        """Construye (sin mostrar) un módulo cuando el event loop quede libre."""
+        key = key or self._settings.value("last_module", self.DEFAULT_MODULE, type=str)
+        if key not in self._factories or key in self._cache or self.MAX_CACHED <= 0:
+            return
+        QTimer.singleShot(delay_ms, lambda: self._prewarm_now(key))
+
+    def clear_cache(self):
+        while self._cache:
+            _key, dialog = self._cache.popitem(last=False)
+            dialog.deleteLater()
+
+    # ---------- internos ----------
+    def _build(self, key: str) -> QDialog:
+        from core.db import ensure_schema
+        ensure_schema()  # no-op: HomeController abre módulos (y main pre-carga) con el esquema listo
+        widget = self._factories[key]()  # vista (QWidget) ya cableada a su controller
+        cached = self.MAX_CACHED > 0
+        dialog = _wrap_in_dialog(widget, self._parent, delete_on_close=not cached)
+        dialog.finished.connect(self._finish)
+        if cached:
+            self._cache[key] = dialog
+            while len(self._cache) > self.MAX_CACHED:
+                _old, evicted = self._cache.popitem(last=False)
+                evicted.deleteLater()
+        return dialog
+
+    def _prewarm_now(self, key: str):
+        if key in self._cache:
+            return
+        try:
+            self._build(key)
+        except Exception as e:  # el pre-calentado nunca debe romper el menú
+            print(f"[router] Aviso: no se pudo pre-cargar '{key}': {e}")
+
+    def _finish(self, _code: int):
+        self._open_dialog = None
+        on_close, self._on_close = self._on_close, None
+        if callable(on_close):
+            on_close()
+
+    @staticmethod
+    def _refresh(dialog: QDialog):
+        widget = dialog.layout().itemAt(0).widget()
+        controller = getattr(widget, "_controller", None)
+        # los controllers que escuchan el bus de eventos ya están al día
+        refresh = getattr(controller, "refresh_if_dirty", None) or getattr(controller, "refresh", None)
+        if callable(refresh):
+            refresh()
@@ -0,0 +1,78 @@
+# core/search_index.py
+from __future__ import annotations
+import re
+from peewee import Database
+
+# -------------------------------------------------------------------
+# Índice de búsqueda (SQLite FTS5, tablas "external content")
+#   - una tabla <tabla>_fts por entidad, mantenida por triggers
+#   - unicode61 + remove_diacritics 2: "jose" encuentra "José"
+#   - prefix='2 3': acelera las búsquedas por prefijo (término*)
+# -------------------------------------------------------------------
+FTS_TABLES: dict[str, tuple[str, ...]] = {
+    "hospedado": ("nombre_completo", "rut", "correo", "telefono"),
+    "anfitrion": ("nombre_completo", "rut", "correo", "telefono"),
+    "casa":      ("direccion",),
+    "familiar":  ("nombre", "relacion"),
+}
+
+TOKENIZE = "unicode61 remove_diacritics 2"
+
+
+def fts_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _ddl(table: str, cols: tuple[str, ...]) -> list[str]:
+    fts = fts_name(table)
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {col_list}, content='{table}', content_rowid='id',
+            tokenize='{TOKENIZE}', prefix='2 3')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});
+        END""",
+        # solo re-indexa si cambió alguna columna indexada
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});
+            INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});
+        END""",
+    ]
+
+
+def ensure_search_index(database: Database) -> None:
+    """
+    Crea (si faltan) las tablas FTS y sus triggers. Si una tabla FTS es nueva,
+    la llena con 'rebuild' a partir de las filas existentes.
+    """
+    existing = {r[0] for r in database.execute_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+    with database.atomic():
+        for table, cols in FTS_TABLES.items():
+            if table not in existing:
+                continue
+            is_new = fts_name(table) not in existing
+            for stmt in _ddl(table, cols):
+                database.execute_sql(stmt)
+            if is_new:
+                fts = fts_name(table)
+                database.execute_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+_token = re.compile(r"\w+", re.UNICODE)
+_thousands = re.compile(r"(?<=\d)\.(?=\d)")
+
+def to_match_query(text: str) -> str:
+    """
+    Convierte lo escrito por el usuario en una expresión MATCH segura:
+    cada palabra se cita y se busca por prefijo; todas deben aparecer (AND).
+    Los puntos de miles se quitan para que "12.345.678-9" calce con "12345678-9".
+    """
+    text = _thousands.sub("", text or "")
+    return " ".join(f'"{t}"*' for t in _token.findall(text))
@@ -0,0 +1,14 @@
+# core/settings.py
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Carpeta compartida (red / pendrive) donde los equipos dejan y leen sus lotes de cambios
+SYNC_DIR = Path(os.environ.get("MINSHUKU_SYNC_DIR", BASE_DIR / "data" / "sync"))
+
+# Respaldos en caliente (core/backup.py): carpeta, cada cuántas horas (0 = nunca) y retención
+BACKUP_DIR = Path(os.environ.get("MINSHUKU_BACKUP_DIR", BASE_DIR / "data" / "backups"))
+BACKUP_HOURS = float(os.environ.get("MINSHUKU_BACKUP_HOURS", 24))
+BACKUP_KEEP_LAST = int(os.environ.get("MINSHUKU_BACKUP_KEEP", 10))   # los N más recientes
+BACKUP_KEEP_DAILY = int(os.environ.get("MINSHUKU_BACKUP_DAYS", 7))   # + uno por día, N días
@@ -0,0 +1,362 @@
+# core/sql_profiler.py
+from __future__ import annotations
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Optional
+
+# -------------------------------------------------------------------
+# Perfilador de SQL (opcional: main.py --profile-sql o MINSHUKU_PROFILE_SQL=1).
+# Envuelve db.execute_sql (todas las consultas de peewee pasan por ahí,
+# desde cualquier hilo) y registra por consulta: texto, parámetros,
+# duración (ejecución + lectura de filas), filas y quién la pidió
+# (el primer controller en la pila, p.ej. "CasaController._query", y el
+# primer módulo propio, p.ej. un repositorio).
+#   - N+1: la misma sentencia repetida >= n_plus_one veces seguidas
+#     (separadas por menos de window_ms) en el mismo hilo;
+#   - log rotativo de consultas lentas en data/logs/slow_queries.log;
+#   - snapshot()/dump_json() para el panel de diagnóstico o un archivo.
+# Sin instalar no hay costo: db.execute_sql queda intacto.
+# -------------------------------------------------------------------
+LOG_DIR = Path(__file__).resolve().parents[1] / "data" / "logs"
+SLOW_LOG = LOG_DIR / "slow_queries.log"
+
+# no cuentan como "origen": el ORM, este módulo y el helper genérico de paginación
+_SKIP_MODULES = ("peewee", "playhouse", "core.sql_profiler", "domain.repositories.paging")
+_MAX_LOG_SQL = 500
+_MAX_PARAMS = 12
+_MAX_PARAM_LEN = 60
+
+
+class QueryRecord:
+    __slots__ = ("ts", "sql", "params", "ms", "rows", "thread", "caller", "origin", "error")
+
+    def __init__(self, sql: str, params: tuple, caller: str, origin: str):
+        self.ts = time.time()
+        self.sql = sql
+        self.params = params
+        self.ms = 0.0
+        self.rows: Optional[int] = None
+        self.thread = threading.current_thread().name
+        self.caller = caller
+        self.origin = origin
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "ts": datetime.fromtimestamp(self.ts).isoformat(timespec="milliseconds"),
+            "sql": self.sql, "params": list(self.params), "ms": round(self.ms, 3),
+            "rows": self.rows, "thread": self.thread, "caller": self.caller,
+            "origin": self.origin, "error": self.error,
+        }
+
+
+class _Stat:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "callers")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.callers: Counter = Counter()
+
+
+class _CountingCursor:
+    """
+    Cursor de sqlite3 que suma filas y tiempo de lectura al registro de su
+    consulta. En SQLite el grueso de un SELECT se hace al leer, así que la
+    consulta se juzga lenta recién al agotar, cerrar o soltar el cursor.
+    """
+    __slots__ = ("_cursor", "_rec", "_prof", "_done")
+
+    def __init__(self, cursor, rec: QueryRecord, prof: "SqlProfiler"):
+        self._cursor = cursor
+        self._rec = rec
+        self._prof = prof
+        self._done = False
+
+    def _took(self, t0: float, n: int, exhausted: bool = False):
+        self._prof._add_fetch(self._rec, (time.perf_counter() - t0) * 1000, n)
+        if exhausted:
+            self._finish()
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._prof._finish(self._rec)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._took(t0, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self._cursor.arraysize if size is None else size
+        t0 = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._took(t0, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._took(t0, len(rows), True)
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self):
+        # p.ej. .get()/.first(): leen una fila y sueltan el cursor
+        try:
+            self._finish()
+        except Exception:
+            pass  # al cerrar el intérprete
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _fmt_params(params) -> tuple:
+    if not params:
+        return ()
+    out = []
+    for p in list(params)[:_MAX_PARAMS]:
+        s = repr(p)
+        out.append(s if len(s) <= _MAX_PARAM_LEN else s[:_MAX_PARAM_LEN - 1] + "…")
+    if len(params) > _MAX_PARAMS:
+        out.append(f"…(+{len(params) - _MAX_PARAMS})")
+    return tuple(out)
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", None)  # Python 3.11+
+    if not name:
+        self_ = frame.f_locals.get("self")
+        name = f"{type(self_).__name__}.{code.co_name}" if self_ is not None else code.co_name
+    return name.replace(".<locals>", "")
+
+
+def _callers(frame) -> tuple[str, str]:
+    """(controller.método, primer módulo propio:función) de la pila que pidió la consulta."""
+    controller = origin = ""
+    depth = 0
+    while frame is not None and depth < 60:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_SKIP_MODULES):
+            if not origin:
+                origin = f"{module}:{_label(frame)}"
+            if module.startswith("controllers."):
+                controller = _label(frame)
+                break
+        frame = frame.f_back
+        depth += 1
+    return controller, origin
+
+
+class SqlProfiler:
+    def __init__(self, database, slow_ms: float = 50.0, n_plus_one: int = 10,
+                 window_ms: float = 250.0, keep: int = 5000, log_path: Optional[Path] = SLOW_LOG):
+        self.database = database
+        self.slow_ms = slow_ms
+        self.n_plus_one = n_plus_one
+        self.window_ms = window_ms
+        self.started = datetime.now()
+        self._lock = threading.Lock()
+        self._recent: deque[QueryRecord] = deque(maxlen=keep)
+        self._slow: deque[QueryRecord] = deque(maxlen=500)
+        self._stats: dict[str, _Stat] = {}
+        self._runs: dict[tuple[int, str], list] = {}   # (hilo, sql) -> [veces, último t, hallazgo]
+        self._findings: list[dict] = []
+        self._queries = 0
+        self._total_ms = 0.0
+        self._orig = None
+        self._log = self._slow_logger(log_path) if log_path else None
+
+    # ---------- instalación ----------
+    def install(self) -> "SqlProfiler":
+        if self._orig is None:
+            self._orig = self.database.execute_sql
+            self.database.execute_sql = self._execute  # atributo de instancia: tapa al método
+        return self
+
+    def uninstall(self) -> None:
+        if self._orig is not None:
+            if self.database.__dict__.get("execute_sql") == self._execute:
+                del self.database.execute_sql
+            self._orig = None
+
+    @staticmethod
+    def _slow_logger(path: Path) -> logging.Logger:
+        log = logging.getLogger("minshuku.sql.slow")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        if not log.handlers:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log.addHandler(handler)
+        return log
+
+    # ---------- hook ----------
+    def _execute(self, sql, params=None, commit=None):
+        controller, origin = _callers(sys._getframe(1))
+        rec = QueryRecord(sql, _fmt_params(params), controller, origin)
+        t0 = time.perf_counter()
+        try:
+            if commit is None:
+                cursor = self._orig(sql, params)
+            else:
+                cursor = self._orig(sql, params, commit)
+        except Exception as e:
+            rec.error = f"{type(e).__name__}: {e}"
+            self._record(rec, (time.perf_counter() - t0) * 1000)
+            raise
+        ms = (time.perf_counter() - t0) * 1000
+        if cursor.description is None:  # INSERT/UPDATE/DELETE/DDL: filas afectadas
+            rec.rows = cursor.rowcount if cursor.rowcount >= 0 else None
+            self._record(rec, ms)
+            return cursor
+        rec.rows = 0
+        self._record(rec, ms, final=False)  # SELECT: se juzga al terminar de leer
+        return _CountingCursor(cursor, rec, self)
+
+    def _record(self, rec: QueryRecord, ms: float, final: bool = True) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            rec.ms = ms
+            self._queries += 1
+            self._total_ms += ms
+            self._recent.append(rec)
+            stat = self._stats.get(rec.sql)
+            if stat is None:
+                stat = self._stats[rec.sql] = _Stat()
+            stat.count += 1
+            stat.total_ms += ms
+            stat.max_ms = max(stat.max_ms, ms)
+            stat.callers[rec.caller or rec.origin] += 1
+            self._track_repeat(rec, now)
+        if final:
+            self._finish(rec)
+
+    def _finish(self, rec: QueryRecord) -> None:
+        """Consulta terminada (ejecución + lectura): si pasó el umbral va al log de lentas."""
+        with self._lock:
+            slow = rec.ms >= self.slow_ms
+            if slow:
+                self._slow.append(rec)
+        if slow and self._log:
+            self._log.info("%.1f ms [%s] %s | %s | %s", rec.ms, rec.thread, rec.caller or rec.origin,
+                           " ".join(rec.sql.split())[:_MAX_LOG_SQL], ", ".join(rec.params))
+
+    def _add_fetch(self, rec: QueryRecord, ms: float, n: int) -> None:
+        with self._lock:
+            rec.ms += ms
+            rec.rows = (rec.rows or 0) + n
+            self._total_ms += ms
+            stat = self._stats.get(rec.sql)
+            if stat is not None:
+                stat.total_ms += ms
+                stat.rows += n
+                stat.max_ms = max(stat.max_ms, rec.ms)
+
+    def _track_repeat(self, rec: QueryRecord, now: float) -> None:
+        key = (threading.get_ident(), rec.sql)
+        run = self._runs.get(key)
+        if run is None or (now - run[1]) * 1000 > self.window_ms:
+            if len(self._runs) > 5000:
+                self._runs.clear()
+            run = self._runs[key] = [0, now, None]
+        run[0] += 1
+        run[1] = now
+        if run[0] < self.n_plus_one:
+            return
+        if run[2] is None:
+            run[2] = {"sql": rec.sql, "caller": rec.caller, "origin": rec.origin,
+                      "thread": rec.thread, "count": run[0],
+                      "first": datetime.fromtimestamp(rec.ts).isoformat(timespec="seconds")}
+            self._findings.append(run[2])
+            del self._findings[:-200]
+        else:
+            run[2]["count"] = run[0]
+
+    # ---------- lectura ----------
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._slow.clear()
+            self._stats.clear()
+            self._runs.clear()
+            self._findings.clear()
+            self._queries = 0
+            self._total_ms = 0.0
+            self.started = datetime.now()
+
+    def snapshot(self, top: int = 50, recent: int = 200) -> dict[str, Any]:
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)[:top]
+            return {
+                "since": self.started.isoformat(timespec="seconds"),
+                "queries": self._queries,
+                "total_ms": round(self._total_ms, 3),
+                "slow_ms": self.slow_ms,
+                "statements": [{
+                    "sql": sql, "count": s.count, "total_ms": round(s.total_ms, 3),
+                    "avg_ms": round(s.total_ms / s.count, 3), "max_ms": round(s.max_ms, 3),
+                    "rows": s.rows, "callers": [c for c, _ in s.callers.most_common(3) if c],
+                } for sql, s in stats],
+                "n_plus_one": [dict(f) for f in self._findings],
+                "slow": [r.as_dict() for r in list(self._slow)[-recent:]],
+                "recent": [r.as_dict() for r in list(self._recent)[-recent:]],
+            }
+
+    def dump_json(self, path: Optional[Path] = None) -> Path:
+        path = Path(path) if path else LOG_DIR / f"sql_profile-{datetime.now():%Y%m%d-%H%M%S}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.snapshot(top=500, recent=self._recent.maxlen), fh, ensure_ascii=False, indent=1)
+        return path
+
+
+_profiler: Optional[SqlProfiler] = None
+
+
+def install(database=None, **kwargs) -> SqlProfiler:
+    """Activa el perfilador sobre `database` (por defecto core.db.db). Idempotente."""
+    global _profiler
+    if _profiler is None:
+        if database is None:
+            from core.db import db as database
+        _profiler = SqlProfiler(database, **kwargs).install()
+    return _profiler
+
+
+def uninstall() -> None:
+    global _profiler
+    if _profiler is not None:
+        _profiler.uninstall()
+        _profiler = None
+
+
+def profiler() -> Optional[SqlProfiler]:
+    """El perfilador activo, o None si no se pidió."""
+    return _profiler
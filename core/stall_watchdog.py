@@ -0,0 +1,241 @@
+# core/stall_watchdog.py
+from __future__ import annotations
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+# -------------------------------------------------------------------
+# Detector de bloqueos del hilo de la GUI ("No responde").
+#   - un QTimer en el hilo de la GUI marca un latido cada BEAT_MS;
+#   - un hilo vigilante revisa el latido: si pasan más de threshold_ms sin
+#     latir, toma la pila Python del hilo principal (y otra muestra cada
+#     threshold_ms mientras siga bloqueado);
+#   - al volver el latido se cierra el bloqueo con su duración real y se
+#     anota en data/logs/stalls.log con la acción (primer controller de la
+#     pila, p.ej. "CasaDetalleController._on_save") y la ventana activa.
+# report()/snapshot() agregan los peores bloqueos de la sesión.
+# Costo: un timer de 100 ms y un hilo que despierta cada 50 ms.
+# -------------------------------------------------------------------
+LOG_DIR = Path(__file__).resolve().parents[1] / "data" / "logs"
+STALL_LOG = LOG_DIR / "stalls.log"
+BASE_DIR = str(Path(__file__).resolve().parents[1])
+
+BEAT_MS = 100
+POLL_S = 0.05
+MAX_SAMPLES = 5      # pilas por bloqueo
+MAX_STALLS = 500     # bloqueos guardados por sesión
+STACK_DEPTH = 30
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", None) or code.co_name  # co_qualname: Python 3.11+
+    return name.replace(".<locals>", "")
+
+
+def _action(frame) -> str:
+    """Controller.método más interno de la pila; si no hay, la función propia más interna."""
+    own = ""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("controllers."):
+            return _label(frame)
+        if not own and frame.f_code.co_filename.startswith(BASE_DIR) and module != __name__:
+            own = f"{module}:{_label(frame)}"
+        frame = frame.f_back
+    return own or "(Qt / sin código Python)"
+
+
+class Stall:
+    __slots__ = ("started", "ms", "action", "window", "samples", "open")
+
+    def __init__(self, started: float, action: str, window: str, stack: list[str]):
+        self.started = started          # time.time() del último latido antes del bloqueo
+        self.ms = 0.0
+        self.action = action
+        self.window = window
+        self.samples = [stack]
+        self.open = True
+
+    def as_dict(self) -> dict:
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="milliseconds"),
+            "ms": round(self.ms, 1), "action": self.action, "window": self.window,
+            "stack": self.samples[0], "samples": len(self.samples),
+        }
+
+
+class StallWatchdog(QObject):
+    def __init__(self, threshold_ms: float = 500.0, log_path: Optional[Path] = STALL_LOG,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.started = datetime.now()
+        self._lock = threading.Lock()
+        self._beat = time.monotonic()
+        self._beat_wall = time.time()
+        self._window = ""
+        self._current: Optional[Stall] = None
+        self._stalls: list[Stall] = []
+        self._main_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._log = self._logger(log_path) if log_path else None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(BEAT_MS)
+        self._timer.timeout.connect(self._heartbeat)
+
+    # ---------- API ----------
+    def start(self) -> "StallWatchdog":
+        if self._thread is None:
+            self._heartbeat()
+            self._timer.start()
+            self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stalls.clear()
+            self.started = datetime.now()
+
+    def stalls(self) -> list[Stall]:
+        with self._lock:
+            return list(self._stalls)
+
+    def snapshot(self, top: int = 20) -> dict:
+        """Peores bloqueos y agregado por acción (cantidad, total, máximo)."""
+        stalls = self.stalls()
+        by_action: dict[str, list[float]] = {}
+        for s in stalls:
+            by_action.setdefault(s.action, []).append(s.ms)
+        return {
+            "since": self.started.isoformat(timespec="seconds"),
+            "threshold_ms": self.threshold_ms,
+            "count": len(stalls),
+            "total_ms": round(sum(s.ms for s in stalls), 1),
+            "worst": [s.as_dict() for s in sorted(stalls, key=lambda s: s.ms, reverse=True)[:top]],
+            "by_action": sorted(({"action": a, "count": len(ms), "total_ms": round(sum(ms), 1),
+                                  "max_ms": round(max(ms), 1)} for a, ms in by_action.items()),
+                                key=lambda r: r["total_ms"], reverse=True),
+        }
+
+    def report(self, top: int = 10) -> str:
+        snap = self.snapshot(top)
+        lines = [f"[stall] {snap['count']} bloqueos ≥ {self.threshold_ms:.0f} ms desde {snap['since']}"
+                 f" ({snap['total_ms'] / 1000:.1f} s en total)"]
+        for r in snap["by_action"][:top]:
+            lines.append(f"[stall]   {r['max_ms']:8.0f} ms máx  {r['count']:4d}x  "
+                         f"{r['total_ms']:8.0f} ms  {r['action']}")
+        return "\n".join(lines)
+
+    def dump_json(self, path: Optional[Path] = None) -> Path:
+        path = Path(path) if path else LOG_DIR / f"stalls-{datetime.now():%Y%m%d-%H%M%S}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.snapshot(top=MAX_STALLS), fh, ensure_ascii=False, indent=1)
+        return path
+
+    # ---------- hilo de la GUI ----------
+    def _heartbeat(self):
+        now = time.monotonic()
+        window = QApplication.activeModalWidget() or QApplication.activeWindow()
+        with self._lock:
+            stall, self._current = self._current, None
+            if stall is not None:
+                stall.ms = (now - self._beat) * 1000
+                stall.open = False
+            self._beat = now
+            self._beat_wall = time.time()
+            self._window = type(window).__name__ if window is not None else ""
+        if stall is not None and self._log:
+            self._log.warning("%.0f ms bloqueado en %s (ventana: %s)\n%s", stall.ms, stall.action,
+                              stall.window or "-", "".join(stall.samples[0]))
+
+    # ---------- hilo vigilante ----------
+    def _watch(self):
+        last_wake = time.monotonic()
+        while not self._stop.wait(POLL_S):
+            now = time.monotonic()
+            if (now - last_wake) * 1000 > self.threshold_ms:
+                # el propio vigilante no corrió (equipo suspendido): no es un bloqueo de la GUI
+                with self._lock:
+                    self._beat = now
+                last_wake = now
+                continue
+            last_wake = now
+            with self._lock:
+                blocked_ms = (now - self._beat) * 1000
+                if blocked_ms < self.threshold_ms:
+                    continue
+                stall = self._current
+                due = stall is None or blocked_ms >= self.threshold_ms * (len(stall.samples) + 1)
+                if not due or (stall is not None and len(stall.samples) >= MAX_SAMPLES):
+                    continue
+            frame = sys._current_frames().get(self._main_id)
+            if frame is None:
+                continue
+            stack = traceback.format_list(traceback.extract_stack(frame)[-STACK_DEPTH:])
+            action = _action(frame)
+            del frame
+            with self._lock:
+                if self._current is None:
+                    if (time.monotonic() - self._beat) * 1000 < self.threshold_ms:
+                        continue  # volvió a latir mientras tomábamos la pila
+                    self._current = Stall(self._beat_wall, action, self._window, stack)
+                    self._stalls.append(self._current)
+                    del self._stalls[:-MAX_STALLS]
+                else:
+                    self._current.samples.append(stack)
+
+    @staticmethod
+    def _logger(path: Path) -> logging.Logger:
+        log = logging.getLogger("minshuku.stalls")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        if not log.handlers:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log.addHandler(handler)
+        return log
+
+
+_watchdog: Optional[StallWatchdog] = None
+
+
+def install(threshold_ms: float = 500.0, **kwargs) -> StallWatchdog:
+    """Arranca el vigilante (una vez, desde el hilo de la GUI con la QApplication creada)."""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = StallWatchdog(threshold_ms, parent=QApplication.instance(), **kwargs).start()
+    return _watchdog
+
+
+def uninstall() -> None:
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+
+
+def watchdog() -> Optional[StallWatchdog]:
+    return _watchdog
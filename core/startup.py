@@ -0,0 +1,50 @@
+# core/startup.py
+import time
+from typing import Callable, Optional
+from PyQt5.QtCore import QEvent, QObject
+
+
+class StartupProfiler:
+    """
+    Cronómetro por fases del arranque (modo --profile-startup).
+    mark("fase") cierra la fase en curso; report() imprime el desglose.
+    Si está desactivado, mark() no hace nada (costo cero en uso normal).
+    """
+    def __init__(self, enabled: bool = False, t0: Optional[float] = None):
+        self.enabled = enabled
+        self._t0 = t0 if t0 is not None else time.perf_counter()
+        self._last = self._t0
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000.0))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return (self._last - self._t0) * 1000.0
+
+    def report(self) -> str:
+        width = max((len(p) for p, _ in self.phases), default=5)
+        lines = ["[startup] fase".ljust(width + 10) + "     ms"]
+        for phase, ms in self.phases:
+            lines.append(f"[startup]   {phase.ljust(width)} {ms:8.1f}")
+        lines.append(f"[startup]   {'TOTAL'.ljust(width)} {self.total_ms():8.1f}")
+        return "\n".join(lines)
+
+
+class FirstPaintWatcher(QObject):
+    """Llama callback() una sola vez, cuando el widget recibe su primer Paint."""
+    def __init__(self, widget, callback: Callable[[], None]):
+        super().__init__(widget)
+        self._callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self._callback is not None:
+            callback, self._callback = self._callback, None
+            obj.removeEventFilter(self)
+            callback()
+        return False
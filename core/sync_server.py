@@ -0,0 +1,94 @@
+# core/sync_server.py
+from __future__ import annotations
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+
+class LocalSyncServer:
+    """
+    Servidor de sincronización local (reemplazo del remoto, útil para pruebas
+    y para sincronizar por una carpeta compartida o un pendrive).
+    Guarda lotes opacos (bytes) con un número de secuencia global:
+      push(nodo, lote) -> seq       pull(nodo, desde) -> [(seq, lote)] de OTROS nodos
+    Con root=None todo queda en memoria.
+    En carpeta, un push:
+      1. escribe el lote en un temporal (.<nodo>-<azar>.tmp) y le hace fsync;
+      2. reserva el seq creando <seq>.lock en modo exclusivo (el nombre no
+         lleva el nodo: dos equipos no pueden quedarse con el mismo número);
+      3. publica con os.replace a <seq>-<nodo>.batch (atómico: nadie lee
+         un lote a medio escribir).
+    pull() entrega seqs contiguos: se detiene ante un seq reservado cuyo lote
+    aún no aparece, para no avanzar la marca de agua por encima de él. Una
+    reserva sin lote por más de STALE_S (el equipo murió entre 2 y 3) se salta.
+    """
+    SUFFIX = ".batch"
+    LOCK = ".lock"
+    STALE_S = 120.0
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root) if root is not None else None
+        self._mem: list[tuple[int, str, bytes]] = []
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    def push(self, node: str, blob: bytes) -> int:
+        if self.root is None:
+            seq = self.head() + 1
+            self._mem.append((seq, node, blob))
+            return seq
+        tmp = self.root / f".{node}-{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(blob)
+            fh.flush()
+            os.fsync(fh.fileno())
+        try:
+            while True:
+                seq = self.head() + 1
+                try:
+                    with open(self.root / f"{seq:08d}{self.LOCK}", "xb"):
+                        pass
+                except FileExistsError:
+                    continue  # otro equipo tomó ese seq: probar el siguiente
+                os.replace(tmp, self.root / f"{seq:08d}-{node}{self.SUFFIX}")
+                return seq
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def pull(self, node: str, since: int = 0) -> list[tuple[int, bytes]]:
+        if self.root is None:
+            return [(seq, blob) for seq, origin, blob in self._mem if seq > since and origin != node]
+        batches = {seq: (origin, path) for seq, origin, path in self._entries()}
+        locks = self._locks()
+        out = []
+        for seq in range(since + 1, self.head() + 1):
+            if seq not in batches:
+                lock = locks.get(seq)
+                if lock is not None and time.time() - lock.stat().st_mtime < self.STALE_S:
+                    break  # reservado y todavía publicándose: el resto en el próximo pull
+                continue
+            origin, path = batches[seq]
+            if origin != node:
+                out.append((seq, path.read_bytes()))
+        return out
+
+    def head(self) -> int:
+        if self.root is None:
+            return self._mem[-1][0] if self._mem else 0
+        seqs = [e[0] for e in self._entries()] + list(self._locks())
+        return max(seqs, default=0)
+
+    # ---------- internos ----------
+    def _entries(self) -> list[tuple[int, str, Path]]:
+        out = []
+        for path in self.root.glob(f"*{self.SUFFIX}"):
+            seq, _, origin = path.stem.partition("-")
+            if seq.isdigit() and origin:
+                out.append((int(seq), origin, path))
+        out.sort(key=lambda e: e[0])
+        return out
+
+    def _locks(self) -> dict[int, Path]:
+        return {int(p.stem): p for p in self.root.glob(f"*{self.LOCK}") if p.stem.isdigit()}
@@ -0,0 +1,102 @@
+# domain/dtos/batch.py
+from __future__ import annotations
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+# -------------------------------------------------------------------
+# Lote columnar para operaciones masivas (importación, exportación):
+# una columna por campo en vez de un dict/tupla por fila.
+#   - "int"/"bool": array('q')/array('b') (8/1 bytes por valor, sin objetos);
+#     los None se guardan aparte (índices) porque array no los admite;
+#   - "str"/"obj": lista simple (los objetos ya existen, solo se ahorra el contenedor).
+# Las filas se arman al leer (row(), rows(), chunks()).
+# -------------------------------------------------------------------
+_TYPECODES = {"int": "q", "bool": "b"}
+
+
+class ColumnBatch:
+    __slots__ = ("fields", "_kinds", "_cols", "_nulls", "_len")
+
+    def __init__(self, schema: Sequence[tuple[str, str]]):
+        """schema: [(campo, "int" | "bool" | "str" | "obj"), ...] en orden de fila."""
+        self.fields = tuple(name for name, _ in schema)
+        self._kinds = tuple(kind for _, kind in schema)
+        self._cols: list = [array(_TYPECODES[k]) if k in _TYPECODES else [] for k in self._kinds]
+        self._nulls: list[Optional[set]] = [set() if k in _TYPECODES else None for k in self._kinds]
+        self._len = 0
+
+    @classmethod
+    def from_rows(cls, schema: Sequence[tuple[str, str]], rows: Iterable[Sequence]) -> "ColumnBatch":
+        batch = cls(schema)
+        batch.extend(rows)
+        return batch
+
+    # ---------- escritura ----------
+    def append(self, row: Sequence) -> None:
+        i = self._len
+        for col, nulls, value in zip(self._cols, self._nulls, row):
+            if nulls is not None:
+                if value is None:
+                    nulls.add(i)
+                    value = 0
+                col.append(value)
+            else:
+                col.append(value)
+        self._len += 1
+
+    def extend(self, rows: Iterable[Sequence]) -> None:
+        for row in rows:
+            self.append(row)
+
+    # ---------- lectura ----------
+    def __len__(self) -> int:
+        return self._len
+
+    def column(self, name: str) -> list:
+        """Valores de una columna (con None donde corresponda)."""
+        c = self.fields.index(name)
+        col, nulls = self._cols[c], self._nulls[c]
+        if self._kinds[c] == "bool":
+            values = [bool(v) for v in col]
+        else:
+            values = list(col)
+        for i in nulls or ():
+            values[i] = None
+        return values
+
+    def row(self, i: int) -> tuple:
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        out = []
+        for col, nulls, kind in zip(self._cols, self._nulls, self._kinds):
+            if nulls and i in nulls:
+                out.append(None)
+            elif kind == "bool":
+                out.append(bool(col[i]))
+            else:
+                out.append(col[i])
+        return tuple(out)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[tuple]:
+        stop = self._len if stop is None else min(stop, self._len)
+        for i in range(start, stop):
+            yield self.row(i)
+
+    def chunks(self, size: int) -> Iterator[list[tuple]]:
+        """Filas en bloques de `size` (p.ej. insert_many(bloque, fields=...))."""
+        for start in range(0, self._len, size):
+            yield list(self.rows(start, start + size))
+
+    def nbytes(self) -> int:
+        """Bytes de los contenedores de columnas (sin contar los objetos str compartidos)."""
+        import sys
+        return sum(sys.getsizeof(c) for c in self._cols) + sum(sys.getsizeof(n) for n in self._nulls if n)
+
+    def __repr__(self) -> str:
+        return f"ColumnBatch({len(self)} filas, {', '.join(self.fields)})"
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self.rows()
+
+    def __getitem__(self, i: int) -> Any:
+        return self.row(i)
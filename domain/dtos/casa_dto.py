@@ -0,0 +1,38 @@
+# domain/dtos/casa_dto.py
+from dataclasses import dataclass
+from typing import Optional
+
+# Filas del detalle de casa. Inmutables: el controller guarda tuplas de
+# estas filas y cada edición crea una tupla nueva que comparte las filas
+# no tocadas; el snapshot para Cancelar es solo otra referencia (sin copias).
+
+
+@dataclass(frozen=True, slots=True)
+class HabitacionDTO:
+    id: Optional[int]          # None = aún no guardada
+    capacidad: int
+    camas: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict, id: Optional[int] = None) -> "HabitacionDTO":
+        """Desde el formulario de habitación ({'capacidad', 'camas'})."""
+        return cls(id=id, capacidad=int(data.get("capacidad", 0) or 0),
+                   camas=tuple(data.get("camas", ())))
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "capacidad": self.capacidad, "camas": list(self.camas)}
+
+
+@dataclass(frozen=True, slots=True)
+class BanoDTO:
+    id: Optional[int]
+    ubicacion: str
+    tina: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict, id: Optional[int] = None) -> "BanoDTO":
+        """Desde el formulario de baño ({'ubicacion', 'tina'})."""
+        return cls(id=id, ubicacion=data.get("ubicacion", "") or "", tina=bool(data.get("tina", False)))
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "ubicacion": self.ubicacion, "tina": self.tina}
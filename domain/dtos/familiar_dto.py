@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FamiliarDTO:
     id: Optional[int]
     hospedado_id: int
@@ -10,4 +10,3 @@ class FamiliarDTO:
     edad: Optional[int]
     sexo: str
     relacion: Optional[str]
-
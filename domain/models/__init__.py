@@ -0,0 +1,7 @@
+# domain/models/__init__.py
+# Los modelos viven en core.db (una sola definición por tabla); este paquete
+# solo los reexporta para el código que los importa desde la capa de dominio.
+from core.db import (  # noqa: F401
+    BaseModel, Anfitrion, Casa, Pieza, Habitacion, Cama, Bano,
+    Hospedado, Familiar, Asignacion, ALL_MODELS, MODELS,
+)
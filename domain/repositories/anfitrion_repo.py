@@ -0,0 +1,59 @@
+# domain/repositories/anfitrion_repo.py
+from typing import Iterator, List, Optional, Tuple
+from peewee import fn, prefetch
+from core.db import Anfitrion, Casa
+from domain.repositories import paging
+from domain.repositories.cache import RepoCache
+
+# compartida por todas las instancias del repo (una por sesión)
+_cache = RepoCache("anfitrion", depends=("casa",))
+
+
+class AnfitrionRepository:
+    cache = _cache
+    # keyset: clave (nombre_completo, id); filas (id, rut, nombre_completo, telefono, correo, sexo, estado_civil)
+    KEY = (Anfitrion.nombre_completo, Anfitrion.id)
+    FIELDS = (Anfitrion.id, Anfitrion.rut, Anfitrion.nombre_completo, Anfitrion.telefono,
+              Anfitrion.correo, Anfitrion.sexo, Anfitrion.estado_civil)
+
+    def count_rows(self) -> int:
+        return Anfitrion.select(fn.COUNT(Anfitrion.id)).scalar() or 0
+
+    def page(self, after: Optional[Tuple[str, int]] = None, limit: int = paging.DEFAULT_LIMIT,
+             named: bool = False) -> list:
+        """Hasta `limit` anfitriones después de `after=(nombre_completo, id)`."""
+        return paging.page(Anfitrion.select(*self.FIELDS), self.KEY, after, limit, named)
+
+    def iter_rows(self, batch: int = paging.STREAM_BATCH, named: bool = True) -> Iterator:
+        return paging.stream(Anfitrion.select(*self.FIELDS), self.KEY,
+                             key_of=lambda r: (r[2], r[0]), batch=batch, named=named)
+
+    def get_con_casas(self, rut: str) -> Tuple[Optional[Anfitrion], List[Tuple[int, str]]]:
+        """
+        Anfitrión + sus casas [(id, dirección)] en 2 consultas fijas (prefetch),
+        en vez de una consulta de casas por cada anfitrión abierto.
+        Reabrir el mismo anfitrión se sirve desde la caché de sesión.
+        """
+        num = Anfitrion.rut_key(rut)
+        if num is None:
+            return None, []
+        a, casas = self.cache.query(("con_casas", num), lambda: self._load_con_casas(num))
+        return a, list(casas)
+
+    def host_items(self) -> List[Tuple[int, str]]:
+        """[(id, nombre_completo)] por nombre, para los combos (desde memoria si no hubo cambios)."""
+        return list(self.cache.query(("hosts",), lambda: tuple(
+            Anfitrion
+            .select(Anfitrion.id, Anfitrion.nombre_completo)
+            .order_by(Anfitrion.nombre_completo.asc(), Anfitrion.id.asc())
+            .tuples())))
+
+    def _load_con_casas(self, num: int) -> Tuple[Optional[Anfitrion], tuple]:
+        hosts = prefetch(
+            Anfitrion.select().where(Anfitrion.rut_num == num),
+            Casa.select(Casa.id, Casa.direccion, Casa.anfitrion).order_by(Casa.id),
+        )
+        if not hosts:
+            return None, ()
+        a = self.cache.put(hosts[0].id, hosts[0])
+        return a, tuple((c.id, c.direccion) for c in hosts[0].casas)
@@ -0,0 +1,52 @@
+# domain/repositories/asignacion_repo.py
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+from peewee import fn
+from core.db import Asignacion
+from domain.repositories import paging
+
+
+class AsignacionRepository:
+    """
+    Lectura paginada de asignaciones como tuplas/namedtuples
+    (id, hospedado_id, casa_id, pieza_id, fecha_inicio, fecha_fin, estado).
+    Clave keyset (fecha_inicio, id): las más antiguas primero; los filtros
+    casa/estado calzan con el índice (casa, estado, fecha_inicio, fecha_fin).
+    """
+    KEY = (Asignacion.fecha_inicio, Asignacion.id)
+
+    def _select(self, casa_id: Optional[int] = None, hospedado_id: Optional[int] = None,
+                estados: Optional[Iterable[str]] = None):
+        q = Asignacion.select(
+            Asignacion.id,
+            Asignacion.hospedado.alias("hospedado_id"),
+            Asignacion.casa.alias("casa_id"),
+            Asignacion.pieza.alias("pieza_id"),
+            Asignacion.fecha_inicio,
+            Asignacion.fecha_fin,
+            Asignacion.estado,
+        )
+        if casa_id is not None:
+            q = q.where(Asignacion.casa == casa_id)
+        if hospedado_id is not None:
+            q = q.where(Asignacion.hospedado == hospedado_id)
+        if estados is not None:
+            q = q.where(Asignacion.estado.in_(list(estados)))
+        return q
+
+    def count_rows(self, casa_id: Optional[int] = None, hospedado_id: Optional[int] = None,
+                   estados: Optional[Iterable[str]] = None) -> int:
+        q = self._select(casa_id, hospedado_id, estados).select(fn.COUNT(Asignacion.id))
+        return q.scalar() or 0
+
+    def page(self, after: Optional[Tuple[datetime, int]] = None, limit: int = paging.DEFAULT_LIMIT,
+             named: bool = False, casa_id: Optional[int] = None, hospedado_id: Optional[int] = None,
+             estados: Optional[Iterable[str]] = None) -> list:
+        """Hasta `limit` asignaciones después de `after=(fecha_inicio, id)`."""
+        return paging.page(self._select(casa_id, hospedado_id, estados), self.KEY, after, limit, named)
+
+    def iter_rows(self, batch: int = paging.STREAM_BATCH, named: bool = True,
+                  casa_id: Optional[int] = None, hospedado_id: Optional[int] = None,
+                  estados: Optional[Iterable[str]] = None) -> Iterator:
+        return paging.stream(self._select(casa_id, hospedado_id, estados), self.KEY,
+                             key_of=lambda r: (r[4], r[0]), batch=batch, named=named)
@@ -0,0 +1,129 @@
+# domain/repositories/cache.py
+from __future__ import annotations
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from core.events import listen, INSERTED, RESET
+
+# -------------------------------------------------------------------
+# Caché de sesión para los repositorios:
+#   - mapa de identidad (débil): mientras alguien tenga la entidad, el
+#     mismo id devuelve el MISMO objeto (dos diálogos no divergen);
+#   - LRU acotado (fuerte): mantiene vivas las últimas `maxsize` entradas,
+#     así reabrir un detalle o llenar un combo no toca la DB.
+# Se invalida sola con los eventos de dominio (core.events.listen), que
+# cubren BaseModel.save()/delete_instance() y las escrituras masivas de
+# los repositorios/servicios. Thread-safe: la usan los hilos del ejecutor.
+# -------------------------------------------------------------------
+_MISSING = object()
+
+
+class RepoCache:
+    """
+    `table`: tabla de la entidad (sus eventos traen ids a descartar).
+    `depends`: otras tablas que forman parte de lo cacheado (p.ej. las
+    casas de un anfitrión); cualquier cambio en ellas vacía la caché.
+    Claves: entity(id, ...) para entidades, query(clave, ...) para
+    resultados derivados (listas, búsquedas por RUT), que se vacían ante
+    cualquier alta/cambio/baja de la tabla.
+    """
+    def __init__(self, table: str, depends: Iterable[str] = (), maxsize: int = 256):
+        self.table = table
+        self.depends = frozenset(depends)
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+        self._identity: "weakref.WeakValueDictionary[Hashable, Any]" = weakref.WeakValueDictionary()
+        self._lru: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._queries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._gen = 0   # sube con cada invalidación: una carga que la cruzó no se guarda
+        self.hits = 0
+        self.misses = 0
+        listen(self._on_change)
+
+    # ---------- API ----------
+    def entity(self, id_: int, loader: Callable[[int], Any]) -> Any:
+        """Entidad por id (mismo objeto mientras esté en uso o en el LRU)."""
+        with self._lock:
+            obj = self.peek(id_)
+            if obj is not None:
+                self.hits += 1
+                self._touch(self._lru, id_, obj)
+                return obj
+            gen = self._gen
+        self.misses += 1
+        obj = loader(id_)
+        if obj is not None:
+            with self._lock:
+                if gen == self._gen:
+                    obj = self.put(id_, obj)
+        return obj
+
+    def put(self, id_: int, obj: Any) -> Any:
+        """Registra una entidad recién leída; si ya hay una con ese id, gana la existente."""
+        with self._lock:
+            current = self._identity.get(id_)
+            if current is not None:
+                obj = current
+            else:
+                try:
+                    self._identity[id_] = obj
+                except TypeError:
+                    pass  # no admite weakref (tupla, dict): solo LRU
+            self._touch(self._lru, id_, obj)
+            return obj
+
+    def peek(self, id_: int) -> Any:
+        with self._lock:
+            obj = self._identity.get(id_)
+            return obj if obj is not None else self._lru.get(id_)
+
+    def query(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Resultado derivado cacheado bajo `key` (se vacía con cualquier cambio de la tabla)."""
+        with self._lock:
+            value = self._queries.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                self._touch(self._queries, key, value)
+                return value
+            gen = self._gen
+        self.misses += 1
+        value = loader()
+        with self._lock:
+            if gen == self._gen:
+                self._touch(self._queries, key, value)
+        return value
+
+    def forget(self, ids: Optional[Iterable[int]] = None) -> None:
+        """Descarta esas entidades (o todo) y los resultados derivados."""
+        with self._lock:
+            self._gen += 1
+            self._queries.clear()
+            if ids is None:
+                self._identity.clear()
+                self._lru.clear()
+                return
+            for id_ in ids:
+                self._identity.pop(id_, None)
+                self._lru.pop(id_, None)
+
+    def clear(self) -> None:
+        self.forget(None)
+
+    # ---------- internos ----------
+    def _touch(self, od: OrderedDict, key: Hashable, value: Any):
+        od[key] = value
+        od.move_to_end(key)
+        while len(od) > self.maxsize:
+            od.popitem(last=False)
+
+    def _on_change(self, entity: str, kind: str, ids: tuple):
+        if entity == self.table:
+            if kind == RESET:
+                self.forget(None)
+            else:
+                # un alta no invalida entidades existentes, solo listas/búsquedas
+                self.forget(() if kind == INSERTED else ids)
+        elif entity in self.depends:
+            self.forget(None)
@@ -0,0 +1,207 @@
+# domain/repositories/casa_repo.py
+from collections import Counter
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+from peewee import fn
+from core.db import db, Anfitrion, Casa, Habitacion, Cama, Bano
+from core.events import emit, UPDATED
+from domain.repositories import paging
+from domain.repositories.cache import RepoCache
+from domain.dtos.casa_dto import HabitacionDTO, BanoDTO
+
+# compartida por todas las instancias; el detalle incluye habitaciones/camas/baños
+_cache = RepoCache("casa", depends=("anfitrion", "habitacion", "cama", "bano"), maxsize=64)
+
+
+def diff_detalle(loaded: dict, habs: Sequence[HabitacionDTO], banos: Sequence[BanoDTO]) -> dict:
+    """
+    Compara lo cargado desde la DB con lo editado en el diálogo y devuelve
+    solo los cambios a aplicar.
+    loaded = {"habs":  {hab_id: {"capacidad": int, "camas": [(cama_id, tipo), ...]}},
+              "banos": {bano_id: {"ubicacion": str, "tina": bool}}}
+    habs/banos: estado del controller; las filas ya existentes traen id.
+    Las camas se comparan como multiconjunto de tipos por habitación.
+    """
+    plan = {
+        "hab_insert": [], "hab_update": [], "hab_delete": [],
+        "cama_insert": [], "cama_delete": [],
+        "bano_insert": [], "bano_update": [], "bano_delete": [],
+    }
+
+    seen = set()
+    for h in habs:
+        cap = int(h.capacidad or 0)
+        camas = list(h.camas)
+        orig = loaded["habs"].get(h.id)
+        if orig is None:
+            plan["hab_insert"].append((cap, camas))
+            continue
+        hid = h.id
+        seen.add(hid)
+        if cap != orig["capacidad"]:
+            plan["hab_update"].append((hid, cap))
+        pending = Counter(camas)
+        for cama_id, tipo in orig["camas"]:
+            if pending[tipo] > 0:
+                pending[tipo] -= 1
+            else:
+                plan["cama_delete"].append(cama_id)
+        for tipo, n in pending.items():
+            plan["cama_insert"].extend([(hid, tipo)] * n)
+    plan["hab_delete"] = [hid for hid in loaded["habs"] if hid not in seen]
+
+    seen = set()
+    for b in banos:
+        ubic = b.ubicacion or ""
+        tina = bool(b.tina)
+        orig = loaded["banos"].get(b.id)
+        if orig is None:
+            plan["bano_insert"].append((ubic, tina))
+            continue
+        seen.add(b.id)
+        if (ubic, tina) != (orig["ubicacion"], orig["tina"]):
+            plan["bano_update"].append((b.id, ubic, tina))
+    plan["bano_delete"] = [bid for bid in loaded["banos"] if bid not in seen]
+    return plan
+
+
+class CasaRepository:
+    cache = _cache
+    # keyset: clave (direccion, id); filas (id, direccion, anfitrion_id, anfitrion_nombre)
+    KEY = (Casa.direccion, Casa.id)
+
+    def _select(self, anfitrion_id: Optional[int] = None):
+        q = (Casa
+             .select(Casa.id, Casa.direccion, Casa.anfitrion.alias("anfitrion_id"),
+                     Anfitrion.nombre_completo.alias("anfitrion_nombre"))
+             .join(Anfitrion))
+        if anfitrion_id is not None:
+            q = q.where(Casa.anfitrion == anfitrion_id)
+        return q
+
+    def count_rows(self, anfitrion_id: Optional[int] = None) -> int:
+        q = Casa.select(fn.COUNT(Casa.id))
+        if anfitrion_id is not None:
+            q = q.where(Casa.anfitrion == anfitrion_id)
+        return q.scalar() or 0
+
+    def page(self, after: Optional[tuple[str, int]] = None, limit: int = paging.DEFAULT_LIMIT,
+             named: bool = False, anfitrion_id: Optional[int] = None) -> list:
+        """Hasta `limit` casas después de `after=(direccion, id)` (opcional: de un anfitrión)."""
+        return paging.page(self._select(anfitrion_id), self.KEY, after, limit, named)
+
+    def iter_rows(self, batch: int = paging.STREAM_BATCH, named: bool = True,
+                  anfitrion_id: Optional[int] = None) -> Iterator:
+        return paging.stream(self._select(anfitrion_id), self.KEY,
+                             key_of=lambda r: (r[1], r[0]), batch=batch, named=named)
+
+    def load_detalle(self, casa_id: int) -> Optional[dict]:
+        """
+        Carga el agregado completo de una casa en 4 consultas fijas
+        (casa+anfitrión, habitaciones, camas, baños), sin importar cuántas
+        habitaciones o camas tenga. Devuelve None si la casa no existe.
+        {"casa": Casa, "habs": (HabitacionDTO, ...), "banos": (BanoDTO, ...), "loaded": {...}}
+        con el mismo formato que espera save_detalle().
+        Reabrir la misma casa se sirve desde la caché de sesión; como las
+        filas son inmutables, el mismo agregado se comparte sin copiar.
+        """
+        return self.cache.query(("detalle", casa_id), lambda: self._load_detalle(casa_id))
+
+    def _load_detalle(self, casa_id: int) -> Optional[dict]:
+        casa = (Casa
+                .select(Casa, Anfitrion)
+                .join(Anfitrion)
+                .where(Casa.id == casa_id)
+                .get_or_none())
+        if casa is None:
+            return None
+
+        hab_rows = (Habitacion
+                    .select(Habitacion.id, Habitacion.capacidad)
+                    .where(Habitacion.casa == casa_id)
+                    .order_by(Habitacion.id)
+                    .tuples())
+        cama_rows = (Cama
+                     .select(Cama.id, Cama.habitacion, Cama.tipo)
+                     .join(Habitacion)
+                     .where(Habitacion.casa == casa_id)
+                     .order_by(Cama.id)
+                     .tuples())
+        bano_rows = (Bano
+                     .select(Bano.id, Bano.ubicacion, Bano.tiene_tina)
+                     .where(Bano.casa == casa_id)
+                     .order_by(Bano.id)
+                     .tuples())
+
+        loaded = {"habs": {}, "banos": {}}
+        for hid, cap in hab_rows:
+            loaded["habs"][hid] = {"capacidad": int(cap or 0), "camas": []}
+        for cid, hid, tipo in cama_rows:
+            loaded["habs"][hid]["camas"].append((cid, tipo))
+        for bid, ubic, tina in bano_rows:
+            loaded["banos"][bid] = {"ubicacion": ubic or "", "tina": bool(tina)}
+
+        habs = tuple(HabitacionDTO(hid, h["capacidad"], tuple(t for _, t in h["camas"]))
+                     for hid, h in loaded["habs"].items())
+        banos = tuple(BanoDTO(bid, b["ubicacion"], b["tina"]) for bid, b in loaded["banos"].items())
+        return {"casa": self.cache.put(casa.id, casa), "habs": habs, "banos": banos, "loaded": loaded}
+
+    def save_detalle(self, casa: Optional[Casa], direccion: str, anfitrion_id: int,
+                     habs: Sequence[HabitacionDTO], banos: Sequence[BanoDTO], loaded: dict) -> Casa:
+        """
+        Guarda casa + habitaciones/camas/baños en UNA transacción: o se aplica
+        todo o nada. Solo escribe lo que cambió respecto de `loaded`.
+        """
+        plan = diff_detalle(loaded, habs, banos)
+        now = datetime.now()
+        try:
+            with db.atomic():
+                if casa is None:
+                    casa = Casa.create(direccion=direccion, anfitrion=anfitrion_id)
+                elif casa.direccion != direccion or casa.anfitrion_id != anfitrion_id:
+                    casa.direccion = direccion
+                    casa.anfitrion = anfitrion_id
+                    casa.save()
+
+                # --- habitaciones ---
+                if plan["hab_delete"]:
+                    Cama.delete().where(Cama.habitacion.in_(plan["hab_delete"])).execute()
+                    Habitacion.delete().where(Habitacion.id.in_(plan["hab_delete"])).execute()
+                for hid, cap in plan["hab_update"]:
+                    Habitacion.update(capacidad=cap, updated_at=now).where(Habitacion.id == hid).execute()
+
+                cama_insert = list(plan["cama_insert"])
+                if plan["hab_insert"]:
+                    last_id = (Habitacion
+                               .insert_many([{"casa": casa.id, "capacidad": cap}
+                                             for cap, _ in plan["hab_insert"]])
+                               .execute())
+                    # SQLite asigna rowids consecutivos dentro de un INSERT multi-fila
+                    # (tenemos el lock de escritura): el primero es last_id - n + 1.
+                    first_id = last_id - len(plan["hab_insert"]) + 1
+                    for offset, (_cap, camas) in enumerate(plan["hab_insert"]):
+                        cama_insert.extend((first_id + offset, tipo) for tipo in camas)
+
+                # --- camas ---
+                if plan["cama_delete"]:
+                    Cama.delete().where(Cama.id.in_(plan["cama_delete"])).execute()
+                if cama_insert:
+                    Cama.insert_many([{"habitacion": hid, "tipo": tipo}
+                                      for hid, tipo in cama_insert]).execute()
+
+                # --- baños ---
+                if plan["bano_delete"]:
+                    Bano.delete().where(Bano.id.in_(plan["bano_delete"])).execute()
+                for bid, ubic, tina in plan["bano_update"]:
+                    (Bano.update(ubicacion=ubic, tiene_tina=tina, updated_at=now)
+                         .where(Bano.id == bid).execute())
+                if plan["bano_insert"]:
+                    Bano.insert_many([{"casa": casa.id, "ubicacion": ubic, "tiene_tina": tina}
+                                      for ubic, tina in plan["bano_insert"]]).execute()
+        except Exception:
+            # la instancia (compartida vía caché) pudo quedar modificada: que se relea
+            self.cache.forget((casa.id,) if casa is not None and casa.id else None)
+            raise
+        if any(plan.values()):
+            emit("casa", UPDATED, (casa.id,))  # cambió su detalle (habitaciones/baños)
+        return casa
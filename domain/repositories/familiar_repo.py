@@ -1,24 +1,44 @@
 # domain/repositories/familiar_repo.py
-from typing import List
-from domain.models.familiar import Familiar
+from typing import Iterator, List, Optional, Tuple
+from core.db import Familiar
 from domain.dtos.familiar_dto import FamiliarDTO
-from domain.models.hospedado import Hospedado
+from domain.repositories import paging
 
 class FamiliarRepository:
+    # keyset: clave (nombre, id); filas (id, hospedado_id, nombre, edad, sexo, relacion)
+    KEY = (Familiar.nombre, Familiar.id)
+
+    def _select(self, hospedado_id: Optional[int] = None):
+        q = Familiar.select(Familiar.id, Familiar.hospedado.alias("hospedado_id"), Familiar.nombre,
+                            Familiar.edad, Familiar.sexo, Familiar.relacion)
+        if hospedado_id is not None:
+            q = q.where(Familiar.hospedado == hospedado_id)
+        return q
+
+    def page(self, after: Optional[Tuple[str, int]] = None, limit: int = paging.DEFAULT_LIMIT,
+             named: bool = False, hospedado_id: Optional[int] = None) -> list:
+        """Hasta `limit` familiares después de `after=(nombre, id)` (opcional: de un hospedado)."""
+        return paging.page(self._select(hospedado_id), self.KEY, after, limit, named)
+
+    def iter_rows(self, batch: int = paging.STREAM_BATCH, named: bool = True,
+                  hospedado_id: Optional[int] = None) -> Iterator:
+        return paging.stream(self._select(hospedado_id), self.KEY,
+                             key_of=lambda r: (r[2], r[0]), batch=batch, named=named)
+
     def list_for_hospedado(self, hospedado_id: int) -> List[FamiliarDTO]:
         qs = Familiar.select().where(Familiar.hospedado == hospedado_id).order_by(Familiar.nombre.asc())
         out: List[FamiliarDTO] = []
         for f in qs:
             out.append(FamiliarDTO(
-                id=f.id, hospedado_id=f.hospedado.id, nombre=f.nombre,
+                id=f.id, hospedado_id=f.hospedado_id, nombre=f.nombre,
                 edad=f.edad, sexo=f.sexo, relacion=f.relacion
             ))
         return out
 
+    # los eventos los emite core.db.BaseModel al guardar/borrar
     def create(self, dto: FamiliarDTO) -> int:
-        h = Hospedado.get_by_id(dto.hospedado_id)
         f = Familiar.create(
-            hospedado=h,
+            hospedado=dto.hospedado_id,  # la FK la valida SQLite (foreign_keys=1)
             nombre=dto.nombre,
             edad=dto.edad,
             sexo=dto.sexo,
@@ -1,10 +1,22 @@
 # domain/repositories/hospedado_repo.py
-from typing import List, Tuple
-from domain.models.hospedado import Hospedado
+from typing import Iterator, List, Optional, Tuple
+from core.db import Hospedado
 from domain.dtos.hospedado_dto import HospedadoDTO
+from domain.repositories.search_repo import SearchRepository
+from domain.repositories import paging
+from domain.repositories.cache import RepoCache
 from peewee import fn
 
+# compartida por todas las instancias del repo (una por sesión)
+_cache = RepoCache("hospedado")
+
+
 class HospedadoRepository:
+    cache = _cache
+
+    def __init__(self, search: Optional[SearchRepository] = None):
+        self.search = search or SearchRepository()
+
     def get(self, id_: int) -> HospedadoDTO:
         h = Hospedado.get_by_id(id_)
         return HospedadoDTO(
@@ -12,6 +24,24 @@ class HospedadoRepository:
             correo=h.correo, telefono=h.telefono, edad=h.edad, sexo=h.sexo
         )
 
+    def by_rut(self, rut: str) -> Optional[Hospedado]:
+        """
+        Modelo editable por RUT, para el detalle. Reabrirlo se sirve desde la
+        caché de sesión (mismo objeto).
+        """
+        num = Hospedado.rut_key(rut)
+        if num is None:
+            return None
+        id_ = self.cache.query(("rut", num), lambda: (Hospedado
+                                                      .select(Hospedado.id)
+                                                      .where(Hospedado.rut_num == num)
+                                                      .scalar()))
+        if id_ is None:
+            return None
+        return self.cache.entity(id_, lambda i: Hospedado.get_or_none(Hospedado.id == i))
+
+    # create/update/delete: los eventos los emite core.db.BaseModel;
+    # RutMixin normaliza el RUT y llena rut_num/rut_dv al guardar
     def create(self, dto: HospedadoDTO) -> int:
         h = Hospedado.create(
             nombre_completo=dto.nombre_completo,
@@ -37,23 +67,71 @@ class HospedadoRepository:
 
     # ---- Listado helpers ----
     def list_rows(self) -> List[Tuple[int, str]]:
-        rows = []
-        for h in Hospedado.select().order_by(Hospedado.nombre_completo.asc()):
-            rows.append((h.id, f"{h.nombre_completo} ({h.rut})"))
-        return rows
+        # solo las 3 columnas, en tuplas (sin instanciar modelos)
+        return [(id_, f"{nombre} ({rut})") for id_, rut, nombre in self.iter_rows(named=False, full=False)]
 
     def search_list_rows(self, q: str) -> List[Tuple[int, str]]:
         q = q.strip()
         if not q:
             return self.list_rows()
-        pattern = f"%{q}%"
-        qs = (Hospedado
-              .select()
-              .where(
-                  (Hospedado.nombre_completo.contains(q)) |
-                  (Hospedado.rut.contains(q)) |
-                  (Hospedado.correo.contains(q)) |
-                  (Hospedado.telefono.contains(q))
-              )
-              .order_by(Hospedado.nombre_completo.asc()))
-        return [(h.id, f"{h.nombre_completo} ({h.rut})") for h in qs]
+        return [(id_, f"{nombre} ({rut})") for id_, rut, nombre in self.search_rows(q)]
+
+    def rows_by_ids(self, ids) -> List[Tuple[int, str, str]]:
+        """Filas (id, rut, nombre_completo) de los ids dados (para parchar listas)."""
+        ids = list(ids)
+        if not ids:
+            return []
+        return list(Hospedado
+                    .select(Hospedado.id, Hospedado.rut, Hospedado.nombre_completo)
+                    .where(Hospedado.id.in_(ids))
+                    .tuples())
+
+    def search_rows(self, q: str, limit: int = SearchRepository.DEFAULT_LIMIT) -> List[Tuple[int, str, str]]:
+        """Filas (id, rut, nombre_completo) que calzan con `q`, por relevancia (FTS5)."""
+        ids = self.search.hospedados(q, limit=limit)
+        if not ids:
+            return []
+        by_id = {r[0]: r for r in (Hospedado
+                                   .select(Hospedado.id, Hospedado.rut, Hospedado.nombre_completo)
+                                   .where(Hospedado.id.in_(ids))
+                                   .tuples())}
+        return [by_id[i] for i in ids if i in by_id]
+
+    # ---- Paginado (para modelos Qt que cargan por demanda) ----
+    def count_rows(self) -> int:
+        return Hospedado.select(fn.COUNT(Hospedado.id)).scalar() or 0
+
+    def page_rows(self, after: Optional[Tuple[str, int]] = None,
+                  limit: int = 200) -> List[Tuple[int, str, str]]:
+        """
+        Devuelve hasta `limit` filas (id, rut, nombre_completo) ordenadas por
+        (nombre_completo, id), empezando después de la clave `after`.
+        Paginación por clave (keyset): no usa OFFSET, así el costo por página
+        no crece con la profundidad del scroll.
+        """
+        return self.page(after, limit, full=False)
+
+    # ---- Keyset genérico: tuplas/namedtuples, clave (nombre_completo, id) ----
+    KEY = (Hospedado.nombre_completo, Hospedado.id)
+    FIELDS = (Hospedado.id, Hospedado.rut, Hospedado.nombre_completo,
+              Hospedado.correo, Hospedado.telefono, Hospedado.edad, Hospedado.sexo)
+
+    def _select(self, full: bool):
+        if full:
+            return Hospedado.select(*self.FIELDS)
+        return Hospedado.select(Hospedado.id, Hospedado.rut, Hospedado.nombre_completo)
+
+    def page(self, after: Optional[Tuple[str, int]] = None, limit: int = paging.DEFAULT_LIMIT,
+             named: bool = False, full: bool = True) -> list:
+        """
+        Página de hasta `limit` filas después de `after=(nombre_completo, id)`.
+        full=True: (id, rut, nombre_completo, correo, telefono, edad, sexo);
+        full=False: (id, rut, nombre_completo). named=True → namedtuples.
+        """
+        return paging.page(self._select(full), self.KEY, after, limit, named)
+
+    def iter_rows(self, batch: int = paging.STREAM_BATCH, named: bool = True,
+                  full: bool = True) -> Iterator:
+        """Todas las filas en orden (nombre_completo, id), por páginas: para exportar."""
+        return paging.stream(self._select(full), self.KEY, key_of=lambda r: (r[2], r[0]),
+                             batch=batch, named=named)
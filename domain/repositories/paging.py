@@ -0,0 +1,46 @@
+# domain/repositories/paging.py
+from typing import Iterator, Optional, Sequence
+from peewee import Field, Tuple as SqlTuple
+
+# -------------------------------------------------------------------
+# Paginación por clave (keyset) compartida por los repositorios:
+#   ORDER BY k1, k2 ... WHERE (k1, k2) > (:after) LIMIT n
+# Con un índice sobre la clave cada página cuesta lo mismo sin importar
+# la profundidad (no hay OFFSET). La clave debe ser única: el último
+# campo es siempre el id.
+# Las filas salen como tuplas o namedtuples (.tuples()/.namedtuples()),
+# nunca como instancias de modelo.
+# -------------------------------------------------------------------
+DEFAULT_LIMIT = 200
+STREAM_BATCH = 1000
+
+
+def keyset(query, key: Sequence[Field], after: Optional[Sequence] = None,
+           limit: int = DEFAULT_LIMIT, named: bool = False):
+    """Aplica orden, cursor `after` y límite a `query` (un select sin order_by)."""
+    query = query.order_by(*[f.asc() for f in key]).limit(limit)
+    if after is not None:
+        # to_value(): el valor pasa por el conversor del campo (fechas, etc.)
+        query = query.where(SqlTuple(*key) > SqlTuple(*[f.to_value(v) for f, v in zip(key, after)]))
+    return query.namedtuples() if named else query.tuples()
+
+
+def page(query, key: Sequence[Field], after: Optional[Sequence] = None,
+         limit: int = DEFAULT_LIMIT, named: bool = False) -> list:
+    return list(keyset(query, key, after, limit, named))
+
+
+def stream(query, key: Sequence[Field], key_of, batch: int = STREAM_BATCH,
+           named: bool = True) -> Iterator:
+    """
+    Recorre todas las filas en páginas de `batch` (memoria acotada, sin
+    mantener un cursor abierto entre páginas). `key_of(fila)` devuelve la
+    clave de la fila para pedir la siguiente página.
+    """
+    after = None
+    while True:
+        rows = page(query, key, after, batch, named)
+        yield from rows
+        if len(rows) < batch:
+            return
+        after = key_of(rows[-1])
@@ -0,0 +1,64 @@
+# domain/repositories/search_repo.py
+from typing import List
+from core.db import db
+from core.search_index import to_match_query
+
+class SearchRepository:
+    """
+    Búsqueda de texto completo sobre el índice FTS5 (ver core/search_index.py).
+    Devuelve ids ordenados por relevancia (bm25: menor = más relevante).
+    """
+    DEFAULT_LIMIT = 500
+
+    def _ids(self, sql: str, params: tuple) -> List[int]:
+        return [row[0] for row in db.execute_sql(sql, params).fetchall()]
+
+    def hospedados(self, q: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        """Hospedados que calzan por sus datos o por el nombre de un familiar."""
+        match = to_match_query(q)
+        if not match:
+            return []
+        return self._ids("""
+            SELECT id FROM (
+                SELECT rowid AS id, bm25(hospedado_fts) AS rank
+                  FROM hospedado_fts WHERE hospedado_fts MATCH ?
+                UNION ALL
+                SELECT f.hospedado_id, bm25(familiar_fts) + 1.0
+                  FROM familiar_fts JOIN familiar f ON f.id = familiar_fts.rowid
+                 WHERE familiar_fts MATCH ?
+            ) GROUP BY id ORDER BY MIN(rank), id LIMIT ?
+        """, (match, match, limit))
+
+    def anfitriones(self, q: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        match = to_match_query(q)
+        if not match:
+            return []
+        return self._ids("""
+            SELECT rowid FROM anfitrion_fts WHERE anfitrion_fts MATCH ?
+             ORDER BY bm25(anfitrion_fts), rowid LIMIT ?
+        """, (match, limit))
+
+    def casas(self, q: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        """Casas que calzan por dirección o por el anfitrión."""
+        match = to_match_query(q)
+        if not match:
+            return []
+        return self._ids("""
+            SELECT id FROM (
+                SELECT rowid AS id, bm25(casa_fts) AS rank
+                  FROM casa_fts WHERE casa_fts MATCH ?
+                UNION ALL
+                SELECT c.id, bm25(anfitrion_fts) + 1.0
+                  FROM anfitrion_fts JOIN casa c ON c.anfitrion_id = anfitrion_fts.rowid
+                 WHERE anfitrion_fts MATCH ?
+            ) GROUP BY id ORDER BY MIN(rank), id LIMIT ?
+        """, (match, match, limit))
+
+    def familiares(self, q: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        match = to_match_query(q)
+        if not match:
+            return []
+        return self._ids("""
+            SELECT rowid FROM familiar_fts WHERE familiar_fts MATCH ?
+             ORDER BY bm25(familiar_fts), rowid LIMIT ?
+        """, (match, limit))
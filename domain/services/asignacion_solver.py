@@ -0,0 +1,156 @@
+# domain/services/asignacion_solver.py
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+from peewee import JOIN, chunked, fn
+from core.db import db, Asignacion, Familiar, Hospedado
+from core.events import emit, RESET
+from domain.services.disponibilidad_service import DisponibilidadService, ESTADOS_OCUPAN
+
+
+@dataclass
+class Grupo:
+    """Un hospedado + su familia: se asignan juntos a una misma pieza."""
+    hospedado_id: int
+    personas: int
+    bano_privado: bool = False  # exige pieza con baño privado
+
+
+@dataclass
+class PlanAsignacion:
+    asignaciones: list[tuple[int, int, int]] = field(default_factory=list)  # (hospedado, casa, pieza)
+    sin_asignar: list[tuple[int, str]] = field(default_factory=list)       # (hospedado, motivo)
+
+
+class _Bins:
+    """
+    Piezas agrupadas por camas libres: best-fit = primer balde con holgura
+    >= personas, O(capacidad máxima) por grupo en vez de recorrer todas las piezas.
+    """
+    def __init__(self):
+        self._baldes: dict[int, list[int]] = defaultdict(list)
+        self._libre: dict[int, int] = {}
+        self._max = 0
+
+    def add(self, pieza_id: int, libre: int):
+        self._libre[pieza_id] = libre
+        self._baldes[libre].append(pieza_id)
+        self._max = max(self._max, libre)
+
+    def take(self, personas: int) -> Optional[int]:
+        for libre in range(personas, self._max + 1):
+            balde = self._baldes.get(libre)
+            if balde:
+                pid = balde.pop()
+                resto = libre - personas
+                self._libre[pid] = resto
+                if resto > 0:
+                    self._baldes[resto].append(pid)
+                return pid
+        return None
+
+    def max_libre(self) -> int:
+        return max((n for n, b in self._baldes.items() if b), default=0)
+
+
+class AsignacionSolver:
+    """
+    Asignación automática de hospedados pendientes a piezas (bin packing):
+    - cada grupo (titular + familiares) va completo a UNA pieza;
+    - nunca se supera la capacidad libre de la pieza en el rango de fechas
+      (según DisponibilidadService, que ya descuenta asignaciones vigentes);
+    - quien pide baño privado solo va a piezas con baño privado; el resto
+      usa primero piezas sin baño privado para no gastarlas.
+    Heurística best-fit decreasing: grupos de mayor a menor, cada uno a la
+    pieza que quede más justa. Todo en memoria; la DB se toca para leer al
+    inicio y para escribir las Asignacion en una sola transacción.
+    """
+    def __init__(self, disponibilidad: Optional[DisponibilidadService] = None):
+        self.disponibilidad = disponibilidad or DisponibilidadService()
+
+    # ---------- API ----------
+    def pendientes(self, hospedado_ids: Optional[Iterable[int]] = None,
+                   bano_privado: Iterable[int] = ()) -> list[Grupo]:
+        """
+        Hospedados sin asignación vigente (pendiente/activa) como grupos con
+        su tamaño familiar. `bano_privado`: ids que exigen baño privado.
+        """
+        vigentes = (Asignacion
+                    .select(Asignacion.hospedado)
+                    .where(Asignacion.estado.in_(ESTADOS_OCUPAN)))
+        q = (Hospedado
+             .select(Hospedado.id, fn.COUNT(Familiar.id))
+             .join(Familiar, JOIN.LEFT_OUTER)
+             .where(Hospedado.id.not_in(vigentes))
+             .group_by(Hospedado.id))
+        if hospedado_ids is not None:
+            q = q.where(Hospedado.id.in_(list(hospedado_ids)))
+        privados = set(bano_privado)
+        return [Grupo(hid, 1 + n_fam, hid in privados) for hid, n_fam in q.tuples()]
+
+    def plan(self, grupos: list[Grupo], inicio: datetime, fin: Optional[datetime] = None,
+             casa_id: Optional[int] = None) -> PlanAsignacion:
+        """Calcula la asignación sin escribir nada."""
+        self.disponibilidad.invalidate(casa_id)
+        comunes, privadas = _Bins(), _Bins()
+        casa_de: dict[int, int] = {}
+        for pid, libre in self.disponibilidad.piezas_libres(inicio, fin, personas=1, casa_id=casa_id):
+            cid, _cap, privado = self.disponibilidad.info_pieza(pid)
+            casa_de[pid] = cid
+            (privadas if privado else comunes).add(pid, libre)
+
+        plan = PlanAsignacion()
+        for g in sorted(grupos, key=lambda g: (-g.personas, not g.bano_privado, g.hospedado_id)):
+            if g.bano_privado:
+                pid = privadas.take(g.personas)
+            else:
+                pid = comunes.take(g.personas)
+                if pid is None:
+                    pid = privadas.take(g.personas)
+            if pid is None:
+                plan.sin_asignar.append((g.hospedado_id, self._motivo(g, comunes, privadas)))
+            else:
+                plan.asignaciones.append((g.hospedado_id, casa_de[pid], pid))
+        return plan
+
+    def aplicar(self, plan: PlanAsignacion, inicio: datetime, fin: Optional[datetime] = None,
+                estado: str = "pendiente") -> int:
+        """Crea las Asignacion del plan en una transacción. Devuelve cuántas."""
+        now = datetime.now()
+        rows = [{"hospedado": hid, "casa": cid, "pieza": pid,
+                 "fecha_inicio": inicio, "fecha_fin": fin, "estado": estado,
+                 "created_at": now, "updated_at": now}
+                for hid, cid, pid in plan.asignaciones]
+        with db.atomic():
+            for chunk in chunked(rows, 100):
+                Asignacion.insert_many(chunk).execute()
+        self.disponibilidad.invalidate()
+        if rows:
+            emit("asignacion", RESET)
+        return len(rows)
+
+    def resolver(self, inicio: datetime, fin: Optional[datetime] = None,
+                 hospedado_ids: Optional[Iterable[int]] = None,
+                 bano_privado: Iterable[int] = (),
+                 casa_id: Optional[int] = None) -> PlanAsignacion:
+        """
+        pendientes + plan + aplicar dentro de la misma transacción: la
+        disponibilidad leída es la que se escribe (sin carreras con otro guardado).
+        """
+        with db.atomic():
+            grupos = self.pendientes(hospedado_ids, bano_privado)
+            plan = self.plan(grupos, inicio, fin, casa_id)
+            self.aplicar(plan, inicio, fin)
+        return plan
+
+    # ---------- internos ----------
+    @staticmethod
+    def _motivo(g: Grupo, comunes: _Bins, privadas: _Bins) -> str:
+        libre = privadas.max_libre() if g.bano_privado else max(comunes.max_libre(), privadas.max_libre())
+        donde = "con baño privado " if g.bano_privado else ""
+        if libre == 0:
+            return f"No quedan piezas {donde}libres en el rango."
+        return f"Grupo de {g.personas} personas: la pieza {donde}más holgada tiene {libre} camas libres."
@@ -0,0 +1,176 @@
+# domain/services/disponibilidad_service.py
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional
+
+from peewee import JOIN, fn
+from core.db import Asignacion, Familiar, Pieza
+from utils.intervals import IntervalIndex
+
+# Estados que ocupan cama; "finalizada" ya no cuenta
+ESTADOS_OCUPAN = ("pendiente", "activa")
+# fecha_fin NULL = estadía abierta: ocupa hasta el infinito
+ABIERTA = datetime.max
+
+PERSONAS_POR_CAMA = {"individual": 1, "matrimonial": 2, "literas": 2}
+
+
+def capacidad_pieza(individual: int, matrimonial: int, literas: int) -> int:
+    return ((individual or 0) * PERSONAS_POR_CAMA["individual"]
+            + (matrimonial or 0) * PERSONAS_POR_CAMA["matrimonial"]
+            + (literas or 0) * PERSONAS_POR_CAMA["literas"])
+
+
+class DisponibilidadService:
+    """
+    Motor de ocupación/disponibilidad sobre Asignacion (para el módulo "asignaciones").
+    Carga las asignaciones vigentes en UNA consulta (índice casa+estado+fechas)
+    y arma un IntervalIndex por pieza y por casa; las consultas posteriores
+    (conflictos, ocupación en una fecha, capacidad libre) no tocan la DB.
+    Cada asignación pesa 1 + sus familiares (ocupan cama con el titular).
+    Tras escribir asignaciones llamar invalidate(casa_id) (o invalidate()).
+    """
+    def __init__(self):
+        self._por_pieza: dict[int, IntervalIndex] = {}
+        self._por_casa: dict[int, IntervalIndex] = {}
+        self._piezas: dict[int, tuple[int, int, bool]] = {}  # pieza_id -> (casa_id, capacidad, baño privado)
+        self._cargadas: set[int] = set()  # casas ya indexadas
+        self._todo = False
+
+    # ---------- carga ----------
+    def load(self, casa_id: Optional[int] = None) -> None:
+        """Indexa una casa (o todas). Idempotente: reconstruye lo pedido."""
+        pq = Pieza.select(Pieza.id, Pieza.casa, Pieza.camas_individual,
+                          Pieza.camas_matrimonial, Pieza.camas_literas, Pieza.bano_privado)
+        fam = (Familiar
+               .select(Familiar.hospedado, fn.COUNT(Familiar.id).alias("n"))
+               .group_by(Familiar.hospedado)
+               .alias("fam"))
+        aq = (Asignacion
+              .select(Asignacion.id, Asignacion.casa, Asignacion.pieza,
+                      Asignacion.fecha_inicio, Asignacion.fecha_fin,
+                      fn.COALESCE(fam.c.n, 0))
+              .join(fam, on=(fam.c.hospedado_id == Asignacion.hospedado), join_type=JOIN.LEFT_OUTER)
+              .where(Asignacion.estado.in_(ESTADOS_OCUPAN)))
+        if casa_id is not None:
+            pq = pq.where(Pieza.casa == casa_id)
+            aq = aq.where(Asignacion.casa == casa_id)
+            casas = {casa_id}
+        else:
+            self._piezas.clear()
+            casas = set()
+
+        for pid, cid, ind, mat, lit, privado in pq.tuples():
+            self._piezas[pid] = (cid, capacidad_pieza(ind, mat, lit), bool(privado))
+            casas.add(cid)
+
+        por_pieza, por_casa = defaultdict(list), defaultdict(list)
+        for aid, cid, pid, ini, fin, n_fam in aq.tuples():
+            item = (ini, fin or ABIERTA, (aid, 1 + int(n_fam or 0)))
+            por_casa[cid].append(item)
+            casas.add(cid)
+            if pid is not None:
+                por_pieza[pid].append(item)
+
+        if casa_id is None:
+            self._por_pieza.clear()
+            self._por_casa.clear()
+        else:
+            for pid in [p for p, (c, _, _) in self._piezas.items() if c == casa_id]:
+                self._por_pieza.pop(pid, None)
+            self._por_casa.pop(casa_id, None)
+        for pid, items in por_pieza.items():
+            self._por_pieza[pid] = IntervalIndex(items, weight=_personas)
+        for cid, items in por_casa.items():
+            self._por_casa[cid] = IntervalIndex(items, weight=_personas)
+        self._cargadas |= casas
+        self._todo = self._todo or casa_id is None
+
+    def invalidate(self, casa_id: Optional[int] = None) -> None:
+        """Olvida lo indexado; se recarga a demanda en la próxima consulta."""
+        if casa_id is None:
+            self._cargadas.clear()
+            self._todo = False
+        else:
+            self._cargadas.discard(casa_id)
+            self._todo = False
+
+    # ---------- consultas ----------
+    def conflictos(self, pieza_id: int, inicio: datetime, fin: Optional[datetime] = None,
+                   excluir: Iterable[int] = ()) -> list[int]:
+        """Ids de asignaciones vigentes en la pieza que se solapan con [inicio, fin)."""
+        idx = self._index_pieza(pieza_id)
+        skip = set(excluir)
+        return [aid for _, _, (aid, _) in idx.overlaps(inicio, fin or ABIERTA) if aid not in skip]
+
+    def ocupacion(self, fecha: datetime, pieza_id: Optional[int] = None,
+                  casa_id: Optional[int] = None) -> int:
+        """Personas alojadas en la pieza (o en la casa completa) en `fecha`."""
+        if pieza_id is not None:
+            return self._index_pieza(pieza_id).count_at(fecha)
+        self._ensure(casa_id)
+        idx = self._por_casa.get(casa_id)
+        return idx.count_at(fecha) if idx else 0
+
+    def capacidad(self, pieza_id: int) -> int:
+        info = self.info_pieza(pieza_id)
+        return info[1] if info else 0
+
+    def info_pieza(self, pieza_id: int) -> Optional[tuple[int, int, bool]]:
+        """(casa_id, capacidad, baño privado) o None si la pieza no existe."""
+        self._ensure_pieza(pieza_id)
+        return self._piezas.get(pieza_id)
+
+    def capacidad_libre(self, pieza_id: int, inicio: datetime, fin: Optional[datetime] = None) -> int:
+        """Camas libres en la pieza durante TODO el rango (capacidad - peak de ocupación)."""
+        peak = self._index_pieza(pieza_id).peak(inicio, fin or ABIERTA)
+        return max(0, self.capacidad(pieza_id) - peak)
+
+    def piezas_libres(self, inicio: datetime, fin: Optional[datetime] = None, personas: int = 1,
+                      casa_id: Optional[int] = None,
+                      bano_privado: Optional[bool] = None) -> list[tuple[int, int]]:
+        """
+        [(pieza_id, camas_libres)] con al menos `personas` camas libres en el rango,
+        de más a menos holgura. Filtra por casa y/o baño privado si se indica.
+        """
+        if casa_id is not None:
+            self._ensure(casa_id)
+        elif not self._todo:
+            self.load()
+        out = []
+        for pid, (cid, cap, privado) in self._piezas.items():
+            if casa_id is not None and cid != casa_id:
+                continue
+            if bano_privado is not None and privado != bano_privado:
+                continue
+            libre = self.capacidad_libre(pid, inicio, fin)
+            if libre >= personas:
+                out.append((pid, libre))
+        out.sort(key=lambda t: (-t[1], t[0]))
+        return out
+
+    # ---------- internos ----------
+    def _ensure(self, casa_id: Optional[int]) -> None:
+        if casa_id is not None and casa_id not in self._cargadas:
+            self.load(casa_id)
+
+    def _ensure_pieza(self, pieza_id: int) -> None:
+        info = self._piezas.get(pieza_id)
+        if info is None:
+            cid = (Pieza.select(Pieza.casa).where(Pieza.id == pieza_id).scalar())
+            if cid is not None:
+                self.load(cid)
+        elif info[0] not in self._cargadas:
+            self.load(info[0])
+
+    def _index_pieza(self, pieza_id: int) -> IntervalIndex:
+        self._ensure_pieza(pieza_id)
+        return self._por_pieza.get(pieza_id) or _VACIO
+
+
+_VACIO = IntervalIndex()
+
+
+def _personas(item) -> int:
+    return item[2][1]
@@ -0,0 +1,309 @@
+# domain/services/hospedado_import_service.py
+from __future__ import annotations
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from peewee import chunked
+from core.db import db, Hospedado, Familiar
+from core.events import emit, INSERTED, RESET
+from domain.dtos.batch import ColumnBatch
+from domain.dtos.hospedado_dto import HospedadoDTO
+from domain.services.hospedado_service import HospedadoService
+from utils.validators import format_rut, is_valid_rut, split_rut
+
+# -------------------------------------------------------------------
+# Formato del archivo (CSV o XLSX, primera fila = encabezados):
+#   - fila de hospedado: rut, nombre_completo, correo, telefono, edad, sexo
+#   - fila de familiar:  rut_titular, nombre, relacion, edad, sexo
+#     (el titular puede venir en el archivo, antes o después, o estar ya
+#     en la base: reimportar la nómina actualizada agrega solo lo nuevo)
+# -------------------------------------------------------------------
+HEADER_ALIASES = {
+    "nombre completo": "nombre_completo",
+    "rut titular": "rut_titular",
+    "titular": "rut_titular",
+    "email": "correo",
+    "fono": "telefono",
+    "teléfono": "telefono",
+    "relación": "relacion",
+}
+
+SEXO_ALIASES = {"h": "Hombre", "m": "Mujer", "hombre": "Hombre", "mujer": "Mujer"}
+
+# lotes columnares (domain.dtos.batch) en vez de un dict por fila;
+# el orden de los campos es el de insert_many(..., fields=...)
+GUEST_SCHEMA = (
+    ("nombre_completo", "str"), ("rut", "str"), ("rut_num", "int"), ("rut_dv", "str"),
+    ("correo", "str"), ("telefono", "str"), ("edad", "int"), ("sexo", "str"),
+    ("viene_con_familia", "bool"), ("created_at", "obj"), ("updated_at", "obj"),
+)
+FAMILY_SCHEMA = (
+    ("hospedado", "int"), ("nombre", "str"), ("edad", "int"), ("sexo", "str"),
+    ("relacion", "str"), ("created_at", "obj"), ("updated_at", "obj"),
+)
+GUEST_FIELDS = [getattr(Hospedado, name) for name, _ in GUEST_SCHEMA]
+FAMILY_FIELDS = [getattr(Familiar, name) for name, _ in FAMILY_SCHEMA]
+
+
+@dataclass
+class ImportReport:
+    leidas: int = 0
+    hospedados: int = 0
+    familiares: int = 0
+    rechazos: list[tuple[int, str, str]] = field(default_factory=list)  # (línea, rut, motivo)
+
+    def reject(self, line: int, rut: str, motivo: str):
+        self.rechazos.append((line, rut, motivo))
+
+
+def _norm_header(h) -> str:
+    h = str(h or "").strip().lower()
+    return HEADER_ALIASES.get(h, h.replace(" ", "_"))
+
+
+def _iter_csv(path: Path) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(fh, dialect)
+        headers = [_norm_header(h) for h in next(reader, [])]
+        for row in reader:
+            yield dict(zip(headers, row))
+
+
+def _iter_xlsx(path: Path) -> Iterator[dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise RuntimeError("Para importar .xlsx instala openpyxl (pip install openpyxl).") from e
+    wb = load_workbook(path, read_only=True, data_only=True)  # lectura en streaming
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        headers = [_norm_header(h) for h in next(rows, ())]
+        for row in rows:
+            yield {k: ("" if v is None else str(v)) for k, v in zip(headers, row)}
+    finally:
+        wb.close()
+
+
+def iter_roster(path) -> Iterator[dict]:
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        return _iter_xlsx(path)
+    return _iter_csv(path)
+
+
+class HospedadoImportService:
+    """
+    Importa nóminas de hospedados (+ familiares) sin cargar el archivo completo:
+    lee por lotes, valida con HospedadoService, descarta RUTs repetidos
+    (por rut_num, en el archivo o ya existentes en DB) e inserta cada lote
+    con insert_many dentro de una transacción. Los familiares se cuelgan del
+    titular por rut_num (creado en este archivo o ya en la base; uno por
+    nombre) y los que llegan antes que su titular se reintentan al final.
+    """
+    BATCH_SIZE = 500
+    INSERT_CHUNK = 100  # filas por INSERT (límite de variables de SQLite)
+
+    def __init__(self, service: Optional[HospedadoService] = None):
+        self.service = service or HospedadoService()
+
+    def import_file(self, path, on_progress: Optional[Callable[[ImportReport], bool]] = None) -> ImportReport:
+        return self.import_rows(iter_roster(path), on_progress)
+
+    def import_rows(self, rows: Iterable[dict],
+                    on_progress: Optional[Callable[[ImportReport], bool]] = None) -> ImportReport:
+        """
+        on_progress(report) se llama tras cada lote; si devuelve False se detiene
+        (los lotes ya confirmados quedan guardados).
+        """
+        report = ImportReport()
+        seen: set[int] = set()          # rut_num ya vistos en este archivo
+        known: dict[int, int] = {}      # rut_num -> id de titulares (creados aquí o ya en la base)
+        pending: list = []              # familiares cuyo titular aún no aparece
+        line = 1                        # línea 1 = encabezados
+        it = iter(rows)
+        while True:
+            batch = list(islice(it, self.BATCH_SIZE))
+            if not batch:
+                break
+            numbered = list(enumerate(batch, start=line + 1))
+            line += len(batch)
+            report.leidas += len(batch)
+            self._import_batch(numbered, report, seen, known, pending)
+            if on_progress and on_progress(report) is False:
+                return report
+        if pending:
+            with db.atomic():
+                fam_rows = self._insert_family(pending, report, known, datetime.now())
+            if fam_rows:
+                emit("familiar", RESET)
+        return report
+
+    # ---------- internos ----------
+    def _import_batch(self, numbered, report: ImportReport, seen: set, known: dict, pending: list):
+        guests, family = [], []
+        for n, raw in numbered:
+            if (raw.get("rut") or "").strip():
+                guests.append((n, raw))
+            elif (raw.get("rut_titular") or "").strip():
+                family.append((n, raw))
+            else:
+                report.reject(n, "", "Fila sin RUT ni RUT titular.")
+
+        new_rows = self._validate_guests(guests, report, seen)
+        now = datetime.now()
+        new_ids, fam_rows = [], ()
+        with db.atomic():
+            if new_rows:
+                for chunk in new_rows.chunks(self.INSERT_CHUNK):
+                    Hospedado.insert_many(chunk, fields=GUEST_FIELDS).execute()
+                nums = new_rows.column("rut_num")
+                for chunk in chunked(nums, self.INSERT_CHUNK):
+                    q = Hospedado.select(Hospedado.id, Hospedado.rut_num).where(Hospedado.rut_num.in_(chunk))
+                    for id_, num in q.tuples():
+                        known[num] = id_
+                        new_ids.append(id_)
+                report.hospedados += len(new_rows)
+
+            fam_rows = self._insert_family(family, report, known, now, pending)
+        # insert_many no pasa por BaseModel.save(): avisar a las vistas por lote
+        if new_ids:
+            emit("hospedado", INSERTED, new_ids)
+        if fam_rows:
+            emit("familiar", RESET)
+
+    def _insert_family(self, family, report: ImportReport, known: dict, now,
+                       defer: Optional[list] = None) -> ColumnBatch:
+        fam_rows = self._validate_family(family, report, known, now, defer)
+        if fam_rows:
+            for chunk in fam_rows.chunks(self.INSERT_CHUNK):
+                Familiar.insert_many(chunk, fields=FAMILY_FIELDS).execute()
+            titulares = list(set(fam_rows.column("hospedado")))
+            for chunk in chunked(titulares, self.INSERT_CHUNK):
+                (Hospedado.update(viene_con_familia=True, updated_at=now)
+                          .where(Hospedado.id.in_(chunk)).execute())
+            report.familiares += len(fam_rows)
+        return fam_rows
+
+    def _validate_guests(self, guests, report: ImportReport, seen: set) -> ColumnBatch:
+        candidates = []
+        for n, raw in guests:
+            rut = format_rut(raw.get("rut", ""))
+            dto = HospedadoDTO(
+                id=None,
+                nombre_completo=(raw.get("nombre_completo") or raw.get("nombre") or "").strip(),
+                rut=rut,
+                correo=(raw.get("correo") or "").strip() or None,
+                telefono="".join(ch for ch in (raw.get("telefono") or "") if ch.isdigit()) or None,
+                edad=_parse_edad(raw.get("edad")),
+                sexo=SEXO_ALIASES.get((raw.get("sexo") or "hombre").strip().lower(), raw.get("sexo")),
+            )
+            errs = self.service.validate(dto)
+            if errs:
+                report.reject(n, rut, " ".join(errs))
+                continue
+            num, dv = split_rut(rut)
+            if num in seen:
+                report.reject(n, rut, "RUT repetido en el archivo.")
+                continue
+            seen.add(num)
+            candidates.append((n, num, dv, dto))
+
+        # una sola consulta por lote contra el índice único de rut_num
+        existing = set()
+        for chunk in chunked([num for _, num, _, _ in candidates], self.INSERT_CHUNK):
+            existing.update(r for (r,) in Hospedado.select(Hospedado.rut_num)
+                                                  .where(Hospedado.rut_num.in_(chunk)).tuples())
+        now = datetime.now()
+        out = ColumnBatch(GUEST_SCHEMA)
+        for n, num, dv, dto in candidates:
+            if num in existing:
+                report.reject(n, dto.rut, "Ya existe un hospedado con ese RUT.")
+                continue
+            out.append((dto.nombre_completo, dto.rut, num, dv, dto.correo, dto.telefono,
+                        dto.edad, dto.sexo, False, now, now))
+        return out
+
+    def _validate_family(self, family, report: ImportReport, known: dict, now,
+                         defer: Optional[list] = None) -> ColumnBatch:
+        """
+        Valida familiares contra sus titulares (known, completado desde la base
+        con una consulta por lote). Sin titular: a `defer` si se pasa (se
+        reintenta al final del archivo), si no, rechazo.
+        """
+        parsed = []
+        for n, raw in family:
+            titular = format_rut(raw.get("rut_titular", ""))
+            if not is_valid_rut(titular):
+                report.reject(n, titular, "RUT titular inválido.")
+                continue
+            parsed.append((n, raw, titular, split_rut(titular)[0]))
+
+        # titulares que ya estaban en la base (p.ej. al reimportar la nómina)
+        missing = list({num for *_, num in parsed if num not in known})
+        for chunk in chunked(missing, self.INSERT_CHUNK):
+            known.update((num, id_) for id_, num in Hospedado.select(Hospedado.id, Hospedado.rut_num)
+                                                            .where(Hospedado.rut_num.in_(chunk)).tuples())
+        # familiares ya registrados de esos titulares: no duplicar al reimportar
+        titulares = list({known[num] for *_, num in parsed if num in known})
+        registered = set()
+        for chunk in chunked(titulares, self.INSERT_CHUNK):
+            registered.update((h, nombre.casefold()) for h, nombre in
+                              Familiar.select(Familiar.hospedado, Familiar.nombre)
+                                      .where(Familiar.hospedado.in_(chunk)).tuples())
+
+        out = ColumnBatch(FAMILY_SCHEMA)
+        for n, raw, titular, num in parsed:
+            if num not in known:
+                if defer is not None:
+                    defer.append((n, raw))
+                else:
+                    report.reject(n, titular, "Titular no encontrado (ni en el archivo ni en la base).")
+                continue
+            nombre = (raw.get("nombre") or raw.get("nombre_completo") or "").strip()
+            if not nombre:
+                report.reject(n, titular, "El nombre del familiar es obligatorio.")
+                continue
+            edad = _parse_edad(raw.get("edad"))
+            if edad is not None and not (0 <= edad <= 120):
+                report.reject(n, titular, "La edad debe estar entre 0 y 120.")
+                continue
+            sexo = SEXO_ALIASES.get((raw.get("sexo") or "hombre").strip().lower())
+            if not sexo:
+                report.reject(n, titular, "Sexo inválido.")
+                continue
+            key = (known[num], nombre.casefold())
+            if key in registered:
+                report.reject(n, titular, "Familiar ya registrado para ese titular.")
+                continue
+            registered.add(key)
+            out.append((known[num], nombre, edad, sexo,
+                        (raw.get("relacion") or "").strip() or None, now, now))
+        return out
+
+
+def _parse_edad(v) -> Optional[int]:
+    s = str(v or "").strip()
+    if not s:
+        return None
+    try:
+        return int(float(s))
+    except ValueError:
+        return -1  # fuerza el error de rango en la validación
+
+
+def write_rejects(report: ImportReport, path) -> None:
+    """Guarda los rechazos en CSV (línea, rut, motivo) para corregir y reintentar."""
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(["linea", "rut", "motivo"])
+        w.writerows(report.rechazos)
@@ -0,0 +1,293 @@
+# domain/services/sync_service.py
+from __future__ import annotations
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from peewee import ForeignKeyField, IntegrityError, chunked
+from core import db as dbmod
+from core.changelog import get_meta, node_id, set_meta
+from core.events import emit, RESET
+
+FORMAT = 1
+# Claves naturales: si llega un gid desconocido y ya existe una fila local
+# con el mismo valor, es la misma entidad creada en dos equipos (se fusiona).
+# El RUT se compara por rut_num (RutMixin.rut_key), no por el texto: cada
+# equipo puede haberlo escrito con o sin puntos.
+NATURAL_KEYS = {"anfitrion": "rut", "hospedado": "rut"}
+
+
+@dataclass
+class SyncReport:
+    enviados: int = 0     # cambios locales subidos
+    recibidos: int = 0    # cambios remotos leídos
+    aplicados: int = 0    # cambios remotos que ganaron y se aplicaron
+    conflictos: int = 0   # cambios remotos que perdieron contra la versión local
+    omitidos: int = 0     # remotos que no se pudieron aplicar (FK ausente, RUT duplicado)
+
+    def resumen(self) -> str:
+        return (f"Enviados: {self.enviados}\nRecibidos: {self.recibidos}\n"
+                f"Aplicados: {self.aplicados}\nConflictos (ganó lo local): {self.conflictos}\n"
+                f"Omitidos: {self.omitidos}")
+
+
+class _Table:
+    """Columnas sincronizables de un modelo (sin id) y sus FKs -> tabla destino."""
+    def __init__(self, model):
+        meta = model._meta
+        self.name = meta.table_name
+        fields = [f for f in meta.sorted_fields if not f.primary_key]
+        self.cols = [f.column_name for f in fields]
+        self.fks = {f.column_name: f.rel_model._meta.table_name
+                    for f in fields if isinstance(f, ForeignKeyField)}
+
+
+class SyncService:
+    """
+    Sincronización offline-first por deltas:
+    - export_delta(): solo filas con cambio local posterior a la marca de agua
+      (push_seq), como lote JSON compacto comprimido con zlib; las filas y
+      sus FKs viajan como ids globales (gid, ver core.changelog) porque los
+      ids locales chocan entre equipos. Las bajas viajan como tombstones.
+    - import_delta(): aplica un lote en una transacción con los triggers de
+      la bitácora apagados. Conflictos: gana el mayor (versión, updated_at,
+      nodo); todos los equipos deciden igual y convergen.
+    - sync(): pull de lotes ajenos desde pull_seq, luego push de lo local.
+    """
+    def __init__(self, server, database=None, models=None):
+        self.server = server
+        self.db = database or dbmod.db
+        self.tables = [_Table(m) for m in (models or dbmod.ALL_MODELS)]
+        self._by_name = {t.name: t for t in self.tables}
+
+    # ---------- API ----------
+    def sync(self) -> SyncReport:
+        report = SyncReport()
+        me = node_id(self.db)
+        since = int(get_meta(self.db, "pull_seq", "0"))
+        for seq, blob in self.server.pull(me, since):
+            self.import_delta(blob, report, pull_seq=seq)
+        blob, upto, n = self.export_delta()
+        if blob is not None:
+            self.server.push(me, blob)
+            with self.db.atomic():
+                set_meta(self.db, "push_seq", upto)
+            report.enviados = n
+        return report
+
+    def export_delta(self) -> tuple[Optional[bytes], int, int]:
+        """(lote comprimido o None, seq hasta donde llega, cantidad de cambios)."""
+        me = node_id(self.db)
+        since = int(get_meta(self.db, "push_seq", "0"))
+        changes = self.db.execute_sql(
+            """SELECT tbl, row_id, gid, version, deleted, updated_at, seq FROM sync_row
+               WHERE origin = ? AND seq > ? ORDER BY seq""", (me, since)).fetchall()
+        if not changes:
+            return None, since, 0
+
+        by_table: dict[str, list] = {}
+        for ch in changes:
+            if ch[0] in self._by_name:
+                by_table.setdefault(ch[0], []).append(ch)
+
+        payload = {"format": FORMAT, "node": me, "tables": {}}
+        for name, rows in by_table.items():
+            t = self._by_name[name]
+            live = self._fetch(t, [r[1] for r in rows if not r[4]])
+            gids = self._gids_for_fks(t, live.values())
+            out = []
+            for _tbl, row_id, gid, version, deleted, updated_at, _seq in rows:
+                vals = live.get(row_id)
+                if deleted or vals is None:  # borrada (o cascada mientras se importaba)
+                    out.append([gid, version, updated_at, 1])
+                    continue
+                vals = [gids.get((t.fks[c], v)) if c in t.fks and v is not None else v
+                        for c, v in zip(t.cols, vals)]
+                out.append([gid, version, updated_at, 0, *vals])
+            payload["tables"][name] = {"cols": t.cols, "rows": out}
+
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+        return zlib.compress(raw.encode("utf-8"), 9), changes[-1][6], len(changes)
+
+    def import_delta(self, blob: bytes, report: Optional[SyncReport] = None,
+                     pull_seq: Optional[int] = None) -> SyncReport:
+        report = report or SyncReport()
+        payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+        if payload.get("format") != FORMAT:
+            raise ValueError(f"Formato de lote no soportado: {payload.get('format')}")
+        origin = payload["node"]
+        tables = payload["tables"]
+        aplicados_antes = report.aplicados
+        with self.db.atomic():
+            set_meta(self.db, "applying", "1")
+            try:
+                # altas/cambios de padres a hijos; bajas de hijos a padres
+                for t in self.tables:
+                    block = tables.get(t.name)
+                    if block:
+                        for row in block["rows"]:
+                            if not row[3]:
+                                self._apply(t, block["cols"], row, origin, report)
+                for t in reversed(self.tables):
+                    block = tables.get(t.name)
+                    if block:
+                        for row in block["rows"]:
+                            if row[3]:
+                                self._apply(t, block["cols"], row, origin, report)
+                if pull_seq is not None:
+                    set_meta(self.db, "pull_seq", pull_seq)
+            finally:
+                set_meta(self.db, "applying", "0")
+        if report.aplicados > aplicados_antes:
+            # el SQL crudo no pasa por BaseModel: las vistas recargan lo que llegó
+            for name in tables:
+                emit(name, RESET)
+        return report
+
+    # ---------- internos: export ----------
+    def _fetch(self, t: _Table, ids: list[int]) -> dict[int, tuple]:
+        out = {}
+        cols = ", ".join(f'"{c}"' for c in t.cols)
+        for chunk in chunked(ids, 500):
+            marks = ", ".join("?" * len(chunk))
+            for row in self.db.execute_sql(
+                    f'SELECT id, {cols} FROM "{t.name}" WHERE id IN ({marks})', chunk):
+                out[row[0]] = row[1:]
+        return out
+
+    def _gids_for_fks(self, t: _Table, rows) -> dict[tuple[str, int], str]:
+        wanted: dict[str, set] = {}
+        for vals in rows:
+            for c, v in zip(t.cols, vals):
+                if c in t.fks and v is not None:
+                    wanted.setdefault(t.fks[c], set()).add(v)
+        out = {}
+        for target, ids in wanted.items():
+            for chunk in chunked(list(ids), 500):
+                marks = ", ".join("?" * len(chunk))
+                for row_id, gid in self.db.execute_sql(
+                        f"SELECT row_id, gid FROM sync_row "
+                        f"WHERE tbl = ? AND deleted = 0 AND row_id IN ({marks})",
+                        [target, *chunk]):
+                    out[(target, row_id)] = gid
+        return out
+
+    # ---------- internos: import ----------
+    def _apply(self, t: _Table, cols: list[str], row: list, origin: str, report: SyncReport):
+        report.recibidos += 1
+        gid, version, updated_at, deleted = row[:4]
+        incoming = (version, updated_at or "", origin)
+
+        rec = self._record(t.name, gid)
+        if rec is None and not deleted:
+            match = self._match_natural(t, cols, row[4:])
+            if match is not None:
+                self.db.execute_sql("INSERT OR REPLACE INTO sync_map (tbl, gid, row_id) VALUES (?, ?, ?)",
+                                    (t.name, gid, match))
+                rec = self._record(t.name, gid)
+        if rec is None and deleted:
+            return  # nunca la tuvimos
+        key, local_id = None, None
+        if rec is not None:
+            key, local_id, gone, current = rec
+            if current >= incoming:
+                report.conflictos += 1
+                return
+            if gone:
+                local_id = None  # borrada aquí, pero el cambio remoto es posterior: vuelve
+
+        values = None
+        if not deleted:
+            values = self._translate(t, cols, row[4:])
+            if values is None:
+                report.omitidos += 1
+                return
+        try:
+            with self.db.atomic():  # savepoint: un choque no tumba el lote
+                if deleted:
+                    if local_id is not None:
+                        self.db.execute_sql(f'DELETE FROM "{t.name}" WHERE id = ?', (local_id,))
+                        self.db.execute_sql("DELETE FROM sync_map WHERE tbl = ? AND row_id = ?",
+                                            (t.name, local_id))
+                elif local_id is not None and self._exists(t, local_id):
+                    sets = ", ".join(f'"{c}" = ?' for c in values)
+                    self.db.execute_sql(f'UPDATE "{t.name}" SET {sets} WHERE id = ?',
+                                        [*values.values(), local_id])
+                else:
+                    names = ", ".join(f'"{c}"' for c in values)
+                    marks = ", ".join("?" * len(values))
+                    cur = self.db.execute_sql(f'INSERT INTO "{t.name}" ({names}) VALUES ({marks})',
+                                              list(values.values()))
+                    local_id = cur.lastrowid
+                    # si el id es reusado, la fila viva anterior (borrada en cascada) es tombstone
+                    self.db.execute_sql(
+                        "UPDATE sync_row SET deleted = 1 WHERE tbl = ? AND row_id = ? AND deleted = 0",
+                        (t.name, local_id))
+                if key is None:
+                    self.db.execute_sql(
+                        """INSERT INTO sync_row (tbl, gid, row_id, version, origin, deleted, seq, updated_at)
+                           VALUES (?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM sync_row), ?)""",
+                        (t.name, gid, local_id, version, origin, int(bool(deleted)), updated_at))
+                else:
+                    self.db.execute_sql(
+                        """UPDATE sync_row SET row_id = COALESCE(?, row_id), version = ?, origin = ?,
+                               deleted = ?, seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM sync_row),
+                               updated_at = ?
+                           WHERE tbl = ? AND gid = ?""",
+                        (local_id, version, origin, int(bool(deleted)), updated_at, t.name, key))
+        except IntegrityError:
+            report.omitidos += 1
+            return
+        report.aplicados += 1
+
+    def _record(self, tbl: str, gid: str) -> Optional[tuple[str, int, bool, tuple]]:
+        """
+        Registro local de un gid en `tbl` (directo o vía alias de sync_map):
+        (gid local, fila local, borrada, (versión, updated_at, nodo)) o None.
+        """
+        cols = "gid, row_id, deleted, version, updated_at, origin"
+        row = self.db.execute_sql(f"SELECT {cols} FROM sync_row WHERE tbl = ? AND gid = ?",
+                                  (tbl, gid)).fetchone()
+        if row is None:
+            alias = self.db.execute_sql("SELECT row_id FROM sync_map WHERE tbl = ? AND gid = ?",
+                                        (tbl, gid)).fetchone()
+            if alias is None:
+                return None
+            row = self.db.execute_sql(
+                f"SELECT {cols} FROM sync_row WHERE tbl = ? AND row_id = ? AND deleted = 0",
+                (tbl, alias[0])).fetchone()
+            if row is None:
+                return None
+        return row[0], row[1], bool(row[2]), (row[3], row[4] or "", row[5])
+
+    def _local_id(self, tbl: str, gid: str) -> Optional[int]:
+        """Fila local viva de un gid de `tbl` (None si no la hay)."""
+        rec = self._record(tbl, gid)
+        return rec[1] if rec is not None and not rec[2] else None
+
+    def _exists(self, t: _Table, row_id: int) -> bool:
+        return self.db.execute_sql(f'SELECT 1 FROM "{t.name}" WHERE id = ?', (row_id,)).fetchone() is not None
+
+    def _match_natural(self, t: _Table, cols: list[str], vals: list) -> Optional[int]:
+        key = NATURAL_KEYS.get(t.name)
+        if key is None or key not in cols:
+            return None
+        num = dbmod.MODELS[t.name].rut_key(vals[cols.index(key)] or "")
+        if num is None:
+            return None
+        row = self.db.execute_sql(f'SELECT id FROM "{t.name}" WHERE rut_num = ?', (num,)).fetchone()
+        return row[0] if row else None
+
+    def _translate(self, t: _Table, cols: list[str], vals: list) -> Optional[dict]:
+        """Solo columnas que existen aquí; FKs gid -> id local (None si falta el padre)."""
+        out = {}
+        for c, v in zip(cols, vals):
+            if c not in t.cols:
+                continue
+            if c in t.fks and v is not None:
+                v = self._local_id(t.fks[c], v)
+                if v is None:
+                    return None
+            out[c] = v
+        return out
@@ -1,32 +1,116 @@
 # main.py
+import os
 import sys
-from PyQt5.QtWidgets import QApplication
+import time
+
+_T0 = time.perf_counter()
 
 def main():
-    # 1) Inicializa la base de datos (crea archivo y tablas si no existen)
-    from core.db import init_db, close_db, DB_PATH
+    profile = "--profile-startup" in sys.argv
+    # perfilador de SQL + panel de diagnóstico (Ctrl+Shift+D); opcional
+    profile_sql = "--profile-sql" in sys.argv or os.environ.get("MINSHUKU_PROFILE_SQL") == "1"
+    # vigilante de bloqueos de la GUI: activo salvo --no-watchdog / MINSHUKU_WATCHDOG=0
+    watch_stalls = "--no-watchdog" not in sys.argv and os.environ.get("MINSHUKU_WATCHDOG") != "0"
+    argv = [a for a in sys.argv if a not in ("--profile-startup", "--profile-sql", "--no-watchdog")]
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from core.startup import StartupProfiler, FirstPaintWatcher
+    prof = StartupProfiler(enabled=profile, t0=_T0)
+    prof.mark("imports Qt")
+
+    # 1) Solo abre la conexión: el esquema se revisa después del primer pintado
+    from core.db import connect_db, close_db, DB_PATH
+    if profile_sql:
+        from core import sql_profiler
+        sql_profiler.install()  # antes de conectar: incluye las consultas del arranque
+    prof.mark("imports DB")
     try:
-        init_db(create_tables=True)
-        print(f"[DB] Lista en: {DB_PATH}")
+        connect_db()
     except Exception as e:
-        print(f"[DB] Error al inicializar: {e}")
+        print(f"[DB] Error al conectar: {e}")
+    prof.mark("DB connect")
 
     # 2) Crea la app de Qt
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
+    from ui.theme import apply_theme
+    apply_theme(app)  # un solo QSS para toda la app
+    if watch_stalls:
+        from core import stall_watchdog
+        stall_watchdog.install(float(os.environ.get("MINSHUKU_STALL_MS", 500)))
+    if profile_sql or watch_stalls:
+        from controllers.diagnostics_controller import DiagnosticsShortcut
+        app._diagnostics = DiagnosticsShortcut(app)
 
-    # 3) Importa vistas/controladores DESPUÉS de init_db
+    # 3) Solo lo necesario para el menú; los módulos se importan al abrirlos
     from ui.views.homeviews import HomeView
     from controllers.home_controller import HomeController
     from core.router import AppRouter
+    prof.mark("imports UI")
 
     view = HomeView()
-    view.showMaximized()
-
     router = AppRouter(parent=view)
     controller = HomeController(view, router)
+    prof.mark("home build")
+
+    def _on_first_paint():
+        prof.mark("first paint")
+        # en el próximo ciclo del event loop, cuando el pintado ya salió
+        QTimer.singleShot(0, _after_first_paint)
+
+    def _after_first_paint():
+        # migraciones bloqueantes en el hilo escritor, con el menú en espera:
+        # la ventana sigue respondiendo y ningún módulo se abre antes de tiempo
+        controller.prepare_schema(_after_schema)
+
+    def _after_schema():
+        print(f"[DB] Lista en: {DB_PATH}")
+        prof.mark("schema")
+        if profile:
+            print(prof.report())
+            app.quit()
+            return
+        # deja construido el módulo más probable mientras el usuario mira el menú
+        router.prewarm(delay_ms=300)
+        QTimer.singleShot(2000, _migrate_online)
+        _start_backups()
+
+    def _start_backups():
+        # respaldos en caliente cada BACKUP_HOURS horas (0 = desactivado)
+        from core.settings import BACKUP_HOURS
+        if BACKUP_HOURS <= 0:
+            return
+        from core.backup_scheduler import BackupScheduler
+        app._backups = BackupScheduler(parent=app).start()
+        app._backups.failed.connect(lambda msg: print(f"[backup] Falló el respaldo: {msg}"))
+
+    def _migrate_online():
+        # migraciones online (índices, rellenos): de a una unidad por tarea del
+        # escritor, así lo que guarde el usuario se intercala entre unidades
+        from core.db import db
+        from core.db_executor import executor
+        from core.migrations import migration_step
+        executor().serial(migration_step, db).then(
+            lambda more: more and QTimer.singleShot(0, _migrate_online),
+            lambda e: print(f"[DB] Migración pendiente (se reintenta al reiniciar): {e}"))
+
+    FirstPaintWatcher(view, _on_first_paint)
+    view.showMaximized()
 
-    # 4) Ejecuta y cierra DB al salir
+    # 4) Ejecuta; al salir espera al ejecutor de DB y cierra
     exit_code = app.exec_()
+    if getattr(app, "_backups", None) is not None:
+        app._backups.stop()  # cancela un respaldo a medias (no deja archivos)
+    from core.db_executor import shutdown_executor
+    shutdown_executor()  # termina escrituras en curso antes de cerrar
+    if profile_sql:
+        print(f"[sql] Perfil guardado en: {sql_profiler.profiler().dump_json()}")
+    if watch_stalls:
+        wd = stall_watchdog.watchdog()
+        wd.stop()
+        if wd.stalls():
+            print(wd.report())
+            print(f"[stall] Detalle en: {wd.dump_json()}")
     close_db()
     sys.exit(exit_code)
 
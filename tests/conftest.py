@@ -0,0 +1,18 @@
+# tests/conftest.py
+import pytest
+
+import core.db as cdb
+from core.db import db
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """core.db.db apuntando a una base nueva en tmp_path (vuelve a la original al final)."""
+    original = db.database
+    cdb.close_db()
+    db.init(str(tmp_path / "test.sqlite"), pragmas=db._pragmas)
+    cdb.ensure_schema()
+    yield db
+    cdb.close_db()
+    db.init(original, pragmas=db._pragmas)
+    cdb._schema_ready = None
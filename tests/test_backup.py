@@ -0,0 +1,117 @@
+# tests/test_backup.py
+import gzip
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from core.backup import STALE_PART_S, BackupCancelled, BackupService
+
+# -------------------------------------------------------------------
+# Respaldos sobre una base temporal: cancelar a mitad no deja archivos,
+# la retención guarda lo que promete (y limpia temporales huérfanos) y
+# restaurar devuelve los datos de la foto con un id de nodo nuevo.
+# -------------------------------------------------------------------
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "app.sqlite"
+    con = sqlite3.connect(str(path), isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, payload TEXT)")
+    con.execute("INSERT INTO item (payload) SELECT hex(randomblob(500)) FROM "
+                "(WITH RECURSIVE c(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM c WHERE i < 2000) "
+                "SELECT i FROM c)")
+    con.close()
+    return path
+
+
+class _CancelWhileCompressing:
+    """Se da por cancelado apenas existe el .gz.part (o sea, ya en gzip)."""
+    def __init__(self, dest):
+        self.dest = dest
+
+    def is_set(self):
+        return any(self.dest.glob("*.gz.part"))
+
+
+def test_cancelar_durante_compresion_no_deja_archivos(tmp_path, source, monkeypatch):
+    monkeypatch.setattr("core.backup.CHUNK", 4096)
+    dest = tmp_path / "backups"
+    with pytest.raises(BackupCancelled):
+        BackupService(source, dest, pages=16).snapshot(cancel=_CancelWhileCompressing(dest))
+    assert list(dest.iterdir()) == []
+
+
+def test_prune_borra_temporales_huerfanos(tmp_path, source):
+    dest = tmp_path / "backups"
+    service = BackupService(source, dest, pages=16)
+    snap = service.snapshot()
+    old = time.time() - STALE_PART_S - 60
+    stale = [dest / ".minshuku-20260101-000000.sqlite.part",
+             dest / "minshuku-20260101-000000.sqlite.gz.part"]
+    fresh = dest / ".minshuku-20260102-000000.sqlite.part"   # de un respaldo en curso
+    for path in stale + [fresh]:
+        path.write_bytes(b"x")
+    for path in stale:
+        os.utime(path, (old, old))
+    assert sorted(service.prune()) == sorted(stale)
+    assert sorted(dest.iterdir()) == sorted([snap.path, fresh])
+
+
+def _rows(path):
+    con = sqlite3.connect(str(path))
+    try:
+        return con.execute("SELECT COUNT(*) FROM item").fetchone()[0]
+    finally:
+        con.close()
+
+
+def _rows_gz(path, tmp_path):
+    plain = tmp_path / "check.sqlite"
+    plain.write_bytes(gzip.decompress(path.read_bytes()))
+    return _rows(plain)
+
+
+def test_retencion_ultimos_y_uno_por_dia(tmp_path, source):
+    dest = tmp_path / "backups"
+    dest.mkdir()
+    stamps = ["20260110-180000", "20260110-120000", "20260110-080000",
+              "20260109-200000", "20260109-090000", "20260108-100000", "20260105-100000"]
+    for stamp in stamps:
+        (dest / f"minshuku-{stamp}.sqlite.gz").write_bytes(b"x")
+    service = BackupService(source, dest, keep_last=2, keep_daily=3)
+    removed = service.prune(now=datetime(2026, 1, 10, 19, 0))
+    # los 2 últimos + el último de cada día dentro de 3 días; el resto se borra
+    assert sorted(p.name for p in removed) == [
+        "minshuku-20260105-100000.sqlite.gz", "minshuku-20260109-090000.sqlite.gz",
+        "minshuku-20260110-080000.sqlite.gz"]
+    assert [s.path.name[9:24] for s in service.snapshots()] == [
+        "20260110-180000", "20260110-120000", "20260109-200000", "20260108-100000"]
+
+
+def test_restaurar_vuelve_a_la_foto_con_nodo_nuevo(tmp_path, source):
+    con = sqlite3.connect(str(source), isolation_level=None)
+    con.execute("CREATE TABLE sync_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    con.execute("INSERT INTO sync_meta VALUES ('node', 'nodo-viejo'), ('pull_seq', '7')")
+    con.close()
+    dest = tmp_path / "backups"
+    service = BackupService(source, dest, pages=16)
+    snap = service.snapshot("foto")
+
+    con = sqlite3.connect(str(source), isolation_level=None)
+    con.execute("DELETE FROM item WHERE id > 1000")
+    con.close()
+    assert _rows(source) == 1000
+
+    safety = service.restore(snap.path)
+    assert _rows(source) == 2000
+    assert safety is not None and safety.label == "antes-de-restaurar"
+    assert _rows_gz(safety.path, tmp_path) == 1000   # lo anterior quedó respaldado
+    con = sqlite3.connect(str(source))
+    meta = dict(con.execute("SELECT key, value FROM sync_meta").fetchall())
+    con.close()
+    assert meta["pull_seq"] == "7" and meta["node"] not in ("", "nodo-viejo")
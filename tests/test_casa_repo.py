@@ -0,0 +1,81 @@
+# tests/test_casa_repo.py
+import pytest
+
+import core.db as cdb
+from core.db import db, Anfitrion, Casa, Habitacion, Cama, Bano, Hospedado, Familiar
+from core.sql_profiler import SqlProfiler
+from domain.repositories.anfitrion_repo import AnfitrionRepository
+from domain.repositories.casa_repo import CasaRepository
+from domain.repositories.familiar_repo import FamiliarRepository
+from utils.validators import rut_dv
+
+# -------------------------------------------------------------------
+# Cantidad fija de consultas al cargar agregados (sin N+1): la cuenta no
+# debe crecer con la cantidad de habitaciones, camas o familiares.
+# Corre sobre una base temporal; db vuelve a su ruta original al final.
+# -------------------------------------------------------------------
+
+
+def _rut(num: int) -> str:
+    return f"{num}-{rut_dv(num)}"
+
+
+@pytest.fixture(scope="module")
+def seeded(tmp_path_factory):
+    original = db.database
+    cdb.close_db()
+    db.init(str(tmp_path_factory.mktemp("db") / "test.sqlite"), pragmas=db._pragmas)
+    cdb.ensure_schema()
+
+    host = Anfitrion.create(nombre_completo="Ana Pérez", rut=_rut(11111111))
+    casas = {}
+    for n_habs in (1, 20):
+        casa = Casa.create(direccion=f"Calle {n_habs}", anfitrion=host)
+        for _ in range(n_habs):
+            hab = Habitacion.create(casa=casa, capacidad=2)
+            Cama.create(habitacion=hab, tipo="Individual")
+            Cama.create(habitacion=hab, tipo="Matrimonial")
+        Bano.create(casa=casa, ubicacion="Pasillo")
+        casas[n_habs] = casa.id
+    guest = Hospedado.create(nombre_completo="Luis Soto", rut=_rut(22222222))
+    for i in range(5):
+        Familiar.create(hospedado=guest, nombre=f"Familiar {i}", relacion="Hijo/a")
+
+    yield {"rut": host.rut, "casas": casas, "hospedado": guest.id}
+
+    cdb.close_db()
+    db.init(original, pragmas=db._pragmas)
+    cdb._schema_ready = None
+
+
+def _count_queries(fn):
+    prof = SqlProfiler(db, log_path=None).install()
+    try:
+        result = fn()
+    finally:
+        prof.uninstall()
+    return prof.snapshot()["queries"], result
+
+
+@pytest.mark.parametrize("n_habs", [1, 20])
+def test_load_detalle_consultas_fijas(seeded, n_habs):
+    repo = CasaRepository()
+    repo.cache.clear()
+    queries, detalle = _count_queries(lambda: repo.load_detalle(seeded["casas"][n_habs]))
+    assert len(detalle["habs"]) == n_habs
+    assert all(len(h.camas) == 2 for h in detalle["habs"])
+    assert queries == 4
+
+
+def test_get_con_casas_dos_consultas(seeded):
+    repo = AnfitrionRepository()
+    repo.cache.clear()
+    queries, (host, casas) = _count_queries(lambda: repo.get_con_casas(seeded["rut"]))
+    assert host is not None and len(casas) == 2
+    assert queries == 2
+
+
+def test_list_for_hospedado_una_consulta(seeded):
+    queries, fams = _count_queries(lambda: FamiliarRepository().list_for_hospedado(seeded["hospedado"]))
+    assert len(fams) == 5
+    assert queries == 1
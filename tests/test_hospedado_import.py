@@ -0,0 +1,73 @@
+# tests/test_hospedado_import.py
+from core.db import Familiar, Hospedado
+from domain.services.hospedado_import_service import HospedadoImportService
+
+# -------------------------------------------------------------------
+# Importación de nóminas: RUTs repetidos (archivo y base), rechazos y
+# familiares colgados del titular aunque ya exista o venga después.
+# -------------------------------------------------------------------
+
+
+def _guest(rut, nombre="Luis Soto"):
+    return {"rut": rut, "nombre_completo": nombre, "sexo": "h", "edad": "40"}
+
+
+def _fam(rut_titular, nombre, relacion="Hijo/a"):
+    return {"rut_titular": rut_titular, "nombre": nombre, "relacion": relacion, "sexo": "m", "edad": "9"}
+
+
+def _motivos(report):
+    return [motivo for _, _, motivo in report.rechazos]
+
+
+def test_rut_repetido_en_archivo_y_en_base(temp_db):
+    svc = HospedadoImportService()
+    report = svc.import_rows([_guest("12.345.678-5"), _guest("12345678-5", "Otro")])
+    assert report.hospedados == 1
+    assert _motivos(report) == ["RUT repetido en el archivo."]
+
+    again = svc.import_rows([_guest("12345678-5")])
+    assert again.hospedados == 0
+    assert _motivos(again) == ["Ya existe un hospedado con ese RUT."]
+    assert Hospedado.select().count() == 1
+
+
+def test_rechazos(temp_db):
+    report = HospedadoImportService().import_rows([
+        _guest("12345678-0"),            # dígito verificador malo
+        {"nombre_completo": "Sin RUT"},
+        _fam("11111111-1", "Ana"),       # titular inexistente
+        _guest("12345678-5"),
+        _fam("12345678-5", ""),          # sin nombre
+        _fam("12345678-5", "Ana", ""),   # válida
+    ])
+    assert report.hospedados == 1 and report.familiares == 1
+    lineas = {linea for linea, _, _ in report.rechazos}
+    assert lineas == {2, 3, 4, 6}
+    assert "Titular no encontrado (ni en el archivo ni en la base)." in _motivos(report)
+
+
+def test_reimportar_agrega_familiares_de_titulares_existentes(temp_db):
+    svc = HospedadoImportService()
+    svc.import_rows([_guest("12345678-5"), _fam("12345678-5", "Ana")])
+    # nómina actualizada: el titular ya está, llega un familiar nuevo y uno repetido
+    report = svc.import_rows([_guest("12345678-5"), _fam("12.345.678-5", "Ana"), _fam("12345678-5", "Pedro")])
+    assert report.familiares == 1
+    assert "Familiar ya registrado para ese titular." in _motivos(report)
+    titular = Hospedado.get(Hospedado.rut_num == 12345678)
+    assert sorted(f.nombre for f in titular.familia) == ["Ana", "Pedro"]
+    assert titular.viene_con_familia
+
+
+def test_familiar_antes_que_su_titular(temp_db):
+    svc = HospedadoImportService()
+    svc.BATCH_SIZE = 2   # titular en otro lote, después del familiar
+    report = svc.import_rows([
+        _fam("12345678-5", "Ana"),
+        _guest("11111111-1", "Otro"),
+        _guest("22222222-2", "Otro más"),
+        _guest("12345678-5"),
+    ])
+    assert report.rechazos == []
+    assert report.familiares == 1
+    assert Familiar.get().hospedado.rut_num == 12345678
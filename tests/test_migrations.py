@@ -0,0 +1,90 @@
+# tests/test_migrations.py
+import pytest
+from peewee import SqliteDatabase
+
+from core.db import ALL_MODELS
+from core.migrations import Backfill, Migration, Migrator, Step, _rut_backfill, take_rut_merges
+
+# -------------------------------------------------------------------
+# Un relleno por lotes que se corta a mitad (la app se cerró, un error)
+# sigue desde el cursor guardado en schema_progress, sin repetir lotes.
+# El relleno de rut_num fusiona los RUT repetidos escritos distinto.
+# -------------------------------------------------------------------
+
+
+class _Corte(Exception):
+    pass
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "mig.sqlite"))
+    database.execute_sql("CREATE TABLE item (id INTEGER PRIMARY KEY, valor INTEGER, doble INTEGER)")
+    database.cursor().executemany("INSERT INTO item (valor) VALUES (?)", [(i,) for i in range(1, 11)])
+    yield database
+    database.close()
+
+
+def _migration(seen: list, fail_after: int = 0) -> Migration:
+    def apply(database, rows):
+        if fail_after and len(seen) >= fail_after:
+            raise _Corte()
+        seen.append([r[0] for r in rows])
+        database.cursor().executemany("UPDATE item SET doble = ? WHERE id = ?",
+                                      [(v * 2, id_) for id_, v in rows])
+
+    backfill = Backfill("item", "SELECT id, valor FROM item WHERE id > ? ORDER BY id LIMIT ?",
+                        apply, "doble de item", chunk=4)
+    return Migration(1, "doble", [backfill])
+
+
+def test_relleno_interrumpido_sigue_desde_el_cursor(database):
+    seen: list = []
+    with pytest.raises(_Corte):
+        Migrator(database, [_migration(seen, fail_after=1)]).run()
+    assert seen == [[1, 2, 3, 4]]
+    # el primer lote quedó guardado junto con su avance; el que falló, no
+    assert database.execute_sql(
+        "SELECT cursor, done FROM schema_progress WHERE version = 1 AND step = 0").fetchone() == (4, 0)
+    assert database.execute_sql("SELECT COUNT(*) FROM item WHERE doble IS NOT NULL").fetchone()[0] == 4
+
+    resumed: list = []
+    assert Migrator(database, [_migration(resumed)]).run() == 1
+    assert resumed == [[5, 6, 7, 8], [9, 10]]
+    assert database.execute_sql("SELECT COUNT(*) FROM item WHERE doble = valor * 2").fetchone()[0] == 10
+    assert database.execute_sql("SELECT COUNT(*) FROM schema_progress").fetchone()[0] == 0
+    assert Migrator(database, [_migration([])]).pending() == []
+
+
+def test_paso_sin_implementar_no_se_instancia():
+    class Incompleto(Step):
+        def describe(self, database, cursor):
+            return "incompleto"
+
+    with pytest.raises(TypeError):
+        Incompleto()
+
+
+def test_rut_repetido_se_fusiona_y_queda_registrado(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "rut.sqlite"), pragmas={"foreign_keys": 1})
+    with database.bind_ctx(ALL_MODELS):
+        database.create_tables(ALL_MODELS)
+    # filas heredadas (antes de rut_num): el mismo RUT con y sin puntos
+    cols = "(nombre_completo, rut, telefono, sexo, viene_con_familia, created_at, updated_at)"
+    database.execute_sql(f"INSERT INTO hospedado {cols} VALUES "
+                         "('Luis Soto', '12345678-5', NULL, 'Hombre', 1, '2026-01-01', '2026-01-01'), "
+                         "('Luis A. Soto', '12.345.678-5', '+56 9 1234 5678', 'Hombre', 1, "
+                         "'2026-02-01', '2026-02-01')")
+    database.execute_sql("INSERT INTO familiar (hospedado_id, nombre, sexo, created_at, updated_at) "
+                         "VALUES (2, 'Ana Soto', 'Mujer', '2026-02-01', '2026-02-01')")
+
+    assert Migrator(database, [Migration(1, "rut", [_rut_backfill("hospedado")])]).run() == 1
+
+    assert database.execute_sql("SELECT id, rut_num, telefono FROM hospedado").fetchall() == [
+        (1, 12345678, "+56 9 1234 5678")]   # el más antiguo, completado con lo del otro
+    assert database.execute_sql("SELECT hospedado_id FROM familiar").fetchall() == [(1,)]
+    merges = take_rut_merges(database)
+    assert [(t, rut, keep, lost["nombre_completo"]) for t, rut, keep, lost in merges] == [
+        ("hospedado", "12.345.678-5", 1, "Luis A. Soto")]
+    assert take_rut_merges(database) == []   # el aviso sale una sola vez
+    database.close()
@@ -0,0 +1,172 @@
+# tests/test_sync_service.py
+from contextlib import contextmanager
+
+import pytest
+from peewee import SqliteDatabase
+
+from core.changelog import ensure_change_log
+from core.db import ALL_MODELS, Anfitrion, Casa, Hospedado
+from core.sync_server import LocalSyncServer
+from domain.services.sync_service import SyncService
+from utils.validators import rut_dv
+
+# -------------------------------------------------------------------
+# Dos equipos (dos bases temporales) sincronizando por LocalSyncServer:
+# altas con FK, bajas (tombstones), ids reusados tras borrar, conflictos,
+# marcas de agua y fusión por RUT escrito distinto.
+# -------------------------------------------------------------------
+TABLES = [m._meta.table_name for m in ALL_MODELS]
+
+
+def _rut(num: int) -> str:
+    return f"{num}-{rut_dv(num)}"
+
+
+class _Node:
+    def __init__(self, path, server):
+        self.db = SqliteDatabase(str(path), pragmas={"foreign_keys": 1})
+        with self.use():
+            self.db.create_tables(ALL_MODELS)
+        ensure_change_log(self.db, TABLES)
+        self.service = SyncService(server, self.db)
+
+    @contextmanager
+    def use(self):
+        with self.db.bind_ctx(ALL_MODELS):
+            yield
+
+    def sync(self):
+        return self.service.sync()
+
+    def host(self, nombre: str, num: int) -> int:
+        with self.use():
+            return Anfitrion.create(nombre_completo=nombre, rut=_rut(num)).id
+
+    def hosts(self) -> list[str]:
+        with self.use():
+            return sorted(a.nombre_completo for a in Anfitrion.select())
+
+
+@pytest.fixture
+def nodes(tmp_path):
+    server = LocalSyncServer(root=None)
+    return _Node(tmp_path / "a.sqlite", server), _Node(tmp_path / "b.sqlite", server)
+
+
+def test_alta_con_fk_y_marca_de_agua(nodes):
+    a, b = nodes
+    host_id = a.host("Ana Pérez", 11111111)
+    with a.use():
+        Casa.create(direccion="Calle 1", anfitrion=host_id)
+    assert a.sync().enviados == 2
+    assert b.sync().aplicados == 2
+    with b.use():
+        casa = Casa.get(Casa.direccion == "Calle 1")
+        assert casa.anfitrion.nombre_completo == "Ana Pérez"   # FK traducida a la fila local
+    # nada nuevo: ni se reenvía ni se reaplica
+    assert a.sync().enviados == 0
+    assert b.sync().recibidos == 0
+
+
+def test_baja_viaja_como_tombstone(nodes):
+    a, b = nodes
+    host_id = a.host("Ana Pérez", 11111111)
+    a.sync(); b.sync()
+    with a.use():
+        Anfitrion.get_by_id(host_id).delete_instance()
+    a.sync(); b.sync()
+    assert b.hosts() == []
+
+
+def test_id_reusado_no_hereda_identidad(nodes):
+    # B crea, A lo importa, lo borra y crea otro que reusa el mismo id
+    a, b = nodes
+    b.host("Host B", 22222222)
+    b.sync(); a.sync()
+    with a.use():
+        old = Anfitrion.get(Anfitrion.nombre_completo == "Host B")
+        old.delete_instance()
+    new_id = a.host("Host A nuevo", 33333333)
+    assert new_id == old.id
+    a.sync(); b.sync()
+    assert b.hosts() == ["Host A nuevo"]
+    assert a.hosts() == ["Host A nuevo"]
+
+
+def test_borrar_y_reinsertar_en_ambos_lados(nodes):
+    a, b = nodes
+    shared = a.host("Compartido", 44444444)
+    a.sync(); b.sync()
+    with a.use():
+        Anfitrion.get_by_id(shared).delete_instance()
+    a.host("Solo A", 55555555)
+    with b.use():
+        Anfitrion.get(Anfitrion.nombre_completo == "Compartido").delete_instance()
+    b.host("Solo B", 66666666)
+    for _ in range(2):
+        a.sync(); b.sync()
+    assert a.hosts() == b.hosts() == ["Solo A", "Solo B"]
+
+
+def test_edicion_remota_no_pisa_fila_ajena(nodes):
+    # tras el reuso del id en A, un cambio de B a su fila no debe caer en la fila nueva de A
+    a, b = nodes
+    b_id = b.host("Host B", 22222222)
+    b.sync(); a.sync()
+    with a.use():
+        Anfitrion.get(Anfitrion.nombre_completo == "Host B").delete_instance()
+    a.host("Host A nuevo", 33333333)
+    with b.use():
+        h = Anfitrion.get_by_id(b_id)
+        h.telefono = "+56 9 1111 1111"
+        h.save()
+    b.sync(); a.sync(); b.sync()
+    with a.use():
+        assert Anfitrion.get(Anfitrion.nombre_completo == "Host A nuevo").telefono is None
+    assert a.hosts() == b.hosts()
+
+
+def test_conflicto_converge(nodes):
+    a, b = nodes
+    host_id = a.host("Ana", 11111111)
+    a.sync(); b.sync()
+    with a.use():
+        h = Anfitrion.get_by_id(host_id); h.telefono = "A"; h.save()
+    with b.use():
+        h = Anfitrion.get(Anfitrion.nombre_completo == "Ana")
+        h.telefono = "B"; h.save(); h.telefono = "B2"; h.save()   # versión mayor
+    a.sync()
+    report = b.sync()
+    assert report.conflictos == 1
+    a.sync()
+    with a.use():
+        assert Anfitrion.get(Anfitrion.nombre_completo == "Ana").telefono == "B2"
+
+
+def test_rut_con_formato_distinto_se_fusiona(nodes):
+    a, b = nodes
+    with a.use():
+        Hospedado.create(nombre_completo="Luis Soto", rut="12345678-5")
+    # fila heredada en B con el RUT con puntos (escrita antes de normalizar)
+    b.db.execute_sql(
+        "INSERT INTO hospedado (nombre_completo, rut, rut_num, rut_dv, sexo, viene_con_familia, "
+        "created_at, updated_at) VALUES ('Luis Soto', '12.345.678-5', 12345678, '5', 'Hombre', 0, "
+        "'2026-01-01', '2026-01-01')")
+    a.sync()
+    report = b.sync()
+    assert (report.aplicados, report.omitidos) == (1, 0)   # fusionada, no rechazada por el índice
+    with b.use():
+        assert Hospedado.select().count() == 1
+
+
+def test_servidor_en_carpeta(tmp_path):
+    server = LocalSyncServer(tmp_path / "sync")
+    assert server.push("a", b"uno") == 1
+    assert server.push("b", b"dos") == 2
+    assert server.pull("a") == [(2, b"dos")]
+    assert server.pull("c", since=1) == [(2, b"dos")]
+    # seq reservado cuyo lote aún no se publica: pull no pasa por encima
+    (tmp_path / "sync" / "00000003.lock").touch()
+    assert server.push("a", b"tres") == 4
+    assert server.pull("b", since=2) == []
+    assert not list((tmp_path / "sync").glob("*.tmp")) and not list((tmp_path / "sync").glob(".*"))
@@ -0,0 +1,150 @@
+# ui/models/hospedado_list_model.py
+from bisect import bisect_left
+from typing import Iterable, Optional
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from domain.repositories.hospedado_repo import HospedadoRepository
+from core.events import INSERTED, UPDATED, DELETED
+
+# Roles extra (Qt.UserRole mantiene el RUT, igual que en el QListWidget anterior)
+RutRole = Qt.UserRole
+IdRole = Qt.UserRole + 1
+
+
+class HospedadoListModel(QAbstractListModel):
+    """
+    Lista de hospedados cargada por páginas (canFetchMore/fetchMore).
+    Solo guarda tuplas (id, rut, nombre); el texto visible se arma en data(),
+    es decir, únicamente para las filas que la vista pide pintar.
+    Con búsqueda activa muestra los mejores resultados del índice FTS
+    (hasta SEARCH_LIMIT), ordenados por relevancia.
+    """
+    PAGE_SIZE = 200
+    SEARCH_LIMIT = 500
+    PATCH_LIMIT = 50   # más ids que esto en un evento: recargar sale más barato
+
+    def __init__(self, repo: Optional[HospedadoRepository] = None, parent=None):
+        super().__init__(parent)
+        self.repo = repo or HospedadoRepository()
+        self._rows: list[tuple[int, str, str]] = []
+        self._total = 0
+        self._query = ""
+
+    # ---------- API Qt ----------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        id_, rut, nombre = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{rut} - {nombre}"
+        if role == RutRole:
+            return rut
+        if role == IdRole:
+            return id_
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        after = None
+        if self._rows:
+            last = self._rows[-1]
+            after = (last[2], last[0])  # (nombre_completo, id)
+        page = self.repo.page_rows(after=after, limit=self.PAGE_SIZE)
+        if not page:
+            # la tabla cambió por debajo: no insistir
+            self._total = len(self._rows)
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    # ---------- API para controller ----------
+    def set_query(self, text: str):
+        self._query = (text or "").strip()
+        self.reload()
+
+    def set_results(self, text: str, rows: list[tuple[int, str, str]]):
+        """Muestra resultados ya calculados (p.ej. por un worker de búsqueda)."""
+        self.beginResetModel()
+        self._query = (text or "").strip()
+        self._rows = list(rows)
+        self._total = len(self._rows)
+        self.endResetModel()
+
+    def reload(self):
+        """Descarta lo cargado y vuelve a contar; las páginas se piden a demanda."""
+        self.beginResetModel()
+        if self._query:
+            self._rows = self.repo.search_rows(self._query, limit=self.SEARCH_LIMIT)
+            self._total = len(self._rows)
+        else:
+            self._rows = []
+            self._total = self.repo.count_rows()
+        self.endResetModel()
+
+    def apply_change(self, kind: str, ids: Iterable[int]) -> bool:
+        """
+        Parcha solo las filas afectadas por un evento de dominio.
+        Devuelve False si no se pudo (búsqueda activa con altas/cambios:
+        la relevancia la decide el índice FTS) y hay que volver a consultar.
+        """
+        ids = tuple(ids)
+        if kind not in (INSERTED, UPDATED, DELETED) or len(ids) > self.PATCH_LIMIT:
+            if self._query:
+                return False
+            self.reload()
+            return True
+        if kind == DELETED:
+            for id_ in ids:
+                if self._remove(id_):
+                    self._total -= 1
+                elif not self._query:
+                    # no estaba cargada (más allá de la última página): solo el total
+                    self._total = self.repo.count_rows()
+            return True
+        if self._query:
+            return False
+        for row in self.repo.rows_by_ids(ids):
+            if self._remove(row[0]):
+                self._total -= 1
+            elif kind == UPDATED:
+                self._total -= 1   # existía aunque no estuviera cargada
+            self._place(row)
+        return True
+
+    def _remove(self, id_: int) -> bool:
+        for i, row in enumerate(self._rows):
+            if row[0] == id_:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+                return True
+        return False
+
+    def _place(self, row: tuple[int, str, str]):
+        """Inserta en orden (nombre, id) si cae dentro de lo ya cargado."""
+        pending = len(self._rows) < self._total   # quedan páginas sin pedir
+        self._total += 1
+        i = bisect_left([(r[2], r[0]) for r in self._rows], (row[2], row[0]))
+        if i == len(self._rows) and pending:
+            return  # queda más allá de lo cargado: llegará con fetchMore()
+        self.beginInsertRows(QModelIndex(), i, i)
+        self._rows.insert(i, row)
+        self.endInsertRows()
+
+    def rut_at(self, row: int) -> str:
+        if 0 <= row < len(self._rows):
+            return self._rows[row][1]
+        return ""
@@ -0,0 +1,142 @@
+# ui/theme.py
+from typing import Optional
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QApplication
+
+# -------------------------------------------------------------------
+# Tema único de la app: paleta + QSS aplicado UNA vez a QApplication.
+# Las vistas no llaman setStyleSheet(); se diferencian por objectName
+# (#HomeView, #MenuCasa, #CasaDetalle) o por la propiedad "class".
+# -------------------------------------------------------------------
+PALETTE = {
+    "bg": "#f7f2e8",           # beige papel arroz
+    "panel": "#efdfc6",        # pergamino
+    "border": "#5b3a29",       # café oscuro
+    "text": "#2b1d16",
+    "muted": "#6b594c",
+    "accent": "#b63b3b",       # rojo sello
+}
+
+APP_QSS = f"""
+QWidget {{
+    background: {PALETTE['bg']};
+    color: {PALETTE['text']};
+    font-family: "Noto Sans", "Segoe UI", sans-serif;
+    font-size: 15px;
+}}
+QWidget#Header {{ padding: 12px 18px; border-bottom: 2px solid {PALETTE['border']}; }}
+QLabel#Title {{ font-size: 22px; font-weight: 700; }}
+QLabel[class="Section"] {{ font-weight: 700; }}
+QLabel[class="FormTitle"] {{ font-size: 18px; font-weight: 700; }}
+QLabel[class="DialogTitle"] {{ font-size: 20px; font-weight: 700; }}
+QLabel#Avatar {{ background: #fff; border: 2px solid #c7b299; border-radius: 12px; }}
+QWidget#Card {{ background: #ffffff; border: 2px solid {PALETTE['border']}; border-radius: 12px; }}
+QGroupBox {{ font-weight: 700; }}
+
+QListView, QListWidget {{
+    background: #fff; border: 2px solid {PALETTE['border']}; border-radius: 12px; padding: 6px;
+}}
+QLineEdit, QComboBox {{
+    background: #ffffff; border: 1px solid #c7b299; border-radius: 8px; padding: 6px 8px;
+}}
+QLineEdit:focus, QComboBox:focus {{ border: 2px solid {PALETTE['border']}; }}
+
+QTabWidget::pane {{ border: none; margin-top: 8px; }}
+QTabBar::tab {{
+    background: {PALETTE['panel']}; border: 2px solid {PALETTE['border']};
+    padding: 6px 12px; margin-right: 6px;
+    border-top-left-radius: 10px; border-top-right-radius: 10px; font-weight: 600;
+}}
+QTabBar::tab:selected {{ background: #f2e6d2; }}
+QWidget#MenuCasa QTabBar::tab {{ padding: 10px 18px; }}
+
+QPushButton[class="Primary"] {{
+    background: {PALETTE['panel']}; border: 2px solid {PALETTE['border']};
+    border-radius: 12px; padding: 10px 14px; font-weight: 700;
+}}
+QPushButton[class="Primary"]:hover {{ background: #f2e6d2; }}
+QPushButton[class="Danger"] {{
+    background: #ffe8e8; border: 2px solid #a43c3c; color: #5a1111;
+    border-radius: 12px; padding: 10px 14px; font-weight: 700;
+}}
+QPushButton[class="Danger"]:hover {{ background: #ffdcdc; }}
+QDialog#CasaDetalle QPushButton[class="Primary"],
+QDialog#CasaDetalle QPushButton[class="Danger"] {{ padding: 8px 12px; }}
+
+/* Menú principal */
+QWidget#HomeView, QWidget#HomeView QWidget {{ font-size: 16px; }}
+QWidget#HomeView QWidget#Header {{ padding: 24px 16px 8px 16px; border-bottom: none; }}
+QWidget#HomeView QLabel#Title {{ font-size: 36px; font-weight: 700; }}
+QLabel#Kana {{ font-size: 14px; letter-spacing: 2px; color: {PALETTE['muted']}; }}
+QPushButton[class="MenuBtn"] {{
+    background: {PALETTE['panel']}; border: 2px solid {PALETTE['border']};
+    border-radius: 14px; padding: 18px 22px; padding-left: 10px;
+    text-align: left; font-size: 22px; font-weight: 600;
+}}
+QPushButton[class="MenuBtn"]:hover {{ background: #f2e6d2; }}
+QPushButton[class="MenuBtn"]:pressed {{ background: #ead7b7; }}
+QWidget#MenuWrap {{ max-width: 720px; }}
+QWidget#HomeView QLabel#Status {{ font-size: 14px; color: {PALETTE['muted']}; }}
+"""
+
+PIXMAP_CACHE_KB = 32 * 1024
+
+
+def apply_theme(app: Optional[QApplication] = None) -> None:
+    """Aplica el QSS a nivel de aplicación una sola vez (llamadas extra no re-parsean)."""
+    app = app or QApplication.instance()
+    if app is None or app.property("minshuku_theme"):
+        return
+    QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_KB))
+    app.setStyleSheet(APP_QSS)
+    app.setProperty("minshuku_theme", True)
+
+
+def pixmap(path: str, width: int = 0, height: int = 0, square: bool = False) -> QPixmap:
+    """
+    Imagen ya decodificada y escalada, servida desde QPixmapCache.
+    - solo height: escala a esa altura; solo width: a ese ancho;
+    - ambos: cabe en el rectángulo; square=True: recorte cuadrado centrado de `width`.
+    Devuelve un QPixmap nulo si el archivo no existe.
+    """
+    key = f"px|{path}|{width}x{height}|{int(square)}"
+    pix = QPixmapCache.find(key)
+    if pix is not None and not pix.isNull():
+        return pix
+    pix = QPixmap(path)
+    if pix.isNull():
+        return pix
+    pix = scale(pix, width, height, square)
+    QPixmapCache.insert(key, pix)
+    return pix
+
+
+def scale(pix: QPixmap, width: int = 0, height: int = 0, square: bool = False) -> QPixmap:
+    """Escalado suave (mismas reglas que pixmap()) para imágenes que no vienen de archivo."""
+    if pix.isNull():
+        return pix
+    if square and width:
+        scaled = pix.scaled(width, width, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        x = max(0, (scaled.width() - width) // 2)
+        y = max(0, (scaled.height() - width) // 2)
+        return scaled.copy(x, y, width, width)
+    if width and height:
+        return pix.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if height:
+        return pix.scaledToHeight(height, Qt.SmoothTransformation)
+    if width:
+        return pix.scaledToWidth(width, Qt.SmoothTransformation)
+    return pix
+
+
+def icon(path: str, size: int = 24) -> QIcon:
+    """Ícono (SVG o bitmap) rasterizado una vez al tamaño pedido y cacheado."""
+    key = f"ic|{path}|{size}"
+    pix = QPixmapCache.find(key)
+    if pix is None or pix.isNull():
+        pix = QIcon(path).pixmap(QSize(size, size))
+        if pix.isNull():
+            return QIcon()
+        QPixmapCache.insert(key, pix)
+    return QIcon(pix)
@@ -5,52 +5,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt, pyqtSignal
-
-PALETTE = {
-    "bg": "#f7f2e8",
-    "panel": "#efdfc6",
-    "border": "#5b3a29",
-    "text": "#2b1d16",
-}
-
-QSS = f"""
-QDialog {{
-    background: {PALETTE['bg']};
-    color: {PALETTE['text']};
-    font-family: "Noto Sans", "Segoe UI", sans-serif;
-    font-size: 15px;
-}}
-QWidget#Card {{
-    background: #ffffff;
-    border: 2px solid {PALETTE['border']};
-    border-radius: 12px;
-}}
-QLineEdit, QComboBox {{
-    background: #ffffff;
-    border: 1px solid #c7b299;
-    border-radius: 8px;
-    padding: 6px 8px;
-}}
-QLineEdit:focus, QComboBox:focus {{
-    border: 2px solid {PALETTE['border']};
-}}
-QPushButton[class="Primary"] {{
-    background: {PALETTE['panel']};
-    border: 2px solid {PALETTE['border']};
-    border-radius: 12px;
-    padding: 10px 14px;
-    font-weight: 700;
-}}
-QPushButton[class="Primary"]:hover {{ background: #f2e6d2; }}
-QPushButton[class="Danger"] {{
-    background: #ffe8e8;
-    border: 2px solid #a43c3c;
-    color: #5a1111;
-    border-radius: 12px;
-    padding: 10px 14px;
-    font-weight: 700;
-}}
-"""
+from ui import theme
 
 class AnfitrionDetalleView(QDialog):
     """Vista pura: expone UI + señales. Nada de Peewee aquí."""
@@ -64,7 +19,7 @@ class AnfitrionDetalleView(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Detalle de anfitrión")
         self.setMinimumSize(720, 520)
-        self.setStyleSheet(QSS)
+        theme.apply_theme()
         self._build_ui()
         self.set_edit_mode(False)
 
@@ -77,7 +32,7 @@ class AnfitrionDetalleView(QDialog):
         # Título + botón Editar
         top = QHBoxLayout()
         title = QLabel("Detalle de anfitrión")
-        title.setStyleSheet("font-size:20px; font-weight:700;")
+        title.setProperty("class", "DialogTitle")
         self.edit_btn = QPushButton("Editar")
         self.edit_btn.setProperty("class", "Primary")
         top.addWidget(title)
@@ -96,11 +51,11 @@ class AnfitrionDetalleView(QDialog):
         left.setSpacing(10)
 
         self.avatar = QLabel()
-        pix = QPixmap("assets/avatar_user.png")
+        pix = theme.pixmap("assets/avatar_user.png", 160, 160)
         if pix.isNull():
             pix = QPixmap(160, 160)
             pix.fill(Qt.transparent)
-        self.avatar.setPixmap(pix.scaled(160, 160, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.avatar.setPixmap(pix)
         self.avatar.setAlignment(Qt.AlignCenter)
 
         self.sexo_combo = QComboBox()
@@ -141,10 +96,8 @@ class AnfitrionDetalleView(QDialog):
 
         # Lista de casas
         lbl_casas = QLabel("Casas del anfitrión")
-        lbl_casas.setStyleSheet("font-weight:700;")
+        lbl_casas.setProperty("class", "Section")
         self.casas_list = QListWidget()
-        self.casas_list.setStyleSheet(
-            "background:#fff; border:2px solid #5b3a29; border-radius:12px; padding:6px;")
         right.addWidget(lbl_casas)
         right.addWidget(self.casas_list, 1)
 
@@ -3,8 +3,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QFormLayout,
     QLineEdit, QComboBox, QPushButton, QLabel, QCheckBox, QSizePolicy, QListWidgetItem
 )
-from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt, pyqtSignal
+from ui import theme
 
 ICONS = {
     "add": "assets/icons/add.svg",
@@ -18,6 +18,7 @@ class AnfitrionViews(QWidget):
     addRequested        = pyqtSignal()
     deleteRequested     = pyqtSignal()
     openDetailRequested = pyqtSignal(str)   # rut
+    searchRequested     = pyqtSignal(str)   # texto de búsqueda
 
     def __init__(self):
         super().__init__()
@@ -34,14 +35,12 @@ class AnfitrionViews(QWidget):
         left.setSpacing(8)
 
         lbl_list = QLabel("Anfitriones registrados")
-        lbl_list.setStyleSheet("font-weight: 700;")
+        lbl_list.setProperty("class", "Section")
         self.search = QLineEdit(placeholderText="Buscar por nombre o RUT…")
-        self.search.textChanged.connect(self._filter_list)
+        self.search.textChanged.connect(self.searchRequested.emit)
 
         self.lista = QListWidget()
         self.lista.setAlternatingRowColors(True)
-        self.lista.setStyleSheet(
-            "background:#fff; border:2px solid #5b3a29; border-radius:12px; padding:6px;")
         self.lista.itemDoubleClicked.connect(self._emit_open_detail)
 
         left.addWidget(lbl_list)
@@ -56,7 +55,7 @@ class AnfitrionViews(QWidget):
         form_wrap.setSpacing(10)
 
         title = QLabel("Nuevo anfitrión")
-        title.setStyleSheet("font-size:18px; font-weight:700;")
+        title.setProperty("class", "FormTitle")
         form_wrap.addWidget(title)
 
         form = QFormLayout()
@@ -83,8 +82,8 @@ class AnfitrionViews(QWidget):
         self.agregar_btn  = QPushButton("Agregar");  self.agregar_btn.setProperty("class", "Primary")
         self.eliminar_btn = QPushButton("Eliminar"); self.eliminar_btn.setProperty("class", "Danger")
         self.agregar_btn.setMinimumHeight(40); self.eliminar_btn.setMinimumHeight(40)
-        if ICONS.get("add"):    self.agregar_btn.setIcon(QIcon(ICONS["add"]))
-        if ICONS.get("delete"): self.eliminar_btn.setIcon(QIcon(ICONS["delete"]))
+        if ICONS.get("add"):    self.agregar_btn.setIcon(theme.icon(ICONS["add"]))
+        if ICONS.get("delete"): self.eliminar_btn.setIcon(theme.icon(ICONS["delete"]))
         btns.addWidget(self.agregar_btn); btns.addWidget(self.eliminar_btn)
 
         form_wrap.addSpacing(6)
@@ -112,6 +111,21 @@ class AnfitrionViews(QWidget):
         it.setData(Qt.UserRole, rut)
         self.lista.addItem(it)
 
+    def insert_list_item(self, row: int, display: str, rut: str):
+        it = QListWidgetItem(display)
+        it.setData(Qt.UserRole, rut)
+        self.lista.insertItem(row, it)
+
+    def set_list_item(self, row: int, display: str, rut: str):
+        it = self.lista.item(row)
+        if it:
+            it.setText(display)
+            it.setData(Qt.UserRole, rut)
+
+    def remove_list_item(self, row: int):
+        it = self.lista.takeItem(row)
+        del it
+
     def current_selected_rut(self) -> str:
         it = self.lista.currentItem()
         if not it:
@@ -138,12 +152,6 @@ class AnfitrionViews(QWidget):
         self.casado_check.setChecked(False)
 
     # -------- UI interno --------
-    def _filter_list(self, text):
-        txt = (text or "").strip().lower()
-        for i in range(self.lista.count()):
-            it = self.lista.item(i)
-            it.setHidden(txt not in it.text().lower())
-
     def _emit_open_detail(self, item):
         rut = item.data(Qt.UserRole) or item.text().split(" - ")[0].strip()
         if rut:
@@ -4,51 +4,7 @@ from PyQt5.QtWidgets import (
     QListWidget, QHBoxLayout, QGroupBox, QWidget, QListWidgetItem
 )
 from PyQt5.QtCore import Qt, pyqtSignal
-
-PALETTE = {
-    "bg": "#f7f2e8",
-    "panel": "#efdfc6",
-    "border": "#5b3a29",
-    "text": "#2b1d16",
-}
-
-QSS = f"""
-QDialog {{
-    background: {PALETTE['bg']};
-    color: {PALETTE['text']};
-    font-family: "Noto Sans", "Segoe UI", sans-serif;
-    font-size: 15px;
-}}
-QGroupBox {{
-    font-weight: 700;
-}}
-QLineEdit, QComboBox {{
-    background: #ffffff;
-    border: 1px solid #c7b299;
-    border-radius: 8px;
-    padding: 6px 8px;
-}}
-QLineEdit:focus, QComboBox:focus {{
-    border: 2px solid {PALETTE['border']};
-}}
-QListWidget {{
-    background:#fff; border:2px solid {PALETTE['border']}; border-radius:12px; padding:6px;
-}}
-QPushButton[class="Primary"] {{
-    background: {PALETTE['panel']};
-    border: 2px solid {PALETTE['border']};
-    border-radius: 12px;
-    padding: 8px 12px; font-weight: 700;
-}}
-QPushButton[class="Primary"]:hover {{ background: #f2e6d2; }}
-QPushButton[class="Danger"] {{
-    background: #ffe8e8;
-    border: 2px solid #a43c3c;
-    color: #5a1111;
-    border-radius: 12px;
-    padding: 8px 12px; font-weight: 700;
-}}
-"""
+from ui import theme
 
 class CasaDetalleView(QDialog):
     # Señales para el controller
@@ -68,7 +24,8 @@ class CasaDetalleView(QDialog):
     def __init__(self, casa_id=None, parent=None):
         super().__init__(parent)
         self.casa_id = casa_id
-        self.setStyleSheet(QSS)
+        self.setObjectName("CasaDetalle")
+        theme.apply_theme()
         self.setWindowTitle(f"Casa {'(editar)' if casa_id else '(nueva)'}")
         self._build_ui()
         self.set_edit_mode(False)
@@ -82,7 +39,7 @@ class CasaDetalleView(QDialog):
         # Top
         top = QHBoxLayout()
         title = QLabel("Detalle de casa")
-        title.setStyleSheet("font-size:18px; font-weight:700;")
+        title.setProperty("class", "FormTitle")
         self.edit_btn = QPushButton("Editar casa"); self.edit_btn.setProperty("class", "Primary")
         top.addWidget(title); top.addStretch(1); top.addWidget(self.edit_btn)
         layout.addLayout(top)
@@ -183,12 +140,12 @@ class CasaDetalleView(QDialog):
         }
 
     def set_habitaciones(self, habs):
-        """habs = [{'capacidad': int, 'camas': [str,...]}]"""
+        """habs = [HabitacionDTO(id, capacidad, camas), ...]"""
         self.hab_list.clear()
         total = 0
         for i, h in enumerate(habs, 1):
-            cap = int(h.get('capacidad', 0) or 0)
-            camas = len(h.get('camas', []))
+            cap = int(h.capacidad or 0)
+            camas = len(h.camas)
             total += cap
             it = QListWidgetItem(f"H{i}: capacidad={cap} pax, camas={camas}")
             it.setData(Qt.UserRole, i-1)  # índice lógico
@@ -196,11 +153,11 @@ class CasaDetalleView(QDialog):
         self.total_cap_lbl.setText(f"Capacidad total: {total}")
 
     def set_banos(self, banos):
-        """banos = [{'ubicacion': str, 'tina': bool}]"""
+        """banos = [BanoDTO(id, ubicacion, tina), ...]"""
         self.bano_list.clear()
         for i, b in enumerate(banos, 1):
-            tina = "Sí" if b.get('tina') else "No"
-            it = QListWidgetItem(f"B{i}: {b.get('ubicacion','')} (Tina: {tina})")
+            tina = "Sí" if b.tina else "No"
+            it = QListWidgetItem(f"B{i}: {b.ubicacion} (Tina: {tina})")
             it.setData(Qt.UserRole, i-1)
             self.bano_list.addItem(it)
 
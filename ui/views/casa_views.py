@@ -3,8 +3,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QFormLayout,
     QLineEdit, QComboBox, QPushButton, QLabel, QSizePolicy, QListWidgetItem
 )
-from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt, pyqtSignal
+from ui import theme
 
 ICONS = {
     "add": "assets/icons/add.svg",
@@ -18,6 +18,7 @@ class CasaView(QWidget):
     addRequested = pyqtSignal()
     deleteRequested = pyqtSignal()
     openDetailRequested = pyqtSignal(int)  # casa_id
+    searchRequested = pyqtSignal(str)  # texto de búsqueda
 
     def __init__(self):
         super().__init__()
@@ -35,12 +36,10 @@ class CasaView(QWidget):
 
         self.search = QLineEdit()
         self.search.setPlaceholderText("Buscar por dirección o anfitrión…")
-        self.search.textChanged.connect(self._filter_list)
+        self.search.textChanged.connect(self.searchRequested.emit)
 
         self.lista = QListWidget()
         self.lista.setAlternatingRowColors(True)
-        self.lista.setStyleSheet(
-            "background:#fff; border:2px solid #5b3a29; border-radius:12px; padding:6px;")
         self.lista.itemDoubleClicked.connect(self._emit_open_detail)
 
         left.addWidget(self.search)
@@ -54,7 +53,7 @@ class CasaView(QWidget):
         card.setSpacing(10)
 
         title = QLabel("Nueva casa")
-        title.setStyleSheet("font-size:18px; font-weight:700;")
+        title.setProperty("class", "FormTitle")
         card.addWidget(title)
 
         form = QFormLayout()
@@ -74,8 +73,8 @@ class CasaView(QWidget):
         self.del_btn = QPushButton("Eliminar Casa")
         self.add_btn.setProperty("class", "Primary")
         self.del_btn.setProperty("class", "Danger")
-        self.add_btn.setIcon(QIcon(ICONS["add"]))
-        self.del_btn.setIcon(QIcon(ICONS["delete"]))
+        self.add_btn.setIcon(theme.icon(ICONS["add"]))
+        self.del_btn.setIcon(theme.icon(ICONS["delete"]))
         self.add_btn.setMinimumHeight(40)
         self.del_btn.setMinimumHeight(40)
         btns.addWidget(self.add_btn)
@@ -104,10 +103,21 @@ class CasaView(QWidget):
             self.anfitrion_combo.addItem(label, host_id)
 
     def add_list_item(self, casa_id: int, direccion: str, anfitrion_nombre: str):
-        text = f"{casa_id}: {direccion} (Anf: {anfitrion_nombre})"
-        it = QListWidgetItem(text)
+        self.insert_list_item(self.lista.count(), casa_id, direccion, anfitrion_nombre)
+
+    def insert_list_item(self, row: int, casa_id: int, direccion: str, anfitrion_nombre: str):
+        it = QListWidgetItem(f"{casa_id}: {direccion} (Anf: {anfitrion_nombre})")
         it.setData(Qt.UserRole, casa_id)
-        self.lista.addItem(it)
+        self.lista.insertItem(row, it)
+
+    def set_list_item(self, row: int, casa_id: int, direccion: str, anfitrion_nombre: str):
+        it = self.lista.item(row)
+        if it:
+            it.setText(f"{casa_id}: {direccion} (Anf: {anfitrion_nombre})")
+
+    def remove_list_item(self, row: int):
+        it = self.lista.takeItem(row)
+        del it
 
     def clear_form(self):
         self.direccion_input.clear()
@@ -135,12 +145,6 @@ class CasaView(QWidget):
             return 0
 
     # ---------- Internos UI ----------
-    def _filter_list(self, text):
-        text = (text or "").strip().lower()
-        for i in range(self.lista.count()):
-            item = self.lista.item(i)
-            item.setHidden(text not in item.text().lower())
-
     def _emit_open_detail(self, item):
         cid = item.data(Qt.UserRole)
         if cid is None:
@@ -0,0 +1,77 @@
+# ui/views/diagnostics_view.py
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+
+class DiagnosticsView(QDialog):
+    """
+    Panel de diagnóstico (vista pura): un resumen arriba y una pestaña con
+    tabla por sección. Las secciones las define el controller (set_table);
+    una tabla que aún no existe se crea al primer uso.
+    """
+    refreshRequested = pyqtSignal()
+    resetRequested = pyqtSignal()
+    exportRequested = pyqtSignal()
+    closeRequested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico — Minshuku+")
+        self.setObjectName("Diagnostics")
+        self.resize(1100, 650)
+        self._tables: dict[str, QTableWidget] = {}
+        self._build_ui()
+
+    def _build_ui(self):
+        L = QVBoxLayout(self)
+        self.summary = QLabel()
+        self.summary.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        L.addWidget(self.summary)
+
+        self.tabs = QTabWidget()
+        L.addWidget(self.tabs, 1)
+
+        footer = QHBoxLayout()
+        footer.addWidget(QPushButton("Actualizar", clicked=self.refreshRequested.emit))
+        footer.addWidget(QPushButton("Limpiar", clicked=self.resetRequested.emit))
+        footer.addWidget(QPushButton("Exportar JSON", clicked=self.exportRequested.emit))
+        footer.addStretch(1)
+        footer.addWidget(QPushButton("Cerrar", clicked=self.closeRequested.emit))
+        L.addLayout(footer)
+
+    # ---- API para el controller ----
+    def set_summary(self, text: str):
+        self.summary.setText(text)
+
+    def set_table(self, key: str, title: str, headers: list[str], rows: list[tuple]):
+        table = self._tables.get(key)
+        if table is None:
+            table = QTableWidget(0, len(headers))
+            table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            table.setSelectionBehavior(QAbstractItemView.SelectRows)
+            table.setWordWrap(False)
+            table.verticalHeader().setVisible(False)
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+            table.horizontalHeader().setStretchLastSection(True)
+            # sin columna de orden: se respeta el orden del controller hasta que el usuario elija
+            table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self._tables[key] = table
+            self.tabs.addTab(table, title)
+        table.setHorizontalHeaderLabels(headers)
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                item = QTableWidgetItem()
+                # números como dato (ordenan bien); el resto como texto
+                if isinstance(value, (int, float)):
+                    item.setData(Qt.DisplayRole, value)
+                else:
+                    item.setText("" if value is None else str(value))
+                    item.setToolTip(item.text())
+                table.setItem(r, c, item)
+        table.setSortingEnabled(True)
+        self.tabs.setTabText(self.tabs.indexOf(table), f"{title} ({len(rows)})")
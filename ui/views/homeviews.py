@@ -2,16 +2,8 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QApplication, QSizePolicy
 )
-from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtCore import Qt, QSize
-
-PALETTE = {
-    "bg": "#f7f2e8",           # beige papel arroz
-    "panel": "#efdfc6",        # pergamino
-    "border": "#5b3a29",       # café oscuro
-    "text": "#2b1d16",
-    "accent": "#b63b3b",       # rojo sello
-}
+from ui import theme
 
 ICONS = {
     "casas": "assets/icons/house_japan.svg",
@@ -21,48 +13,9 @@ ICONS = {
 }
 
 def set_btn_icon(btn, path_key, size=QSize(28, 28)):
-    btn.setIcon(QIcon(ICONS[path_key]))
+    btn.setIcon(theme.icon(ICONS[path_key], size.width()))
     btn.setIconSize(size)
-    btn.setStyleSheet(btn.styleSheet() + "padding-left: 10px; text-align: left;")
-
-QSS = f"""
-QWidget {{
-    background: {PALETTE['bg']};
-    color: {PALETTE['text']};
-    font-family: "Noto Sans", "Segoe UI", sans-serif;
-    font-size: 16px;
-}}
-QWidget#Header {{
-    padding: 24px 16px 8px 16px;
-}}
-QLabel#Title {{
-    font-size: 36px;
-    font-weight: 700;
-}}
-QLabel#Kana {{
-    font-size: 14px;
-    letter-spacing: 2px;
-    color: #6b594c;
-}}
-QPushButton[class="MenuBtn"] {{
-    background: {PALETTE['panel']};
-    border: 2px solid {PALETTE['border']};
-    border-radius: 14px;
-    padding: 18px 22px;
-    text-align: left;
-    font-size: 22px;
-    font-weight: 600;
-}}
-QPushButton[class="MenuBtn"]:hover {{
-    background: #f2e6d2;
-}}
-QPushButton[class="MenuBtn"]:pressed {{
-    background: #ead7b7;
-}}
-QWidget#MenuWrap {{
-    max-width: 720px;
-}}
-"""
+
 
 class HomeView(QWidget):
     """Vista pura. No abre ventanas por sí sola: expone botones para que el Controller actúe."""
@@ -70,7 +23,7 @@ class HomeView(QWidget):
         super().__init__()
         self.setObjectName("HomeView")
         self.setWindowTitle("Minshuku+ — Menú Principal")
-        self.setStyleSheet(QSS)
+        theme.apply_theme()
         self._init_ui()
 
     def _init_ui(self):
@@ -85,7 +38,7 @@ class HomeView(QWidget):
 
         logo_line = QHBoxLayout()
         logo = QLabel()
-        logo.setPixmap(QPixmap("assets/image.png").scaledToHeight(92, Qt.SmoothTransformation))
+        logo.setPixmap(theme.pixmap("assets/image.png", height=92))
         logo.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
         title_box = QVBoxLayout()
@@ -126,6 +79,12 @@ class HomeView(QWidget):
         menu.addWidget(self.asignaciones_btn)
         menu.addWidget(self.sync_btn)
 
+        # estado del arranque (p.ej. "Preparando la base de datos…"); oculto si no hay nada
+        self.status_lbl = QLabel(objectName="Status")
+        self.status_lbl.setWordWrap(True)
+        self.status_lbl.hide()
+        menu.addWidget(self.status_lbl)
+
         # Layout raíz
         root.addWidget(header_w)
         root.addStretch(1)
@@ -135,3 +94,7 @@ class HomeView(QWidget):
         row.addStretch(1)
         root.addLayout(row)
         root.addStretch(2)
+
+    def set_status(self, text: str = ""):
+        self.status_lbl.setText(text)
+        self.status_lbl.setVisible(bool(text))
@@ -1,39 +1,10 @@
 # ui/views/hospedados_view.py
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QFormLayout,
-    QLineEdit, QComboBox, QPushButton, QLabel, QSizePolicy, QListWidgetItem
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QFormLayout,
+    QLineEdit, QComboBox, QPushButton, QLabel, QSizePolicy
 )
-from PyQt5.QtGui import QIcon, QPixmap
-from PyQt5.QtCore import Qt, pyqtSignal
-
-PALETTE = {
-    "bg": "#f7f2e8", "panel": "#efdfc6", "border": "#5b3a29",
-    "text": "#2b1d16", "muted": "#6b594c"
-}
-
-QSS = f"""
-QWidget {{
-    background: {PALETTE['bg']};
-    color: {PALETTE['text']};
-    font-family: "Noto Sans", "Segoe UI", sans-serif;
-    font-size: 15px;
-}}
-QWidget#Header {{ padding: 12px 18px; border-bottom: 2px solid {PALETTE['border']}; }}
-QLabel#Title {{ font-size: 22px; font-weight: 700; }}
-QWidget#Card {{ background: #ffffff; border: 2px solid {PALETTE['border']}; border-radius: 12px; }}
-QListWidget {{ background:#fff; border:2px solid {PALETTE['border']}; border-radius:12px; padding:6px; }}
-QLineEdit, QComboBox {{ background:#fff; border:1px solid #c7b299; border-radius:8px; padding:6px 8px; }}
-QLineEdit:focus, QComboBox:focus {{ border:2px solid {PALETTE['border']}; }}
-QPushButton[class="Primary"] {{
-    background: {PALETTE['panel']}; border:2px solid {PALETTE['border']};
-    border-radius:12px; padding:10px 14px; font-weight:700;
-}}
-QPushButton[class="Primary"]:hover {{ background:#f2e6d2; }}
-QPushButton[class="Danger"] {{
-    background:#ffe8e8; border:2px solid #a43c3c; color:#5a1111;
-    border-radius:12px; padding:10px 14px; font-weight:700;
-}}
-"""
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractItemModel, QModelIndex
+from ui import theme
 
 ICONS = {
     "add": "assets/icons/add.svg",
@@ -47,11 +18,13 @@ class HospedadoView(QWidget):
     addRequested       = pyqtSignal()
     deleteRequested    = pyqtSignal()
     openDetailRequested= pyqtSignal(str)  # rut
+    searchRequested    = pyqtSignal(str)  # texto de búsqueda
+    importRequested    = pyqtSignal()     # importar nómina (CSV/XLSX)
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Hospedados")
-        self.setStyleSheet(QSS)
+        theme.apply_theme()
         self._setup_ui()
 
     def _setup_ui(self):
@@ -63,7 +36,7 @@ class HospedadoView(QWidget):
         headerw = QWidget(objectName="Header")
         header = QHBoxLayout(headerw); header.setContentsMargins(0,0,0,0)
         logo = QLabel()
-        logo.setPixmap(QPixmap("assets/logo_min.png").scaledToHeight(36, Qt.SmoothTransformation))
+        logo.setPixmap(theme.pixmap("assets/logo_min.png", height=36))
         logo.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         title = QLabel("Hospedados"); title.setObjectName("Title")
         header.addWidget(logo); header.addSpacing(8); header.addWidget(title); header.addStretch(1)
@@ -73,13 +46,15 @@ class HospedadoView(QWidget):
 
         # Izquierda
         left = QVBoxLayout(); left.setSpacing(8)
-        lbl_list = QLabel("Hospedados registrados"); lbl_list.setStyleSheet("font-weight:700;")
+        lbl_list = QLabel("Hospedados registrados"); lbl_list.setProperty("class", "Section")
         self.search = QLineEdit(placeholderText="Buscar por nombre o RUT…")
-        self.search.textChanged.connect(self._filter_list)
+        self.search.textChanged.connect(self.searchRequested.emit)
 
-        self.lista = QListWidget()
+        # Lista virtualizada: el modelo (ver set_model) entrega filas por página
+        self.lista = QListView()
         self.lista.setAlternatingRowColors(True)
-        self.lista.itemDoubleClicked.connect(self._emit_open_detail)
+        self.lista.setUniformItemSizes(True)
+        self.lista.doubleClicked.connect(self._emit_open_detail)
 
         left.addWidget(lbl_list)
         left.addWidget(self.search)
@@ -91,7 +66,7 @@ class HospedadoView(QWidget):
         form_wrap.setSpacing(10)
 
         title_form = QLabel("Nuevo hospedado")
-        title_form.setStyleSheet("font-size:18px; font-weight:700;")
+        title_form.setProperty("class", "FormTitle")
         form_wrap.addWidget(title_form)
 
         form_layout = QFormLayout()
@@ -118,12 +93,16 @@ class HospedadoView(QWidget):
         self.agregar_btn  = QPushButton("Agregar");  self.agregar_btn.setProperty("class", "Primary")
         self.eliminar_btn = QPushButton("Eliminar"); self.eliminar_btn.setProperty("class", "Danger")
         self.agregar_btn.setMinimumHeight(40); self.eliminar_btn.setMinimumHeight(40)
-        if ICONS.get("add"):    self.agregar_btn.setIcon(QIcon(ICONS["add"]))
-        if ICONS.get("delete"): self.eliminar_btn.setIcon(QIcon(ICONS["delete"]))
+        if ICONS.get("add"):    self.agregar_btn.setIcon(theme.icon(ICONS["add"]))
+        if ICONS.get("delete"): self.eliminar_btn.setIcon(theme.icon(ICONS["delete"]))
         btns.addWidget(self.agregar_btn); btns.addWidget(self.eliminar_btn)
 
+        self.importar_btn = QPushButton("Importar nómina…"); self.importar_btn.setProperty("class", "Primary")
+        self.importar_btn.setMinimumHeight(40)
+
         form_wrap.addSpacing(6)
         form_wrap.addLayout(btns)
+        form_wrap.addWidget(self.importar_btn)
         form_wrap.addStretch(1)
 
         body.addLayout(left, 6)
@@ -136,24 +115,23 @@ class HospedadoView(QWidget):
         # Conexiones → solo señales
         self.agregar_btn.clicked.connect(self.addRequested.emit)
         self.eliminar_btn.clicked.connect(self.deleteRequested.emit)
+        self.importar_btn.clicked.connect(self.importRequested.emit)
 
     # ---------- API para controller ----------
     def refresh(self):
         self.refreshRequested.emit()
 
-    def add_list_item(self, display: str, rut: str):
-        it = QListWidgetItem(display)
-        it.setData(Qt.UserRole, rut)
-        self.lista.addItem(it)
+    def set_model(self, model: QAbstractItemModel):
+        self.lista.setModel(model)
 
     def current_selected_rut(self) -> str:
-        it = self.lista.currentItem()
-        if not it:
+        idx = self.lista.currentIndex()
+        if not idx.isValid():
             return ""
-        rut = it.data(Qt.UserRole)
+        rut = idx.data(Qt.UserRole)
         if rut:
             return rut
-        return (it.text().split(" - ")[0]).strip()
+        return (str(idx.data(Qt.DisplayRole) or "").split(" - ")[0]).strip()
 
     def get_form_data(self) -> dict:
         return {
@@ -174,13 +152,9 @@ class HospedadoView(QWidget):
         self.edad_input.clear()
 
     # ---------- internos UI ----------
-    def _filter_list(self, text):
-        txt = (text or "").strip().lower()
-        for i in range(self.lista.count()):
-            it = self.lista.item(i)
-            it.setHidden(txt not in it.text().lower())
-
-    def _emit_open_detail(self, item):
-        rut = item.data(Qt.UserRole) or item.text().split(" - ")[0].strip()
+    def _emit_open_detail(self, index: QModelIndex):
+        if not index.isValid():
+            return
+        rut = index.data(Qt.UserRole) or str(index.data(Qt.DisplayRole) or "").split(" - ")[0].strip()
         if rut:
             self.openDetailRequested.emit(rut)
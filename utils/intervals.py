@@ -0,0 +1,91 @@
+# utils/intervals.py
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+Interval = Tuple[Any, Any, Any]  # (inicio, fin, dato) semiabierto: [inicio, fin)
+
+
+class IntervalIndex:
+    """
+    Índice estático de intervalos [inicio, fin) para consultas de solapamiento.
+    - count_overlaps / count_at: O(log n) con dos arreglos ordenados
+      (inicios y fines): solapan [a, b) = #inicio < b  -  #fin <= a.
+    - overlaps: O(log n + k) con un árbol implícito sobre el arreglo ordenado
+      por inicio, donde cada nodo guarda el fin máximo de su subárbol.
+    - peak: ocupación máxima dentro de [a, b), barriendo solo los eventos de la ventana.
+    `weight(item)` (opcional, entero >= 1) hace que conteos y peak sumen pesos
+    (p.ej. personas por asignación) en vez de intervalos.
+    Se reconstruye completo ante cambios (las reservas de una pieza son pocas).
+    """
+    def __init__(self, intervals: Iterable[Interval] = (),
+                 weight: Optional[Callable[[Interval], int]] = None):
+        self._items: List[Interval] = sorted(intervals, key=lambda it: (it[0], it[1]))
+        if weight is None:
+            self._starts = [it[0] for it in self._items]
+            self._ends = sorted(it[1] for it in self._items)
+        else:
+            # cada unidad de peso es una entrada: los bisect siguen siendo O(log n)
+            self._starts = [it[0] for it in self._items for _ in range(weight(it))]
+            self._ends = sorted(it[1] for it in self._items for _ in range(weight(it)))
+        self._max_end: list = [None] * len(self._items)
+        self._build(0, len(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self, lo: int, hi: int):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        best = self._items[mid][1]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > best:
+                best = child
+        self._max_end[mid] = best
+        return best
+
+    # ---------- conteos O(log n) ----------
+    def count_overlaps(self, a, b) -> int:
+        return bisect_left(self._starts, b) - bisect_right(self._ends, a)
+
+    def count_at(self, t) -> int:
+        """Intervalos que contienen el instante t (inicio <= t < fin)."""
+        return bisect_right(self._starts, t) - bisect_right(self._ends, t)
+
+    # ---------- listado O(log n + k) ----------
+    def overlaps(self, a, b) -> List[Interval]:
+        out: List[Interval] = []
+        stack = [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= a:
+                continue  # nada en este subárbol termina después de a
+            stack.append((lo, mid))
+            start, end, _ = self._items[mid]
+            if start < b:
+                if end > a:
+                    out.append(self._items[mid])
+                stack.append((mid + 1, hi))  # a la derecha los inicios son >= start
+        out.sort(key=lambda it: (it[0], it[1]))
+        return out
+
+    def peak(self, a, b) -> int:
+        """Máximo de intervalos simultáneos dentro de [a, b)."""
+        cur = best = self.count_at(a)
+        i = bisect_right(self._starts, a)
+        j = bisect_right(self._ends, a)
+        i_end = bisect_left(self._starts, b)
+        j_end = bisect_left(self._ends, b)
+        # eventos en (a, b): a igual instante, primero salidas y luego entradas
+        while i < i_end:
+            if j < j_end and self._ends[j] <= self._starts[i]:
+                cur -= 1
+                j += 1
+            else:
+                cur += 1
+                i += 1
+                best = max(best, cur)
+        return best
@@ -28,3 +28,17 @@ def is_valid_rut(rut: str) -> bool:
     num, dv = r[:-1], r[-1]
     if not num.isdigit(): return False
     return rut_dv(int(num)) == dv
+
+def split_rut(rut: str):
+    """(cuerpo, dv) como (int, str), o None si no tiene forma de RUT. No valida el DV."""
+    r = clean_rut(rut)
+    if len(r) < 2 or not r[:-1].isdigit():
+        return None
+    return int(r[:-1]), r[-1]
+
+def format_rut(rut: str) -> str:
+    """Formato canónico para guardar: cuerpo sin puntos + '-' + DV (ej. 12345678-K)."""
+    parts = split_rut(rut)
+    if not parts:
+        return clean_rut(rut)
+    return f"{parts[0]}-{parts[1]}"